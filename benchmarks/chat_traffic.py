@@ -0,0 +1,68 @@
+"""Mide las actualizaciones y bytes que envía ChatView por cada mensaje del usuario.
+
+Envía mensajes a un backend simulado (httpx.MockTransport) que responde en
+streaming y usa la instrumentación de UpdateScheduler para contar, por acción,
+las actualizaciones pedidas por la vista, los mensajes realmente enviados al
+cliente y sus bytes.
+
+Uso: python -m benchmarks.chat_traffic [--messages 10] [--chunks 40]
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+
+from benchmarks.headless import FakeEvent, create_page
+from src.models.user import User
+from src.services.api_service import APIService
+from src.services.chat_service import ChatService
+from src.ui.components import UpdateScheduler
+from src.ui.views.chat_view import ChatView
+
+
+def streaming_backend(chunks: int) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = "".join(
+            f"data: {json.dumps({'delta': f'fragmento {i} de la respuesta. '})}\n\n" for i in range(chunks)
+        ) + "data: [DONE]\n\n"
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, text=body)
+    return httpx.MockTransport(handler)
+
+
+async def run(messages: int, chunks: int):
+    page, _ = create_page()
+    api_service = APIService(transport=streaming_backend(chunks))
+    api_service.current_user = User(email="bench@example.com", id="1", access_token="token", is_authenticated=True)
+    view = ChatView(on_return_home=lambda e: None, chat_service=ChatService(api_service))
+
+    page.update_scheduler = UpdateScheduler(page, measure=True)
+    view.build(page)
+    updates = page.update_scheduler
+
+    for number in range(messages):
+        view.new_message.value = f"Pregunta de prueba número {number}"
+        await view.handle_send_message(FakeEvent(page))
+    await api_service.close()
+
+    actions = list(updates.history)
+    print(f"{'acción':<24}{'pedidas':>10}{'enviadas':>10}{'bytes':>10}")
+    for stats in actions[:3]:
+        print(f"{stats.action:<24}{stats.requested:>10}{stats.updates:>10}{stats.bytes_sent:>10}")
+    print(
+        f"{'media':<24}{sum(s.requested for s in actions) / len(actions):>10.1f}"
+        f"{sum(s.updates for s in actions) / len(actions):>10.1f}"
+        f"{sum(s.bytes_sent for s in actions) / len(actions):>10.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10)
+    parser.add_argument("--chunks", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.chunks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Página de Flet sin navegador que registra lo que se enviaría por el websocket."""
+import asyncio
+import json
+from typing import Any, List, Optional, Tuple
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientActions,
+    ClientMessage,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+class RecordingConnection(LocalConnection):
+    """Conexión que aplica los comandos localmente y cuenta mensajes y bytes enviados."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = 0
+        self.bytes_sent = 0
+
+    def reset(self):
+        self.messages = 0
+        self.bytes_sent = 0
+
+    def _record(self, message: Any):
+        payload = json.dumps(message, cls=CommandEncoder, separators=(",", ":"))
+        self.messages += 1
+        self.bytes_sent += len(payload.encode())
+
+    def send_command(self, session_id: str, command):
+        result, message = self._process_command(command)
+        if message:
+            self._record(message)
+        return PageCommandResponsePayload(result=result, error="")
+
+    def send_commands(self, session_id: str, commands: List):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._record(ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+
+class FakeEvent:
+    """Evento mínimo con los atributos que usan los manejadores de las vistas."""
+
+    def __init__(self, page: ft.Page, control: Optional[ft.Control] = None, data: Optional[str] = None):
+        self.page = page
+        self.control = control
+        self.data = data
+
+
+def create_page(session_id: str = "bench") -> Tuple[ft.Page, RecordingConnection]:
+    """Crea una página enlazada a una RecordingConnection en el loop actual."""
+    connection = RecordingConnection()
+    page = ft.Page(connection, session_id, loop=asyncio.get_running_loop())
+    return page, connection
@@ -0,0 +1,168 @@
+"""Percentiles de latencia de los flujos principales contra un backend simulado.
+
+Ejecuta APIService y ChatService contra MockBackend (httpx.MockTransport) con la
+latencia inyectada que se indique y mide, con percentiles p50/p95/p99:
+
+- login: APIService.login completo (token y arranque de la sesión).
+- siguiente pregunta: PMPQuizApp.handle_next_question hasta mostrar la
+  pregunta, con `--think` segundos de lectura entre preguntas.
+- chat: ida y vuelta de ChatService.stream_message y tiempo hasta el primer
+  fragmento.
+- progreso: ProgressView.build en frío para cada tamaño de historial.
+
+Con `--json` se guardan los resultados para compararlos entre versiones.
+
+Uso: python -m benchmarks.latency [--latency 0.05] [--jitter 0.02] [--runs 30]
+     [--history 0 20 200 2000] [--no-stats-endpoint] [--json resultados.json]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.headless import FakeEvent, create_page
+from benchmarks.mock_backend import MockBackend
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.config.settings import settings
+from src.services.api_service import APIService
+from src.services.chat_service import ChatService
+from src.ui.views.progress_view import ProgressView
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 en milisegundos."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"n": len(samples), "p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"n": len(samples), "p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+async def measure_login(backend: MockBackend, runs: int) -> List[float]:
+    pool = APIService(transport=backend.transport())
+    samples = []
+    try:
+        for number in range(runs):
+            service = pool.for_session()
+            started = time.perf_counter()
+            ok, error = await service.login(f"bench{number}@example.com", "secreto")
+            samples.append(time.perf_counter() - started)
+            assert ok, error
+            service.logout()
+    finally:
+        await pool.close()
+    return samples
+
+
+async def measure_next_question(backend: MockBackend, runs: int, think: float) -> List[float]:
+    pool = APIService(transport=backend.transport())
+    app = PMPQuizApp(api_service=pool.for_session())
+    page, _ = create_page("latencia")
+    samples = []
+    try:
+        await app.api_service.login("preguntas@example.com", "secreto")
+        await app.handle_practice(FakeEvent(page), "aleatorio")
+        for _ in range(runs):
+            # Tiempo de lectura del usuario, durante el que trabaja la precarga
+            await asyncio.sleep(think)
+            started = time.perf_counter()
+            await app.handle_next_question(FakeEvent(page), "aleatorio")
+            samples.append(time.perf_counter() - started)
+    finally:
+        # Las precargas canceladas deben terminar antes de cerrar el cliente HTTP
+        app.close()
+        await app.prefetcher.wait_closed()
+        await pool.close()
+    return samples
+
+
+async def measure_chat(backend: MockBackend, runs: int) -> Dict[str, List[float]]:
+    pool = APIService(transport=backend.transport())
+    service = pool.for_session()
+    chat = ChatService(service)
+    samples: Dict[str, List[float]] = {"chat (primer fragmento)": [], "chat (ida y vuelta)": []}
+    try:
+        await service.login("chat@example.com", "secreto")
+        for number in range(runs):
+            started = time.perf_counter()
+            first = None
+            async for chunk in chat.stream_message(f"Pregunta de prueba {number}"):
+                if first is None:
+                    first = time.perf_counter() - started
+            samples["chat (primer fragmento)"].append(first)
+            samples["chat (ida y vuelta)"].append(time.perf_counter() - started)
+    finally:
+        await pool.close()
+    return samples
+
+
+async def measure_progress(backend: MockBackend, runs: int, cache_dir: Path) -> List[float]:
+    samples = []
+    for number in range(runs):
+        # Servicio y caché locales nuevos en cada carga: se mide la carga en frío
+        settings.SESSION_CACHE_PATH = str(cache_dir / f"sessions-{backend.history_size}-{number}.sqlite3")
+        service = APIService(transport=backend.transport())
+        page, _ = create_page(f"progreso-{number}")
+        try:
+            await service.login(f"progreso{number}@example.com", "secreto")
+            view = ProgressView(on_return_home=lambda e: None, api_service=service)
+            started = time.perf_counter()
+            await view.build(page)
+            samples.append(time.perf_counter() - started)
+        finally:
+            await service.close()
+    return samples
+
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    def backend(**kwargs) -> MockBackend:
+        return MockBackend(
+            latency=args.latency, jitter=args.jitter, chunk_delay=args.chunk_delay,
+            stats_endpoint=not args.no_stats_endpoint, **kwargs
+        )
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        settings.SESSION_OUTBOX_PATH = str(cache_dir / "outbox.sqlite3")
+
+        results["login"] = percentiles(await measure_login(backend(), args.runs))
+        results["siguiente pregunta"] = percentiles(await measure_next_question(backend(), args.runs, args.think))
+        for name, samples in (await measure_chat(backend(), args.runs)).items():
+            results[name] = percentiles(samples)
+        for size in args.history:
+            samples = await measure_progress(backend(history_size=size), args.runs, cache_dir)
+            results[f"progreso ({size} sesiones)"] = percentiles(samples)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="latencia base del backend en segundos")
+    parser.add_argument("--jitter", type=float, default=0.02, help="latencia aleatoria adicional máxima")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="pausa entre fragmentos del chat")
+    parser.add_argument("--think", type=float, default=0.2, help="tiempo de lectura entre preguntas")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 20, 200, 2000])
+    parser.add_argument("--no-stats-endpoint", action="store_true", help="el backend no ofrece /stats")
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    args = parser.parse_args()
+
+    random.seed(0)
+    results = asyncio.run(run(args))
+
+    print(f"{'escenario':<30}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<30}{stats['n']:>6}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
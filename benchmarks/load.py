@@ -0,0 +1,201 @@
+"""Prueba de carga sin navegador: muchas sesiones de PMPQuizApp a la vez en un proceso.
+
+Cada sesión simulada tiene su propia página, PMPQuizApp y servicio de sesión
+(como SessionRegistry en src/main.py) y recorre el flujo completo contra
+MockBackend: login → handle_practice → N × (elegir opción y
+handle_submit_answer, handle_next_question) → handle_finish_practice, con
+`--think` segundos de lectura entre pasos.
+
+Informa del retraso del bucle de eventos (p50/p99/máx), la memoria por sesión
+(RSS del proceso, con las sesiones aún vivas), el rendimiento en sesiones,
+preguntas y peticiones HTTP por segundo y las veces que se abrieron los
+circuit breakers por llamadas lentas.
+
+Uso: python -m benchmarks.load [--sessions 1000] [--questions 10] [--think 0.5]
+     [--ramp 5] [--latency 0.05] [--jitter 0.02] [--json resultados.json]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.headless import FakeEvent, create_page
+from benchmarks.mock_backend import MockBackend
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.config.settings import settings
+from src.services.api_service import APIService
+
+
+@dataclass
+class LoadResult:
+    sessions: int
+    completed: int
+    failed: int
+    questions: int
+    seconds: float
+    sessions_per_second: float
+    questions_per_second: float
+    requests_per_second: float
+    loop_lag_p50_ms: float
+    loop_lag_p99_ms: float
+    loop_lag_max_ms: float
+    memory_per_session_kb: float
+    circuits_opened: int
+    errors: List[str] = field(default_factory=list)
+
+
+class LoopLagMonitor:
+    """Mide cuánto se retrasa el bucle respecto a una espera de `interval` segundos."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - started - self.interval, 0.0))
+
+
+def rss_kb() -> float:
+    """RSS máximo del proceso en KB (ru_maxrss está en bytes en macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 if sys.platform == "darwin" else rss
+
+
+async def learner(number: int, pool: APIService, questions: int, think: float, apps: list):
+    """Una sesión completa de práctica; devuelve las preguntas respondidas."""
+    page, _ = create_page(f"carga-{number}")
+    app = PMPQuizApp(api_service=pool.for_session())
+    app.page = page
+    apps.append((page, app))
+    event = FakeEvent(page)
+
+    ok, error = await app.api_service.login(f"learner{number}@example.com", "secreto")
+    if not ok:
+        raise RuntimeError(f"login: {error}")
+    await app.handle_login_success(event)
+    await asyncio.sleep(think)
+
+    await app.handle_practice(event, "aleatorio")
+    question_view = app.views["question"]
+    for answered in range(1, questions + 1):
+        await asyncio.sleep(think)
+        options = len(app.current_question.options)
+        question_view.handle_option_selected(FakeEvent(page, data=str(random.randrange(options))))
+        await question_view.handle_submit_answer(event)
+        await asyncio.sleep(think)
+        if answered < questions:
+            await question_view.handle_next_question(event, "aleatorio")
+
+    await question_view.handle_finish_practice(event)
+    if len(app.quiz_session.answers) != questions:
+        raise RuntimeError(f"{len(app.quiz_session.answers)} respuestas de {questions}")
+    return questions
+
+
+async def run(args) -> LoadResult:
+    backend = MockBackend(latency=args.latency, jitter=args.jitter)
+    pool = APIService(transport=backend.transport())
+    monitor = LoopLagMonitor()
+    apps: list = []
+
+    gc.collect()
+    memory_before = rss_kb()
+    monitor.start()
+    started = time.perf_counter()
+
+    async def delayed(number: int):
+        # Las llegadas se reparten de forma uniforme durante la rampa
+        await asyncio.sleep(args.ramp * number / args.sessions)
+        return await learner(number, pool, args.questions, args.think, apps)
+
+    results = await asyncio.gather(*[delayed(number) for number in range(args.sessions)], return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    monitor.stop()
+
+    # Se deja que la cola de sesiones termine de enviarse antes de medir la memoria
+    await asyncio.sleep(0.5)
+    gc.collect()
+    memory_per_session = (rss_kb() - memory_before) / args.sessions
+
+    # Con el bucle saturado las llamadas se vuelven lentas y los circuit breakers se abren
+    circuits_opened = sum(state["times_opened"] for state in pool.circuit_states().values())
+    for _, app in apps:
+        app.close()
+    await asyncio.gather(*[app.prefetcher.wait_closed() for _, app in apps])
+    await pool.close()
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    answered = sum(result for result in results if isinstance(result, int))
+    lag = sorted(monitor.samples) or [0.0]
+    return LoadResult(
+        sessions=args.sessions,
+        completed=args.sessions - len(errors),
+        failed=len(errors),
+        questions=answered,
+        seconds=elapsed,
+        sessions_per_second=(args.sessions - len(errors)) / elapsed,
+        questions_per_second=answered / elapsed,
+        requests_per_second=sum(backend.requests.values()) / elapsed,
+        loop_lag_p50_ms=statistics.median(lag) * 1000,
+        loop_lag_p99_ms=lag[min(int(len(lag) * 0.99), len(lag) - 1)] * 1000,
+        loop_lag_max_ms=lag[-1] * 1000,
+        memory_per_session_kb=memory_per_session,
+        circuits_opened=circuits_opened,
+        errors=sorted({f"{type(error).__name__}: {error}" for error in errors})[:10],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--think", type=float, default=0.5, help="tiempo de lectura entre pasos")
+    parser.add_argument("--ramp", type=float, default=5, help="segundos en los que arrancan todas las sesiones")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.SESSION_CACHE_PATH = str(Path(tmp) / "sessions.sqlite3")
+        settings.SESSION_OUTBOX_PATH = str(Path(tmp) / "outbox.sqlite3")
+        result = asyncio.run(run(args))
+
+    print(f"sesiones completadas   {result.completed}/{result.sessions} en {result.seconds:.1f} s")
+    print(f"rendimiento            {result.sessions_per_second:.1f} sesiones/s, "
+          f"{result.questions_per_second:.1f} preguntas/s, {result.requests_per_second:.1f} peticiones/s")
+    print(f"retraso del bucle      p50 {result.loop_lag_p50_ms:.1f} ms, p99 {result.loop_lag_p99_ms:.1f} ms, "
+          f"máx {result.loop_lag_max_ms:.1f} ms")
+    print(f"memoria por sesión     {result.memory_per_session_kb:.0f} KB")
+    print(f"circuitos abiertos     {result.circuits_opened}")
+    for error in result.errors:
+        print(f"error                  {error}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": asdict(result)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Backend simulado del API para los benchmarks, con latencia inyectable.
+
+Responde en memoria (httpx.MockTransport) a las rutas que usan APIService y
+ChatService: login, /auth/me, preguntas, chat en streaming e historial y
+estadísticas de sesiones de práctica. Cada respuesta espera `latency` segundos
+más un `jitter` aleatorio, y el chat además `chunk_delay` entre fragmentos.
+"""
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import parse_qs
+
+import httpx
+from jose import jwt
+
+from src.services.metrics import route_template
+
+DOMAINS = ["personas", "proceso", "entorno"]
+
+
+class MockBackend:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        history_size: int = 0,
+        stats_endpoint: bool = True,
+        chat_chunks: int = 20,
+        chunk_delay: float = 0.0,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.history_size = history_size
+        self.stats_endpoint = stats_endpoint
+        self.chat_chunks = chat_chunks
+        self.chunk_delay = chunk_delay
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._saved: Dict[str, List[Dict[str, Any]]] = {}
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        route = route_template(request.url.path).rstrip("/")
+        self.requests[f"{request.method} {route}"] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if route == "/auth/token":
+            form = parse_qs(request.content.decode())
+            return httpx.Response(200, json=self._token(form["username"][0]))
+        if route == "/auth/me":
+            claims = jwt.get_unverified_claims(request.headers["authorization"].split(" ", 1)[1])
+            return httpx.Response(200, json={"id": claims["user_id"], "email": claims["sub"]})
+        if route == "/question":
+            return httpx.Response(200, json={"data": self._question(request.url.params.get("domain"))})
+        if route == "/questions":
+            count = int(request.url.params.get("count", 1))
+            domain = request.url.params.get("domain")
+            return httpx.Response(200, json={"data": [self._question(domain) for _ in range(count)]})
+        if route == "/chat":
+            return self._chat(json.loads(request.content))
+        if route == "/practice-sessions/user/{id}/stats":
+            if not self.stats_endpoint:
+                return httpx.Response(404, json={"detail": "Not Found"})
+            return httpx.Response(200, json=self._stats(self._history(self._user_id(request))))
+        if route == "/practice-sessions/user/{id}":
+            return httpx.Response(200, json=self._page(self._history(self._user_id(request)), request.url.params))
+        if route == "/practice-sessions" and request.method == "POST":
+            session = json.loads(request.content)
+            self._saved.setdefault(str(session["user_id"]), []).append(session)
+            return httpx.Response(200, json={"id": len(self._saved[str(session["user_id"])])})
+        if route == "/practice-sessions/batch" and request.method == "POST":
+            sessions = json.loads(request.content)
+            sessions = sessions.get("sessions", sessions) if isinstance(sessions, dict) else sessions
+            for session in sessions:
+                self._saved.setdefault(str(session["user_id"]), []).append(session)
+            return httpx.Response(200, json={"saved": len(sessions)})
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+    def _token(self, email: str) -> Dict[str, Any]:
+        user_id = hashlib.sha1(email.encode()).hexdigest()[:24]
+        expires = datetime.now(timezone.utc) + timedelta(hours=1)
+        claims = {"sub": email, "user_id": user_id, "exp": int(expires.timestamp())}
+        return {"access_token": jwt.encode(claims, "benchmark", algorithm="HS256"), "token_type": "bearer"}
+
+    def _user_id(self, request: httpx.Request) -> str:
+        return request.url.path.rstrip("/").split("/user/", 1)[1].split("/")[0]
+
+    def _question(self, domain: Optional[str]) -> Dict[str, Any]:
+        number = self._random.randrange(10_000)
+        correct = self._random.randrange(4)
+        return {
+            "question_text": f"Pregunta simulada {number}: ¿cuál es la mejor acción del Project Manager?",
+            "options": [
+                {"text": f"Opción {chr(65 + i)} de la pregunta {number}", "is_correct": i == correct}
+                for i in range(4)
+            ],
+            "explanation": f"Explicación de la pregunta {number}. " * 4,
+            "domain": domain if domain in DOMAINS else self._random.choice(DOMAINS),
+        }
+
+    def _chat(self, body: Dict[str, Any]) -> httpx.Response:
+        chunks = [f"Fragmento {i} de la respuesta a «{body.get('message', '')[:20]}». " for i in range(self.chat_chunks)]
+        if not body.get("stream"):
+            return httpx.Response(200, json={"response": "".join(chunks)})
+
+        async def events() -> AsyncIterator[bytes]:
+            for chunk in chunks:
+                if self.chunk_delay:
+                    await asyncio.sleep(self.chunk_delay)
+                yield f"data: {json.dumps({'delta': chunk})}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=events())
+
+    def _history(self, user_id: str) -> List[Dict[str, Any]]:
+        """Historial sintético de `history_size` sesiones más las guardadas, de la más reciente a la más antigua."""
+        now = datetime.now()
+        sessions = [
+            {
+                "id": i + 1,
+                "user_id": user_id,
+                "start_time": (now - timedelta(days=i + 1)).isoformat(),
+                "end_time": (now - timedelta(days=i + 1) + timedelta(minutes=20)).isoformat(),
+                "personas_total": 4, "personas_correct": 3,
+                "proceso_total": 4, "proceso_correct": 2,
+                "entorno_total": 2, "entorno_correct": 1,
+            }
+            for i in range(self.history_size)
+        ]
+        return list(reversed(self._saved.get(user_id, []))) + sessions
+
+    def _page(self, sessions: List[Dict[str, Any]], params: httpx.QueryParams) -> List[Dict[str, Any]]:
+        if "since" in params:
+            since = datetime.fromisoformat(params["since"])
+            sessions = [session for session in sessions if datetime.fromisoformat(session["start_time"]) > since]
+        if "limit" in params:
+            offset = int(params.get("offset", 0))
+            sessions = sessions[offset:offset + int(params["limit"])]
+        return sessions
+
+    def _stats(self, sessions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"total_sessions": len(sessions)}
+        for domain in DOMAINS:
+            stats[f"{domain}_total"] = sum(session[f"{domain}_total"] for session in sessions)
+            stats[f"{domain}_correct"] = sum(session[f"{domain}_correct"] for session in sessions)
+        return stats
@@ -0,0 +1,114 @@
+"""Mide el tráfico del websocket por pregunta en el flujo pregunta → respuesta.
+
+Recorre preguntas de un backend simulado con PMPQuizApp sobre una página sin
+navegador y cuenta los bytes que Flet enviaría al cliente al pasar a cada
+pregunta y al verificar su respuesta. La primera pregunta incluye el montaje
+inicial de las vistas y se informa por separado.
+
+Con `--before` se reproduce el comportamiento anterior a las optimizaciones
+para comparar: la página se limpia y se vuelve a montar entera en cada
+pregunta, cada actualización se envía al momento sin agruparse y no se usan ni
+la precarga de preguntas ni el endpoint por lotes.
+
+Uso: python -m benchmarks.question_traffic [--questions 20] [--before]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime
+from typing import Tuple
+
+import flet as ft
+
+from benchmarks.headless import FakeEvent, create_page
+from benchmarks.mock_backend import MockBackend
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.models.quiz_session import QuizSession
+from src.services.api_service import APIService
+from src.ui.components import UpdateScheduler
+
+# Tiempo de lectura entre preguntas, durante el que trabaja la precarga
+THINK_SECONDS = 0.01
+
+
+class ImmediateUpdates(UpdateScheduler):
+    """Sin agrupar: cada actualización pedida se envía en el momento."""
+
+    def request(self, *controls: ft.Control):
+        super().request(*controls)
+        self.flush()
+
+
+async def answer_question(app: PMPQuizApp, page, connection, before: bool) -> Tuple[int, int]:
+    """Pasa a la siguiente pregunta, elige una opción y la verifica; devuelve los bytes de cada paso."""
+    question_view = app.views["question"]
+    await asyncio.sleep(THINK_SECONDS)
+    start = connection.bytes_sent
+    if before:
+        # Antes cada vista limpiaba la página y montaba de nuevo todo el árbol
+        page.clean()
+    await app.handle_next_question(FakeEvent(page), "aleatorio")
+    await asyncio.sleep(0)
+    shown = connection.bytes_sent
+
+    question_view.handle_option_selected(FakeEvent(page, data=str(random.randrange(4))))
+    # Las vistas agrupan sus actualizaciones hasta la siguiente iteración del bucle
+    await asyncio.sleep(0)
+    selected = connection.bytes_sent
+    await question_view.handle_submit_answer(FakeEvent(page))
+    await asyncio.sleep(0)
+    return shown - start, connection.bytes_sent - selected
+
+
+async def run(questions: int, before: bool):
+    page, connection = create_page()
+    pool = APIService(transport=MockBackend().transport())
+    app = PMPQuizApp(api_service=pool.for_session())
+    app.page = page
+    page.quiz_session = QuizSession(start_time=datetime.now(), answers=[])
+    app.quiz_session = page.quiz_session
+    if before:
+        page.update_scheduler = ImmediateUpdates(page)
+        app.prefetcher.depth = 0
+        pool._batch_supported = False
+
+    try:
+        await app.api_service.login("trafico@example.com", "secreto")
+        # Vista previa a la práctica, como en la aplicación real
+        app.views["practice_intro"].build(page)
+        app.prefetcher.warm("aleatorio")
+
+        connection.reset()
+        first = await answer_question(app, page, connection, before)
+        first_messages, first_bytes = connection.messages, connection.bytes_sent
+
+        connection.reset()
+        steps = [await answer_question(app, page, connection, before) for _ in range(2, questions + 1)]
+        rest = len(steps)
+    finally:
+        app.close()
+        await app.prefetcher.wait_closed()
+        await pool.close()
+
+    print(f"modo: {'antes (sin optimizaciones)' if before else 'actual'}")
+    print(f"{'':<22}{'mensajes':>10}{'pregunta':>12}{'respuesta':>12}{'total':>12}")
+    print(f"{'primera pregunta':<22}{first_messages:>10}{first[0]:>12}{first[1]:>12}{first_bytes:>12}")
+    print(
+        f"{'siguientes (media)':<22}{connection.messages / rest:>10.1f}"
+        f"{sum(s[0] for s in steps) / rest:>12.0f}"
+        f"{sum(s[1] for s in steps) / rest:>12.0f}"
+        f"{connection.bytes_sent / rest:>12.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--before", action="store_true", help="sin shell persistente, agrupación ni precarga")
+    args = parser.parse_args()
+    random.seed(0)
+    asyncio.run(run(max(args.questions, 2), args.before))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Mide el coste de arranque y de memoria por sesión de PMPQuizApp.
+
+Compara la carga diferida de vistas (por defecto) con el comportamiento
+anterior: todos los módulos de vistas importados junto con la aplicación y
+todas las vistas construidas al crear la sesión.
+
+La carga diferida ahorra sobre todo memoria por sesión. La importación de la
+aplicación la domina src.services.api_service (httpx, jose y métricas), que se
+necesita igualmente al abrir la primera sesión, así que las vistas solo
+suponen una parte pequeña y ruidosa de ese tiempo.
+
+Uso: python -m benchmarks.startup [--sessions 200] [--runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Se ejecuta en un intérprete limpio para que ningún módulo esté ya importado
+PROBE = """
+import importlib, json, pkgutil, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+import flet
+t1 = time.perf_counter()
+from src.app.pmp_quiz_app import PMPQuizApp
+eager = {eager!r}
+if eager:
+    # Antes pmp_quiz_app importaba todas las vistas al cargarse
+    import src.ui.views
+    for module in pkgutil.iter_modules(src.ui.views.__path__):
+        importlib.import_module("src.ui.views." + module.name)
+t2 = time.perf_counter()
+
+first = PMPQuizApp()
+if eager:
+    first.views.build_all()
+t3 = time.perf_counter()
+
+tracemalloc.start()
+apps = []
+for _ in range({sessions}):
+    app = PMPQuizApp()
+    if eager:
+        app.views.build_all()
+    apps.append(app)
+current, _ = tracemalloc.get_traced_memory()
+
+print(json.dumps({{
+    "flet_import_ms": (t1 - t0) * 1000,
+    "app_import_ms": (t2 - t1) * 1000,
+    "first_session_ms": (t3 - t2) * 1000,
+    "bytes_per_session": current / {sessions},
+}}))
+"""
+
+
+def run_probe(eager: bool, sessions: int) -> dict:
+    code = PROBE.format(root=str(ROOT), eager=eager, sessions=sessions)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'modo':<8}{'import flet':>14}{'import app':>14}{'1ª sesión':>14}{'KiB/sesión':>14}")
+    for label, eager in (("eager", True), ("lazy", False)):
+        results = [run_probe(eager, args.sessions) for _ in range(args.runs)]
+        median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+        print(
+            f"{label:<8}"
+            f"{median['flet_import_ms']:>11.1f} ms"
+            f"{median['app_import_ms']:>11.1f} ms"
+            f"{median['first_session_ms']:>11.1f} ms"
+            f"{median['bytes_per_session'] / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,91 +1,103 @@
+import asyncio
 import flet as ft
 from datetime import datetime
 from typing import Optional
 from src.models.question import Question
 from src.models.quiz_session import QuizSession
-from src.services.api_service import api_service
-from src.ui.views.auth_view import AuthView
-from src.ui.views.educational_resources_view import EducationalResourcesView
-from src.ui.views.main_view import MainView
-from src.ui.views.principle_detail_view import PrincipleDetailView
-from src.ui.views.principle_detail_view_2 import PrincipleDetailView2
-from src.ui.views.principle_detail_view_3 import PrincipleDetailView3
-from src.ui.views.principle_detail_view_4 import PrincipleDetailView4
-from src.ui.views.principle_detail_view_5 import PrincipleDetailView5
-from src.ui.views.question_view import QuestionView
-from src.ui.views.results_view import ResultsView
-from src.ui.views.selection_view import SelectionView
-from src.ui.views.chat_view import ChatView
-from src.ui.views.practice_intro_view import PracticeIntroView
-from src.ui.views.answer_view import AnswerView
-from src.ui.components import show_loading, hide_loading, show_error_message
-from src.ui.views.progress_view import ProgressView
-from src.ui.views.principles_view import PrinciplesView
+from src.services.api_service import APIService, api_service as shared_api_service
+from src.services.chat_service import ChatService
+from src.services.question_prefetcher import QuestionPrefetcher
+from src.app.view_registry import ViewRegistry
+from src.ui.components import show_loading, hide_loading, show_error_message, LayoutShell
 
 class PMPQuizApp:
-    def __init__(self):
+    def __init__(
+        self,
+        api_service: Optional[APIService] = None,
+        chat_service: Optional[ChatService] = None
+    ):
         self.current_question: Optional[Question] = None
         self.page: Optional[ft.Page] = None
         self.quiz_session: Optional[QuizSession] = None
 
-        # Initialize views
-        self.auth_view = AuthView(
+        # Servicios propios de la sesión (usuario, token e historial de chat)
+        self.api_service = api_service or shared_api_service.for_session()
+        self.chat_service = chat_service or ChatService(self.api_service)
+        self.prefetcher = QuestionPrefetcher(self.api_service)
+
+        # Shell montado de la práctica: se conserva entre preguntas
+        self.quiz_layout = LayoutShell()
+
+        # Las vistas se importan y construyen en su primera navegación
+        self.views = ViewRegistry()
+        self.views.register(
+            "auth", "src.ui.views.auth_view", "AuthView",
             on_login_success=self.handle_login_success,
-            on_signup_success=self.handle_signup_success
+            on_signup_success=self.handle_signup_success,
+            api_service=self.api_service
         )
-        self.selection_view = SelectionView(
+        self.views.register(
+            "selection", "src.ui.views.selection_view", "SelectionView",
             on_practice_selected=self.handle_practice_selected,
             on_chat_selected=self.show_chat_view,
             on_progress_selected=self.show_progress_view,
             on_educational_resources_selected=self.show_educational_resources_view,
             on_logout=self.handle_logout
         )
-        self.progress_view = ProgressView(
-            on_return_home=self.show_selection_view
+        self.views.register(
+            "progress", "src.ui.views.progress_view", "ProgressView",
+            on_return_home=self.show_selection_view,
+            api_service=self.api_service
         )
-        self.main_view = MainView(
+        self.views.register(
+            "main", "src.ui.views.main_view", "MainView",
             on_practice=self.handle_practice
         )
-        self.question_view = QuestionView(
-            on_answer_submitted=self.handle_answer_submitted
-        )
-        self.answer_view = AnswerView(
+        self.views.register(
+            "question", "src.ui.views.question_view", "QuestionView",
             on_next_question=self.handle_next_question,
-            on_finish_practice=self.handle_finish_practice
+            on_finish_practice=self.handle_finish_practice,
+            on_domain_changed=self.handle_domain_changed,
+            layout=self.quiz_layout
         )
-        self.results_view = ResultsView(
+        self.views.register(
+            "results", "src.ui.views.results_view", "ResultsView",
             on_return_home=self.show_selection_view
         )
-        self.chat_view = ChatView(
-            on_return_home=self.show_selection_view
+        self.views.register(
+            "chat", "src.ui.views.chat_view", "ChatView",
+            on_return_home=self.show_selection_view,
+            chat_service=self.chat_service
         )
-        self.practice_intro_view = PracticeIntroView(
+        self.views.register(
+            "practice_intro", "src.ui.views.practice_intro_view", "PracticeIntroView",
             on_start_practice=self.handle_practice
         )
-        self.principle_detail_view = PrincipleDetailView(
-            on_return_to_principles=self.show_principles_view
-        )
-        self.principle_detail_view_2 = PrincipleDetailView2(
-            on_return_to_principles=self.show_principles_view
-        )
-        self.principle_detail_view_3 = PrincipleDetailView3(
-            on_return_to_principles=self.show_principles_view
-        )
-        self.principle_detail_view_4 = PrincipleDetailView4(
-            on_return_to_principles=self.show_principles_view
+        self.views.register(
+            "principle_detail", "src.ui.views.principle_detail_view", "PrincipleDetailView",
+            on_return_to_principles=self.show_principles_view,
+            chat_service=self.chat_service
         )
-        self.principle_detail_view_5 = PrincipleDetailView5(
-            on_return_to_principles=self.show_principles_view
-        )
-        self.principles_view = PrinciplesView(
+        self.views.register(
+            "principles", "src.ui.views.principles_view", "PrinciplesView",
             on_return_home=self.show_selection_view,
             on_principle_detail=self.show_principle_detail
         )
-        self.educational_resources_view = EducationalResourcesView(
+        self.views.register(
+            "educational_resources", "src.ui.views.educational_resources_view", "EducationalResourcesView",
             on_return_home=self.show_selection_view,
             on_principles_selected=self.show_principles_view
         )
 
+    def close(self):
+        """Libera el estado de la sesión cuando el navegador se desconecta."""
+        self.prefetcher.close()
+        self.api_service.logout()
+        self.chat_service.clear_history()
+        self.quiz_session = None
+        self.current_question = None
+        self.page = None
+
     def show_main_view(self, page: Optional[ft.Page] = None):
         """Muestra la vista principal o la vista de autenticación según corresponda."""
         if page is None and hasattr(self, 'page'):
@@ -98,8 +110,8 @@ class PMPQuizApp:
         else:
             raise ValueError("No se pudo obtener una referencia válida a la página")
 
-        if not api_service.current_user:
-            self.auth_view.build(page)
+        if not self.api_service.current_user:
+            self.views["auth"].build(page)
             return
 
         # Si está autenticado, muestra la vista de selección
@@ -115,43 +127,34 @@ class PMPQuizApp:
 
         self.quiz_session = None
         hide_loading(page)
-        self.selection_view.build(page)
+        self.views["selection"].build(page)
 
     def show_chat_view(self, e):
         """Muestra la vista de chat."""
         page = e.page if hasattr(e, 'page') else self.page
         hide_loading(page)
-        self.chat_view.build(page)
+        self.views["chat"].build(page)
 
     def show_progress_view(self, e):
         """Muestra la vista de progreso."""
         page = e.page if hasattr(e, 'page') else self.page
         hide_loading(page)
-        page.loop.create_task(self.progress_view.build(page))
+        page.loop.create_task(self.views["progress"].build(page))
 
     def show_educational_resources_view(self, e):
         """Muestra la vista de recursos educativos."""
         page = e.page if hasattr(e, 'page') else self.page
-        self.educational_resources_view.build(page)
+        self.views["educational_resources"].build(page)
 
     def show_principles_view(self, e):
         """Muestra la vista de principios."""
         page = e.page if hasattr(e, 'page') else self.page
-        self.principles_view.build(page)
+        self.views["principles"].build(page)
 
     def show_principle_detail(self, e, principle_number: int):
         """Muestra la vista detallada de un principio específico."""
         page = e.page if hasattr(e, 'page') else self.page
-        if principle_number == 1:
-            self.principle_detail_view.build(page)
-        elif principle_number == 2:
-            self.principle_detail_view_2.build(page)
-        elif principle_number == 3:
-            self.principle_detail_view_3.build(page)
-        elif principle_number == 4:
-            self.principle_detail_view_4.build(page)
-        elif principle_number == 5:
-            self.principle_detail_view_5.build(page)
+        self.views["principle_detail"].build(page, principle_number)
 
     async def handle_login_success(self, e):
         """Maneja el evento de login exitoso."""
@@ -163,17 +166,19 @@ class PMPQuizApp:
 
     async def handle_logout(self, e):
         """Maneja el evento de cerrar sesión."""
-        api_service.logout()
+        self.prefetcher.close()
+        self.api_service.logout()
+        self.chat_service.clear_history()
         self.show_main_view(e)
 
     async def handle_practice(self, e, domain: str):
         """Maneja la selección de práctica por dominio."""
         page = e.page
-        show_loading(page)
+        handle = show_loading(page)
 
         try:
             # Verificar autenticación
-            if not api_service.current_user:
+            if not self.api_service.current_user:
                 self.show_main_view(page)
                 return
 
@@ -185,72 +190,79 @@ class PMPQuizApp:
                 )
                 page.quiz_session = self.quiz_session
 
-            # Obtener primera pregunta
-            question = await api_service.get_single_question(domain)
+            # Validar la sesión con el backend mientras se pide la primera pregunta;
+            # get_current_user reutiliza la validación durante CURRENT_USER_CACHE_TTL
+            user, question = await asyncio.gather(
+                self.api_service.get_current_user(),
+                self.prefetcher.get(domain)
+            )
+            if not user:
+                # Token rechazado: se vuelve a pedir el login
+                await self.handle_logout(e)
+                return
             if question:
                 self.current_question = question
-                hide_loading(page)
-                self.question_view.build(page, self.current_question)
+                hide_loading(page, handle)
+                self.views["question"].build(page, self.current_question, domain)
             else:
                 show_error_message(page, "Error al obtener la pregunta")
         except Exception as e:
             show_error_message(page, f"Error: {str(e)}")
         finally:
-            hide_loading(page)
-
-    async def handle_answer_submitted(self, e, question: Question, selected_answer: str, is_correct: bool):
-        """Maneja cuando se envía una respuesta, mostrando la vista de respuesta."""
-        self.answer_view.build(e.page, question, selected_answer, is_correct)
+            hide_loading(page, handle)
 
     async def handle_next_question(self, e, domain: str):
         """Maneja el evento de siguiente pregunta."""
         page = e.page
-        show_loading(page)
+        # Solo se pide la carga si la pregunta no está precargada
+        handle = None if self.prefetcher.has_ready(domain) else show_loading(page)
 
         try:
             # Verificar autenticación
-            if not api_service.current_user:
+            if not self.api_service.current_user:
                 self.show_main_view(page)
                 return
 
-            question = await api_service.get_single_question(domain)
+            question = await self.prefetcher.get(domain)
             if question:
                 self.current_question = question
-                hide_loading(page)
-                self.question_view.build(page, self.current_question)
+                if handle:
+                    hide_loading(page, handle)
+                self.views["question"].build(page, self.current_question, domain)
             else:
                 show_error_message(page, "Error al obtener la siguiente pregunta")
         except Exception as e:
             show_error_message(page, f"Error: {str(e)}")
         finally:
-            hide_loading(page)
+            if handle:
+                hide_loading(page, handle)
+
+    async def handle_domain_changed(self, domain: str):
+        """Precarga preguntas del dominio elegido para la siguiente pregunta."""
+        self.prefetcher.warm(domain)
 
     async def handle_finish_practice(self, e):
         """Maneja el evento de finalizar práctica."""
         page = e.page
+        self.prefetcher.close()
 
         # Verificar autenticación
-        if not api_service.current_user:
+        if not self.api_service.current_user:
             self.show_main_view(page)
             return
 
         if self.quiz_session and self.quiz_session.answers:
-            show_loading(page)
+            # Mostrar los resultados
+            self.views["results"].build(page, self.quiz_session)
+
             try:
-                # Guardar la sesión en la base de datos
-                success = await api_service.save_practice_session(self.quiz_session)
-                if not success:
-                    show_error_message(page, "Error al guardar los resultados de la práctica")
+                # La sesión se guarda en la cola local y se envía en segundo plano
+                await self.api_service.queue_practice_session(self.quiz_session)
             except Exception as e:
-                show_error_message(page, f"Error: {str(e)}")
-            finally:
-                hide_loading(page)
-
-            # Mostrar los resultados
-            self.results_view.build(page, self.quiz_session)
+                show_error_message(page, f"Error al guardar los resultados de la práctica: {str(e)}")
         else:
             show_error_message(page, "No hay respuestas registradas para mostrar resultados")
 
     async def handle_practice_selected(self, e):
         """Maneja la selección de práctica mostrando la vista de introducción"""
-        self.practice_intro_view.build(e.page)
\ No newline at end of file
+        self.views["practice_intro"].build(e.page)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+import flet as ft
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.config.settings import settings
+from src.services.api_service import APIService
+from src.services.chat_service import ChatService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionContext:
+    """Estado aislado de una sesión del navegador (usuario, práctica, chat y vistas)."""
+    session_id: str
+    app: PMPQuizApp
+    connected: bool = True
+    last_seen: float = field(default_factory=time.monotonic)
+
+    @property
+    def api_service(self) -> APIService:
+        return self.app.api_service
+
+    @property
+    def chat_service(self) -> ChatService:
+        return self.app.chat_service
+
+
+class SessionRegistry:
+    """Registro acotado de sesiones indexado por el id de sesión de Flet.
+
+    Al superar `max_sessions` solo se liberan sesiones desconectadas o inactivas
+    durante más de `idle_timeout` segundos; una sesión en uso nunca se cierra. Los
+    eventos de conexión llegan desde los hilos de Flet, así que el diccionario se
+    protege con un lock.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = settings.MAX_SESSIONS,
+        idle_timeout: float = settings.SESSION_IDLE_TIMEOUT
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[SessionContext]:
+        return self._sessions.get(session_id)
+
+    def attach(self, page: ft.Page) -> SessionContext:
+        """Obtiene (o crea) el contexto de la página y enlaza sus eventos de conexión."""
+        session_id = page.session_id
+        with self._lock:
+            context = self._sessions.get(session_id)
+            created = context is None
+            if created:
+                context = SessionContext(session_id=session_id, app=PMPQuizApp())
+                # Cada navegación entre vistas cuenta como actividad de la sesión
+                context.app.views.on_access = lambda: self.touch(session_id)
+                self._sessions[session_id] = context
+        if created:
+            self._evict()
+
+        self._mark(session_id, connected=True)
+        page.on_connect = lambda e: self._mark(session_id, connected=True)
+        page.on_disconnect = lambda e: self._mark(session_id, connected=False)
+        page.on_close = lambda e: self.remove(session_id)
+        return context
+
+    def touch(self, session_id: str):
+        """Registra actividad de la sesión sin cambiar su estado de conexión."""
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context:
+                context.last_seen = time.monotonic()
+                self._sessions.move_to_end(session_id)
+
+    def remove(self, session_id: str):
+        """Elimina la sesión y libera su estado."""
+        with self._lock:
+            context = self._sessions.pop(session_id, None)
+        if context:
+            context.app.close()
+
+    def _mark(self, session_id: str, connected: bool):
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context:
+                context.connected = connected
+                context.last_seen = time.monotonic()
+                self._sessions.move_to_end(session_id)
+
+    def _evict(self):
+        """Libera sesiones desconectadas o inactivas, de la menos reciente a la más reciente."""
+        with self._lock:
+            excess = len(self._sessions) - self.max_sessions
+            if excess <= 0:
+                return
+            idle_since = time.monotonic() - self.idle_timeout
+            victims = [
+                session_id for session_id, context in self._sessions.items()
+                if not context.connected or context.last_seen < idle_since
+            ][:excess]
+            contexts = [self._sessions.pop(session_id) for session_id in victims]
+            active = len(self._sessions)
+
+        for context in contexts:
+            context.app.close()
+        if active > self.max_sessions:
+            logger.warning(
+                f"{active} sesiones activas superan MAX_SESSIONS={self.max_sessions}; "
+                "no se cierra ninguna sesión en uso"
+            )
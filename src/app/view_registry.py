@@ -0,0 +1,49 @@
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from src.services.metrics import timed_build
+
+
+@dataclass
+class ViewSpec:
+    """Dónde encontrar una vista y con qué argumentos construirla."""
+    module: str
+    class_name: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+class ViewRegistry:
+    """Importa y construye cada vista en su primera navegación y la reutiliza en la sesión."""
+
+    def __init__(self):
+        self._specs: Dict[str, ViewSpec] = {}
+        self._views: Dict[str, Any] = {}
+        # Se llama en cada acceso a una vista (p. ej. para registrar actividad)
+        self.on_access: Optional[Callable[[], None]] = None
+
+    def register(self, name: str, module: str, class_name: str, **kwargs):
+        self._specs[name] = ViewSpec(module=module, class_name=class_name, kwargs=kwargs)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __getitem__(self, name: str) -> Any:
+        if self.on_access is not None:
+            self.on_access()
+        view = self._views.get(name)
+        if view is None:
+            spec = self._specs[name]
+            view_class = getattr(importlib.import_module(spec.module), spec.class_name)
+            view = view_class(**spec.kwargs)
+            # Cada build() queda medido: duración y controles montados
+            view.build = timed_build(name, view.build)
+            self._views[name] = view
+        return view
+
+    def is_built(self, name: str) -> bool:
+        return name in self._views
+
+    def build_all(self):
+        """Construye todas las vistas registradas (útil para comparar con la carga diferida)."""
+        for name in self._specs:
+            self[name]
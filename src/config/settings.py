@@ -10,5 +10,53 @@ class Settings:
     API_URL: str = os.getenv('API_URL', 'http://localhost:8000/api')
     API_TIMEOUT: int = int(os.getenv('API_TIMEOUT', '30'))
     MAX_QUESTIONS: int = int(os.getenv('MAX_QUESTIONS', '100'))
+    QUESTION_PREFETCH_DEPTH: int = int(os.getenv('QUESTION_PREFETCH_DEPTH', '2'))
+    QUESTION_FETCH_CONCURRENCY: int = int(os.getenv('QUESTION_FETCH_CONCURRENCY', '4'))
+    CHAT_HISTORY_MAX_TURNS: int = int(os.getenv('CHAT_HISTORY_MAX_TURNS', '10'))
+    CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv('CHAT_HISTORY_TOKEN_BUDGET', '3000'))
+    CHAT_HISTORY_SUMMARY: bool = os.getenv('CHAT_HISTORY_SUMMARY', 'false').lower() == 'true'
+    CHAT_STREAM_UPDATE_INTERVAL: float = float(os.getenv('CHAT_STREAM_UPDATE_INTERVAL', '0.1'))
+    LOADING_OVERLAY_DELAY: float = float(os.getenv('LOADING_OVERLAY_DELAY', '0.3'))
+    UI_UPDATE_METRICS: bool = os.getenv('UI_UPDATE_METRICS', 'false').lower() == 'true'
+    UI_UPDATE_HISTORY: int = int(os.getenv('UI_UPDATE_HISTORY', '100'))
+    METRICS_HOST: str = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT: int = int(os.getenv('METRICS_PORT', '0'))
+    METRICS_DUMP_PATH: str = os.getenv('METRICS_DUMP_PATH', '')
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP2_ENABLED: bool = os.getenv('HTTP2_ENABLED', 'true').lower() == 'true'
+    HTTP_RETRY_ATTEMPTS: int = int(os.getenv('HTTP_RETRY_ATTEMPTS', '3'))
+    HTTP_RETRY_BASE_DELAY: float = float(os.getenv('HTTP_RETRY_BASE_DELAY', '0.2'))
+    HTTP_RETRY_MAX_DELAY: float = float(os.getenv('HTTP_RETRY_MAX_DELAY', '5'))
+    HTTP_RETRY_DEADLINE: float = float(os.getenv('HTTP_RETRY_DEADLINE', '45'))
+    CIRCUIT_WINDOW_SIZE: int = int(os.getenv('CIRCUIT_WINDOW_SIZE', '20'))
+    CIRCUIT_MIN_CALLS: int = int(os.getenv('CIRCUIT_MIN_CALLS', '5'))
+    CIRCUIT_FAILURE_RATE: float = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+    CIRCUIT_SLOW_CALL_SECONDS: float = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '5'))
+    CIRCUIT_CHAT_SLOW_CALL_SECONDS: float = float(os.getenv('CIRCUIT_CHAT_SLOW_CALL_SECONDS', '0'))
+    CIRCUIT_SLOW_CALL_RATE: float = float(os.getenv('CIRCUIT_SLOW_CALL_RATE', '0.8'))
+    CIRCUIT_OPEN_SECONDS: float = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+    CIRCUIT_HALF_OPEN_CALLS: int = int(os.getenv('CIRCUIT_HALF_OPEN_CALLS', '1'))
+    QUESTION_FALLBACK_CACHE_SIZE: int = int(os.getenv('QUESTION_FALLBACK_CACHE_SIZE', '50'))
+    JWT_PUBLIC_KEY: str = os.getenv('JWT_PUBLIC_KEY', '')
+    JWT_ALGORITHMS: str = os.getenv('JWT_ALGORITHMS', 'RS256')
+    JWT_USER_ID_CLAIM: str = os.getenv('JWT_USER_ID_CLAIM', 'user_id')
+    AUTH_REFRESH_PATH: str = os.getenv('AUTH_REFRESH_PATH', '/auth/refresh')
+    AUTH_REFRESH_MARGIN: float = float(os.getenv('AUTH_REFRESH_MARGIN', '60'))
+    AUTH_REFRESH_RETRY_INTERVAL: float = float(os.getenv('AUTH_REFRESH_RETRY_INTERVAL', '15'))
+    AUTH_REFRESH_MIN_INTERVAL: float = float(os.getenv('AUTH_REFRESH_MIN_INTERVAL', '5'))
+    CURRENT_USER_CACHE_TTL: float = float(os.getenv('CURRENT_USER_CACHE_TTL', '30'))
+    MAX_SESSIONS: int = int(os.getenv('MAX_SESSIONS', '500'))
+    SESSION_IDLE_TIMEOUT: float = float(os.getenv('SESSION_IDLE_TIMEOUT', '1800'))
+    SESSION_HISTORY_PAGE_SIZE: int = int(os.getenv('SESSION_HISTORY_PAGE_SIZE', '20'))
+    SESSION_CACHE_PATH: str = os.getenv('SESSION_CACHE_PATH', '.cache/practice_sessions.sqlite3')
+    SESSION_CACHE_MEMORY_USERS: int = int(os.getenv('SESSION_CACHE_MEMORY_USERS', '100'))
+    SESSION_OUTBOX_PATH: str = os.getenv('SESSION_OUTBOX_PATH', '.cache/outbox.sqlite3')
+    OUTBOX_BATCH_SIZE: int = int(os.getenv('OUTBOX_BATCH_SIZE', '20'))
+    OUTBOX_RETRY_BASE: float = float(os.getenv('OUTBOX_RETRY_BASE', '2'))
+    OUTBOX_RETRY_MAX: float = float(os.getenv('OUTBOX_RETRY_MAX', '300'))
+    PROGRESS_STATS_CACHE_SIZE: int = int(os.getenv('PROGRESS_STATS_CACHE_SIZE', '1000'))
+    PROGRESS_STATS_CACHE_TTL: float = float(os.getenv('PROGRESS_STATS_CACHE_TTL', '300'))
 
 settings = Settings()
\ No newline at end of file
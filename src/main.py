@@ -8,15 +8,29 @@ root_path = str(Path(__file__).parent.parent)
 sys.path.insert(0, root_path)
 
 import flet as ft
-from src.app.pmp_quiz_app import PMPQuizApp
+from src.app.session import SessionRegistry
+from src.config.settings import settings
+from src.services.api_service import api_service
+from src.services.metrics import metrics, start_metrics_server
 
 async def main():
     """Punto de entrada principal de la aplicación."""
-    app = PMPQuizApp()
-    await ft.app_async(
-        target=lambda page: app.show_main_view(page),
-        view=ft.AppView.WEB_BROWSER
-    )
+    # Cada pestaña del navegador obtiene su propio contexto de sesión
+    sessions = SessionRegistry()
+    # Los circuitos viven en este bucle: el servidor de métricas los lee a través de él
+    metrics.add_collector(api_service.metric_samples, loop=asyncio.get_running_loop())
+    if settings.METRICS_PORT:
+        start_metrics_server()
+    try:
+        await ft.app_async(
+            target=lambda page: sessions.attach(page).app.show_main_view(page),
+            view=ft.AppView.WEB_BROWSER
+        )
+    finally:
+        # Cerrar las conexiones HTTP compartidas al apagar la aplicación
+        await api_service.close()
+        if settings.METRICS_DUMP_PATH:
+            metrics.dump_json(settings.METRICS_DUMP_PATH)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,86 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+PRINCIPLES_PATH = Path(__file__).resolve().parent.parent / "data" / "principles.json"
+
+
+@dataclass(frozen=True)
+class Concept:
+    title: str
+    description: str
+
+
+@dataclass(frozen=True)
+class PracticeQuestion:
+    question: str
+    options: Tuple[str, ...]
+    explanation: str
+
+
+@dataclass(frozen=True)
+class PrincipleDetail:
+    subtitle: str
+    concepts: Tuple[Concept, ...]
+    keywords: Tuple[str, ...]
+    tips: Tuple[str, ...]
+    practice_question: PracticeQuestion
+    chat_context: str
+
+
+@dataclass(frozen=True)
+class Principle:
+    number: int
+    title: str
+    description: str
+    icon: str  # Nombre del ícono en ft.icons
+    detail: Optional[PrincipleDetail] = None
+
+    @property
+    def full_title(self) -> str:
+        return f"Principio {self.number}: {self.title}"
+
+    @property
+    def has_detail(self) -> bool:
+        return self.detail is not None
+
+
+def _parse_principle(data: dict) -> Principle:
+    detail = data.get("detail")
+    if detail:
+        practice = detail["practice_question"]
+        detail = PrincipleDetail(
+            subtitle=detail["subtitle"],
+            concepts=tuple(Concept(**concept) for concept in detail["concepts"]),
+            keywords=tuple(detail["keywords"]),
+            tips=tuple(detail["tips"]),
+            practice_question=PracticeQuestion(
+                question=practice["question"],
+                options=tuple(practice["options"]),
+                explanation=practice["explanation"]
+            ),
+            chat_context=detail["chat_context"]
+        )
+    return Principle(
+        number=data["number"],
+        title=data["title"],
+        description=data["description"],
+        icon=data["icon"],
+        detail=detail
+    )
+
+
+@lru_cache(maxsize=None)
+def load_principles() -> Tuple[Principle, ...]:
+    """Carga el catálogo de principios una sola vez por proceso."""
+    with open(PRINCIPLES_PATH, encoding="utf-8") as f:
+        return tuple(_parse_principle(data) for data in json.load(f))
+
+
+def get_principle(number: int) -> Optional[Principle]:
+    for principle in load_principles():
+        if principle.number == number:
+            return principle
+    return None
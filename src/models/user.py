@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
 @dataclass
@@ -6,4 +7,7 @@ class User:
     email: str
     id: str  # Agregamos el campo id
     access_token: Optional[str] = None
-    is_authenticated: bool = False
\ No newline at end of file
+    is_authenticated: bool = False
+    # Caducidad del access token según su claim `exp` (None si no se conoce)
+    expires_at: Optional[datetime] = None
+    refresh_token: Optional[str] = None
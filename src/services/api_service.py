@@ -1,142 +1,659 @@
+import asyncio
+from collections import deque
+from dataclasses import replace
 import httpx
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+import importlib.util
+import logging
+from typing import Optional, Dict, Any, List, Iterable, Callable, Awaitable, Deque, Tuple
+from datetime import datetime, timezone
 from src.models.question import Question, Option
 from src.models.quiz_session import QuizSession, PracticeSession
 from src.models.user import User
+from src.services.progress_stats import ProgressStats, ProgressStatsCache
+from src.services.session_store import PracticeSessionStore, SyncState
+from src.services.session_outbox import PracticeSessionOutbox
+from src.services.retry import RetryPolicy
+from src.services.auth import AuthManager, decode_access_token
+from src.services.single_flight import SingleFlight
+from src.services.metrics import InstrumentedTransport
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN, SERVICE_UNAVAILABLE_MESSAGE
 from src.config.settings import settings
 import random
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+QUESTION_DOMAINS = ["personas", "proceso", "entorno"]
+# Endpoints con circuit breaker propio: si uno se degrada, los demás siguen disponibles
+CIRCUIT_ENDPOINTS = ["question", "chat", "practice_sessions", "auth"]
+
+
+def _slow_call_seconds(endpoint: str) -> Optional[float]:
+    """Umbral de llamada lenta del circuito del endpoint (None: no se cuentan).
+
+    El chat tarda lo que tarde el modelo en responder; tiene su propio umbral,
+    desactivado por defecto, para que respuestas largas no lo abran para todos.
+    """
+    if endpoint == "chat":
+        return settings.CIRCUIT_CHAT_SLOW_CALL_SECONDS or None
+    return settings.CIRCUIT_SLOW_CALL_SECONDS or None
+
+
+# Resultado del envío de una sesión de la cola
+OUTBOX_SENT = "sent"
+OUTBOX_REJECTED = "rejected"
+OUTBOX_RETRY = "retry"
+
+
+def _outbox_outcome(status_code: int) -> str:
+    """Clasifica la respuesta al guardar una sesión.
+
+    Se reintentan los errores del servidor, 429 y 408, y también 401: el token
+    caducado se renueva o llega con el siguiente login. El resto de 4xx
+    (400, 404, 409, 422...) es un rechazo definitivo.
+    """
+    if status_code in (200, 201):
+        return OUTBOX_SENT
+    if status_code >= 500 or status_code in (401, 408, 429):
+        return OUTBOX_RETRY
+    return OUTBOX_REJECTED
 
 
 class APIService:
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
         self.base_url = settings.API_URL
         self.timeout = settings.API_TIMEOUT
         self.current_user: Optional[User] = None
+        # Las lecturas se reintentan siempre; las escrituras solo si no llegaron a procesarse
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.write_retry_policy = replace(self.retry_policy, idempotent=False)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pool_owner: Optional["APIService"] = None
+        # None hasta saber si el backend expone el endpoint de preguntas por lotes
+        self._batch_supported: Optional[bool] = None
+        # Igual para el endpoint de estadísticas agregadas de progreso
+        self._stats_supported: Optional[bool] = None
+        self._progress_stats = ProgressStatsCache()
+        self._sessions_store: Optional[PracticeSessionStore] = None
+        self._sessions_outbox: Optional[PracticeSessionOutbox] = None
+        self._outbox_batch_supported: Optional[bool] = None
+        # False si el backend ignora limit/offset del historial de sesiones
+        self._session_paging_supported: Optional[bool] = None
+        # Envío en segundo plano de la cola, por usuario y propiedad del pool
+        self._outbox_tasks: Dict[str, asyncio.Task] = {}
+        # Descarga en segundo plano del historial a la caché local, por usuario
+        self._history_backfills: Dict[str, asyncio.Task] = {}
+        self._outbox_flushers: Dict[str, "APIService"] = {}
+        # Un único envío a la vez por usuario aunque tenga varias pestañas abiertas
+        self._outbox_locks: Dict[str, asyncio.Lock] = {}
+        # Una única renovación de token a la vez por usuario en todo el pool
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
+        self._circuits: Dict[str, CircuitBreaker] = {}
+        # Lecturas idénticas en curso, compartidas por todas las sesiones del pool
+        self.single_flight = SingleFlight()
+        # Últimas preguntas recibidas por dominio, para servirlas con el circuito abierto
+        self._recent_questions: Dict[str, Deque[Question]] = {}
+        # Cabecera Authorization, renovación del token y reintento tras un 401
+        self.auth = AuthManager(self)
+        # (usuario, momento de la comprobación, resultado) de la última llamada a /auth/me
+        self._current_user_cache: Optional[Tuple[User, float, Optional[User]]] = None
+        self._current_user_task: Optional[asyncio.Task] = None
+
+    def for_session(self) -> "APIService":
+        """Crea un servicio con usuario propio que comparte el pool HTTP de este servicio."""
+        service = APIService(transport=self._transport, retry_policy=self.retry_policy)
+        service._pool_owner = self
+        return service
+
+    def circuit(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker del endpoint, compartido por todas las sesiones del pool."""
+        pool = self._pool_owner or self
+        if endpoint not in pool._circuits:
+            pool._circuits[endpoint] = CircuitBreaker(endpoint, slow_call_seconds=_slow_call_seconds(endpoint))
+        return pool._circuits[endpoint]
+
+    def circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de los circuit breakers de cada endpoint, para métricas."""
+        return {endpoint: self.circuit(endpoint).snapshot() for endpoint in CIRCUIT_ENDPOINTS}
+
+    def metric_samples(self) -> Iterable[Tuple[str, Dict[str, Any], float]]:
+        """Valores instantáneos de circuitos y lecturas compartidas, como colector de métricas."""
+        pool = self._pool_owner or self
+        for endpoint, snapshot in self.circuit_states().items():
+            yield "circuit_open", {"endpoint": endpoint}, float(snapshot["state"] == OPEN)
+            yield "circuit_failure_rate", {"endpoint": endpoint}, snapshot["failure_rate"]
+            yield "circuit_rejected_calls", {"endpoint": endpoint}, snapshot["rejected"]
+        yield "single_flight_calls", {}, pool.single_flight.calls
+        yield "single_flight_shared_calls", {}, pool.single_flight.shared
+
+    async def _request(
+        self,
+        endpoint: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        retry_policy: Optional[RetryPolicy] = None
+    ) -> httpx.Response:
+        """Envía la petición con reintentos a través del circuit breaker del endpoint."""
+        policy = retry_policy or self.retry_policy
+        return await self.circuit(endpoint).call(send, retry_policy=policy)
+
+    async def _get(
+        self,
+        endpoint: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """GET autenticado en el que las peticiones idénticas simultáneas comparten respuesta.
+
+        Solo para lecturas deterministas: dos llamadas a la vez con la misma URL,
+        parámetros, cabeceras y usuario hacen una única petición al backend.
+        """
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+            self.current_user.id if self.current_user else None
+        )
+        pool = self._pool_owner or self
+        return await pool.single_flight.do(key, lambda: self._request(endpoint, lambda: self.client.get(
+            url,
+            params=params,
+            headers=headers,
+            auth=self.auth
+        )))
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartido; se crea en el primer uso y reutiliza sus conexiones."""
+        if self._pool_owner is not None:
+            return self._pool_owner.client
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Crea el cliente con pool de conexiones, keep-alive, HTTP/2 si está disponible y métricas."""
+        http2 = settings.HTTP2_ENABLED
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 deshabilitado: instala httpx[http2] para habilitarlo")
+            http2 = False
+
+        transport = self._transport or httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        # Todas las llamadas de APIService y ChatService pasan por este transporte medido
+        return httpx.AsyncClient(timeout=self.timeout, transport=InstrumentedTransport(transport))
+
+    async def close(self):
+        """Cierra el cliente HTTP y libera las conexiones del pool.
+
+        Los servicios de sesión no cierran el pool compartido; lo hace su propietario.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._sessions_store is not None:
+            self._sessions_store.close()
+            self._sessions_store = None
+        for task in self._history_backfills.values():
+            task.cancel()
+        self._history_backfills.clear()
+        # Lo que no llegó a enviarse sigue en la cola; client_session_id evita duplicados
+        for task in self._outbox_tasks.values():
+            task.cancel()
+        self._outbox_tasks.clear()
+        self._outbox_flushers.clear()
+        if self._sessions_outbox is not None:
+            self._sessions_outbox.close()
+            self._sessions_outbox = None
+        self.auth.stop()
+
+    @property
+    def sessions_store(self) -> Optional[PracticeSessionStore]:
+        """Caché local del historial compartida por todas las sesiones (None si está desactivada)."""
+        if self._pool_owner is not None:
+            return self._pool_owner.sessions_store
+        if self._sessions_store is None and settings.SESSION_CACHE_PATH:
+            self._sessions_store = PracticeSessionStore(settings.SESSION_CACHE_PATH)
+        return self._sessions_store
+
+    @property
+    def sessions_outbox(self) -> PracticeSessionOutbox:
+        """Cola persistente de sesiones pendientes de guardar, compartida por todas las sesiones."""
+        if self._pool_owner is not None:
+            return self._pool_owner.sessions_outbox
+        if self._sessions_outbox is None:
+            self._sessions_outbox = PracticeSessionOutbox(settings.SESSION_OUTBOX_PATH)
+        return self._sessions_outbox
 
     async def signup(self, email: str, password: str) -> tuple[bool, str]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/auth/signup",
-                    json={"email": email, "password": password}
-                )
-                if response.status_code == 200:
-                    return True, ""
-                return False, response.json().get("detail", "Error en el registro")
+            response = await self._request("auth", lambda: self.client.post(
+                f"{self.base_url}/auth/signup",
+                json={"email": email, "password": password}
+            ), self.write_retry_policy)
+            if response.status_code == 200:
+                return True, ""
+            return False, response.json().get("detail", "Error en el registro")
+        except CircuitOpenError:
+            return False, SERVICE_UNAVAILABLE_MESSAGE
         except Exception as e:
             return False, str(e)
 
     async def login(self, email: str, password: str) -> tuple[bool, str]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/auth/token",
-                    data={"username": email, "password": password}
-                )
+            response = await self._request("auth", lambda: self.client.post(
+                f"{self.base_url}/auth/token",
+                data={"username": email, "password": password}
+            ), self.write_retry_policy)
 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Obtenemos los datos del usuario
-                    user_response = await client.get(
+            if response.status_code == 200:
+                data = response.json()
+                access_token = data["access_token"]
+                claims = decode_access_token(access_token)
+                user_id = claims.user_id if claims else None
+                if user_id is None:
+                    # El token no trae el id: obtenemos los datos del usuario
+                    user_response = await self._request("auth", lambda: self.client.get(
                         f"{self.base_url}/auth/me",
-                        headers={"Authorization": f"Bearer {data['access_token']}"}
-                    )
-                    user_data = user_response.json()
-
-                    self.current_user = User(
-                        email=email,
-                        id=user_data["id"],
-                        access_token=data["access_token"],
-                        is_authenticated=True
-                    )
-                    return True, ""
-                return False, response.json().get("detail", "Error en el login")
+                        headers={"Authorization": f"Bearer {access_token}"}
+                    ))
+                    user_id = user_response.json()["id"]
+
+                self.current_user = User(
+                    email=email,
+                    id=user_id,
+                    access_token=access_token,
+                    is_authenticated=True,
+                    expires_at=claims.expires_at if claims else None,
+                    refresh_token=data.get("refresh_token")
+                )
+                self.auth.start()
+                # Enviar las sesiones que quedaron pendientes en visitas anteriores
+                self.schedule_outbox_flush()
+                return True, ""
+            return False, response.json().get("detail", "Error en el login")
+        except CircuitOpenError:
+            return False, SERVICE_UNAVAILABLE_MESSAGE
         except Exception as e:
             return False, str(e)
 
     async def get_current_user(self) -> Optional[User]:
-        if not self.current_user or not self.current_user.access_token:
+        """Usuario de la sesión validado contra /auth/me.
+
+        La respuesta se reutiliza durante CURRENT_USER_CACHE_TTL segundos y las
+        llamadas simultáneas comparten una única petición. Si el backend no
+        responde se devuelve el usuario conocido mientras su token no haya caducado.
+        """
+        user = self.current_user
+        if not user or not user.access_token:
             return None
 
+        cached = self._current_user_cache
+        if cached is not None and cached[0] is user and time.monotonic() - cached[1] < settings.CURRENT_USER_CACHE_TTL:
+            return cached[2]
+
+        if self._current_user_task is None or self._current_user_task.done():
+            self._current_user_task = asyncio.create_task(self._fetch_current_user(user))
+        return await asyncio.shield(self._current_user_task)
+
+    async def _fetch_current_user(self, user: User) -> Optional[User]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/auth/me",
-                    headers={"Authorization": f"Bearer {self.current_user.access_token}"}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return User(
-                        email=data["email"],
-                        access_token=self.current_user.access_token,
-                        is_authenticated=True
-                    )
-                return None
-        except Exception:
-            return None
+            response = await self._get("auth", f"{self.base_url}/auth/me")
+        except Exception as e:
+            logger.error(f"Error validando el usuario: {e}")
+            expired = user.expires_at is not None and user.expires_at <= datetime.now(timezone.utc)
+            return None if expired else user
+
+        if response.status_code == 200:
+            data = response.json()
+            user.email = data.get("email", user.email)
+            user.id = data.get("id", user.id)
+            result = user
+        elif response.status_code == 401:
+            # AuthManager ya intentó renovar el token: la sesión no es válida
+            result = None
+        else:
+            logger.error(f"Error validando el usuario: {response.status_code}")
+            return user
+
+        if self.current_user is user:
+            self._current_user_cache = (user, time.monotonic(), result)
+        return result
 
     def logout(self):
         self.current_user = None
+        self._current_user_cache = None
+        self.auth.stop()
+        # El envío de la cola pertenece al pool y termina aunque el usuario salga
 
     async def get_single_question(self, domain: str) -> Optional[Question]:
         """Obtiene una única pregunta del API."""
         try:
             if domain == "aleatorio":
-                domain = random.choice(["personas", "proceso", "entorno"])
+                domain = random.choice(QUESTION_DOMAINS)
+
+            response = await self._request("question", lambda: self.client.get(
+                f"{self.base_url}/question",
+                params={"domain": domain},
+                auth=self.auth
+            ))
+            data = response.json()
+
+            if data.get("data"):
+                question = self._parse_question(data["data"])
+                self._remember_question(question)
+                return question
+            return None
+        except CircuitOpenError:
+            # Backend degradado: mejor una pregunta ya vista que esperar al timeout
+            return self._cached_question(domain)
+        except Exception as e:
+            logger.error(f"Error obteniendo pregunta: {e}")
+            return None
+
+    async def get_questions(
+        self,
+        domain: str,
+        count: int,
+        exclude: Optional[Iterable[str]] = None
+    ) -> List[Question]:
+        """Obtiene varias preguntas sin repetir las ya vistas (comparando `question_text`).
+
+        Usa el endpoint por lotes si el backend lo soporta y, si no, peticiones
+        individuales en paralelo con concurrencia limitada.
+        """
+        seen = set(exclude or ())
+        questions: List[Question] = []
+
+        # Unas pocas rondas extra para reponer las preguntas descartadas por repetidas
+        for _ in range(3):
+            missing = count - len(questions)
+            if missing <= 0:
+                break
+
+            for question in await self._fetch_questions(domain, missing):
+                if question.question_text not in seen and len(questions) < count:
+                    seen.add(question.question_text)
+                    questions.append(question)
+
+        return questions
+
+    async def _fetch_questions(self, domain: str, count: int) -> List[Question]:
+        """Pide `count` preguntas; en "aleatorio" reparte cada una en un dominio al azar."""
+        if domain == "aleatorio":
+            counts: Dict[str, int] = {}
+            for _ in range(count):
+                chosen = random.choice(QUESTION_DOMAINS)
+                counts[chosen] = counts.get(chosen, 0) + 1
+        else:
+            counts = {domain: count}
+
+        batches = await asyncio.gather(*[
+            self._fetch_domain_questions(chosen, chosen_count)
+            for chosen, chosen_count in counts.items()
+        ])
+        questions = [question for batch in batches for question in batch]
+        random.shuffle(questions)
+        return questions
+
+    async def _fetch_domain_questions(self, domain: str, count: int) -> List[Question]:
+        pool = self._pool_owner or self
+        if pool._batch_supported is not False:
+            try:
+                response = await self._request("question", lambda: self.client.get(
+                    f"{self.base_url}/questions",
+                    params={"domain": domain, "count": count},
+                    auth=self.auth
+                ))
+                if response.status_code in (404, 405, 501):
+                    pool._batch_supported = False
+                elif response.status_code == 200:
+                    pool._batch_supported = True
+                    questions = [self._parse_question(data) for data in response.json().get("data", [])]
+                    for question in questions:
+                        self._remember_question(question)
+                    return questions
+            except CircuitOpenError:
+                pass
+            except Exception as e:
+                logger.error(f"Error obteniendo preguntas por lotes: {e}")
+
+        # Sin endpoint por lotes: peticiones individuales con concurrencia limitada
+        semaphore = asyncio.Semaphore(settings.QUESTION_FETCH_CONCURRENCY)
+
+        async def fetch_one() -> Optional[Question]:
+            async with semaphore:
+                return await self.get_single_question(domain)
 
-            headers = {}
-            if self.current_user and self.current_user.access_token:
-                headers["Authorization"] = f"Bearer {self.current_user.access_token}"
+        results = await asyncio.gather(*[fetch_one() for _ in range(count)])
+        return [question for question in results if question]
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/question",
-                    params={"domain": domain},
-                    headers=headers
+    async def get_user_progress_stats(self, user_id: str) -> ProgressStats:
+        """Estadísticas agregadas del usuario, mantenidas en caché PROGRESS_STATS_CACHE_TTL segundos.
+
+        Usa el endpoint de estadísticas si el backend lo soporta y, si no, las calcula
+        a partir de todas las sesiones. Las sesiones guardadas desde esta aplicación
+        se suman al agregado sin volver a descargar el historial; al caducar se
+        vuelve a pedir para incluir las guardadas desde otros clientes.
+        """
+        pool = self._pool_owner or self
+        stats = pool._progress_stats.get(user_id)
+        if stats is not None:
+            return stats
+
+        if pool._stats_supported is not False:
+            try:
+                response = await self._get(
+                    "practice_sessions",
+                    f"{self.base_url}/practice-sessions/user/{user_id}/stats"
                 )
-                data = response.json()
+                if response.status_code in (404, 405, 501):
+                    pool._stats_supported = False
+                elif response.status_code == 200:
+                    pool._stats_supported = True
+                    stats = ProgressStats.from_aggregate(response.json())
+            except Exception as e:
+                logger.error(f"Error obteniendo estadísticas: {e}")
+
+        if stats is None:
+            sessions = await self.get_user_practice_sessions(user_id)
+            stats = ProgressStats.from_sessions(sessions)
+            if not sessions:
+                # Sin sesiones (o con error al pedirlas) no hay nada que merezca caché
+                return stats
+
+        pool._progress_stats.set(user_id, stats)
+        return stats
+
+    async def get_user_practice_sessions(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[datetime] = None
+    ) -> List[PracticeSession]:
+        """Obtiene las sesiones de práctica del usuario, de la más reciente a la más antigua.
+
+        Sin `limit` devuelve todo el historial. Con `limit`/`offset` devuelve una
+        página y con `since` solo las sesiones posteriores a esa fecha.
 
-                if data.get("data"):
-                    return self._parse_question(data["data"])
-                return None
+        Con la caché local activa (SESSION_CACHE_PATH), la primera página o el
+        historial completo se revalidan contra el backend pidiendo solo lo nuevo, y
+        las páginas siguientes salen directamente de la caché. Con la caché aún
+        vacía, la primera página se pide al backend con `limit` y el resto del
+        historial se descarga en segundo plano.
+        """
+        store = self.sessions_store
+        if store is None:
+            return await self._fetch_practice_sessions(user_id, limit, offset, since)
+
+        try:
+            state = await asyncio.to_thread(store.sync_state, user_id)
+            if state is None and limit is not None:
+                # Caché en frío: no bloquear la primera página con todo el historial
+                self._schedule_history_backfill(user_id)
+                return await self._fetch_practice_sessions(user_id, limit, offset, since)
+            if offset == 0:
+                sessions = await self._sync_practice_sessions(store, user_id, state, limit)
+            else:
+                sessions = await asyncio.to_thread(store.load, user_id, limit, offset)
         except Exception as e:
-            print(f"Error obteniendo pregunta: {e}")
-            return None
+            logger.error(f"Error en la caché de sesiones: {e}")
+            return await self._fetch_practice_sessions(user_id, limit, offset, since)
+
+        if since is not None:
+            sessions = [session for session in sessions if session.start_time > since]
+        return sessions
 
-    async def get_user_practice_sessions(self, user_id: str) -> List[PracticeSession]:
-        """Obtiene todas las sesiones de práctica del usuario."""
+    def _schedule_history_backfill(self, user_id: str):
+        """Descarga en segundo plano el historial completo a la caché local."""
+        pool = self._pool_owner or self
+        task = pool._history_backfills.get(user_id)
+        if task is None or task.done():
+            pool._history_backfills[user_id] = asyncio.create_task(self._backfill_history(user_id))
+
+    async def _backfill_history(self, user_id: str):
+        pool = self._pool_owner or self
         try:
-            headers = {}
-            if self.current_user and self.current_user.access_token:
-                headers["Authorization"] = f"Bearer {self.current_user.access_token}"
+            await self._sync_practice_sessions(self.sessions_store, user_id, None)
+        finally:
+            if pool._history_backfills.get(user_id) is asyncio.current_task():
+                del pool._history_backfills[user_id]
+
+    async def _sync_practice_sessions(
+        self,
+        store: PracticeSessionStore,
+        user_id: str,
+        state: Optional[SyncState],
+        limit: Optional[int] = None
+    ) -> List[PracticeSession]:
+        """Trae del backend solo las sesiones nuevas y devuelve el historial en caché.
+
+        Envía If-None-Match / If-Modified-Since con los validadores guardados y
+        `since` con la fecha de la última sesión conocida; con `limit`, las sesiones
+        nuevas se piden por páginas de ese tamaño y se devuelve la primera página
+        de la caché. Si el backend no responde, se usa lo que haya en caché.
+        """
+        state = state or SyncState()
+        headers: Dict[str, str] = {}
+        params: Dict[str, Any] = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        if state.latest_start_time:
+            params["since"] = state.latest_start_time.isoformat()
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
+        latest = state.latest_start_time
+        known = set()
+        new_sessions: List[PracticeSession] = []
+        validators: Optional[httpx.Headers] = None
+        try:
+            offset = 0
+            while True:
+                if limit is not None:
+                    params.update(limit=limit, offset=offset)
+                response = await self._get(
+                    "practice_sessions",
                     f"{self.base_url}/practice-sessions/user/{user_id}",
-                    headers=headers
+                    params=dict(params),
+                    headers=headers if offset == 0 else None
                 )
+                if response.status_code != 200:
+                    if response.status_code != 304:
+                        logger.error(f"Error sincronizando sesiones: {response.status_code}")
+                    break
+
+                sessions_data = response.json()
+                if isinstance(sessions_data, dict):
+                    sessions_data = sessions_data.get("data", [])
+                if validators is None:
+                    validators = response.headers
 
-                if response.status_code == 200:
-                    sessions_data = response.json()
-                    return [
-                        PracticeSession(
-                            user_id=session["user_id"],
-                            start_time=datetime.fromisoformat(session["start_time"]),
-                            end_time=datetime.fromisoformat(session["end_time"]),
-                            personas_total=session["personas_total"],
-                            personas_correct=session["personas_correct"],
-                            proceso_total=session["proceso_total"],
-                            proceso_correct=session["proceso_correct"],
-                            entorno_total=session["entorno_total"],
-                            entorno_correct=session["entorno_correct"],
-                            id=session.get("id")
-                        )
-                        for session in sessions_data
-                    ]
-                return []
+                # Convertir solo los registros que aún no están en caché
+                fresh = [
+                    self._parse_practice_session(session)
+                    for session in sessions_data
+                    if (latest is None or datetime.fromisoformat(session["start_time"]) > latest)
+                    and (session["start_time"], session["end_time"]) not in known
+                ]
+                known.update((session["start_time"], session["end_time"]) for session in sessions_data)
+                new_sessions.extend(fresh)
+                # Una página completa puede tener más detrás; si el backend ignora la
+                # paginación, la siguiente no aporta nada nuevo y se termina
+                if limit is None or len(sessions_data) != limit or not fresh:
+                    break
+                offset += limit
         except Exception as e:
-            print(f"Error obteniendo sesiones: {e}")
+            logger.error(f"Error sincronizando sesiones: {e}")
+
+        if validators is not None:
+            if new_sessions:
+                latest = max([s.start_time for s in new_sessions] + ([latest] if latest else []))
+            await asyncio.to_thread(store.merge, user_id, new_sessions, SyncState(
+                etag=validators.get("etag"),
+                last_modified=validators.get("last-modified"),
+                latest_start_time=latest
+            ))
+
+        return await asyncio.to_thread(store.load, user_id, limit)
+
+    async def _fetch_practice_sessions(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[datetime] = None
+    ) -> List[PracticeSession]:
+        """Pide las sesiones directamente al backend, sin caché local.
+
+        Si el backend ignora la paginación y devuelve la lista completa, la página
+        se recorta aquí; una vez detectado, se recorta siempre, sea cual sea el offset.
+        Para saber si hay más páginas, pide `limit + 1` sesiones.
+        """
+        pool = self._pool_owner or self
+        try:
+            params: Dict[str, Any] = {}
+            if limit is not None:
+                params["limit"] = limit
+                params["offset"] = offset
+            if since is not None:
+                params["since"] = since.isoformat()
+
+            response = await self._get(
+                "practice_sessions",
+                f"{self.base_url}/practice-sessions/user/{user_id}",
+                params=params
+            )
+
+            if response.status_code == 200:
+                sessions_data = response.json()
+                if isinstance(sessions_data, dict):
+                    sessions_data = sessions_data.get("data", [])
+                if limit is not None:
+                    if len(sessions_data) > limit:
+                        pool._session_paging_supported = False
+                    if pool._session_paging_supported is False:
+                        sessions_data = sessions_data[offset:offset + limit]
+                sessions = [self._parse_practice_session(session) for session in sessions_data]
+                if since is not None:
+                    sessions = [session for session in sessions if session.start_time > since]
+                return sessions
+            return []
+        except Exception as e:
+            logger.error(f"Error obteniendo sesiones: {e}")
             return []
 
     async def save_practice_session(self, session: QuizSession) -> bool:
@@ -145,37 +662,207 @@ class APIService:
             if not self.current_user:
                 return False
 
-            stats = session.get_stats_by_domain()
-
-            headers = {}
-            if self.current_user and self.current_user.access_token:
-                headers["Authorization"] = f"Bearer {self.current_user.access_token}"
-
-            session_data = {
-                "user_id": self.current_user.id,
-                "start_time": session.start_time.isoformat(),
-                "end_time": datetime.now().isoformat(),
-                "personas_total": stats.get("personas", {}).get("total", 0),
-                "personas_correct": stats.get("personas", {}).get("correct", 0),
-                "proceso_total": stats.get("proceso", {}).get("total", 0),
-                "proceso_correct": stats.get("proceso", {}).get("correct", 0),
-                "entorno_total": stats.get("entorno", {}).get("total", 0),
-                "entorno_correct": stats.get("entorno", {}).get("correct", 0)
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/practice-sessions",
-                    json=session_data,
-                    headers=headers
-                )
-
-                return response.status_code == 200
+            outcome = await self._post_practice_session(self._practice_session_payload(session))
+            return outcome == OUTBOX_SENT
 
         except Exception as e:
-            print(f"Error guardando la sesión: {e}")
+            logger.error(f"Error guardando la sesión: {e}")
             return False
 
+    async def queue_practice_session(self, session: QuizSession) -> bool:
+        """Guarda la sesión en la cola local y la envía al backend en segundo plano.
+
+        La sesión queda a salvo en disco aunque el backend no esté disponible; se
+        reintenta con espera exponencial y las pendientes se envían por lotes.
+        """
+        if not self.current_user:
+            return False
+
+        await asyncio.to_thread(
+            self.sessions_outbox.add,
+            self.current_user.id,
+            self._practice_session_payload(session)
+        )
+        self.schedule_outbox_flush()
+        return True
+
+    def schedule_outbox_flush(self):
+        """Arranca el envío en segundo plano de las sesiones pendientes del usuario.
+
+        La tarea pertenece al pool, no a la sesión: cerrar la pestaña o hacer
+        logout no la interrumpe, y sigue hasta vaciar la cola del usuario.
+        """
+        user = self.current_user
+        if not user:
+            return
+        pool = self._pool_owner or self
+        flusher = pool._outbox_flushers.get(user.id)
+        if flusher is None:
+            flusher = pool._outbox_flushers[user.id] = pool.for_session()
+        # Siempre con el token más reciente del usuario
+        flusher.current_user = user
+        task = pool._outbox_tasks.get(user.id)
+        if task is None or task.done():
+            pool._outbox_tasks[user.id] = asyncio.create_task(flusher._run_outbox(user.id))
+
+    async def _run_outbox(self, user_id: str):
+        pool = self._pool_owner or self
+        outbox = self.sessions_outbox
+        try:
+            while True:
+                await self.flush_practice_sessions()
+                delay = await asyncio.to_thread(outbox.next_delay, user_id)
+                if delay is None:
+                    return
+                await asyncio.sleep(delay)
+        finally:
+            if pool._outbox_tasks.get(user_id) is asyncio.current_task():
+                del pool._outbox_tasks[user_id]
+                pool._outbox_flushers.pop(user_id, None)
+
+    async def flush_practice_sessions(self) -> int:
+        """Envía las sesiones pendientes cuyo reintento ya toca; devuelve cuántas se guardaron."""
+        if not self.current_user:
+            return 0
+
+        outbox = self.sessions_outbox
+        user_id = self.current_user.id
+        pool = self._pool_owner or self
+        lock = pool._outbox_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            return await self._flush_outbox(outbox, user_id)
+
+    async def _flush_outbox(self, outbox: PracticeSessionOutbox, user_id: str) -> int:
+        saved = 0
+        while True:
+            entries = await asyncio.to_thread(outbox.due, user_id, settings.OUTBOX_BATCH_SIZE)
+            if not entries:
+                return saved
+
+            outcomes = await self._post_practice_sessions([entry.payload for entry in entries])
+            sent = [entry.id for entry, outcome in zip(entries, outcomes) if outcome == OUTBOX_SENT]
+            rejected = [entry for entry, outcome in zip(entries, outcomes) if outcome == OUTBOX_REJECTED]
+            failed = [entry for entry, outcome in zip(entries, outcomes) if outcome == OUTBOX_RETRY]
+
+            if sent:
+                await asyncio.to_thread(outbox.remove, sent)
+                saved += len(sent)
+            if rejected:
+                # Reintentarlas no cambiaría la respuesta y bloquearían a las siguientes
+                await asyncio.to_thread(outbox.reject, rejected, "rechazada por el backend")
+            if failed:
+                await asyncio.to_thread(outbox.retry_later, failed)
+                return saved
+
+    async def _post_practice_sessions(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """Envía varias sesiones, en una sola petición si el backend lo soporta.
+
+        Devuelve el resultado de cada una: OUTBOX_SENT, OUTBOX_REJECTED u OUTBOX_RETRY.
+        """
+        pool = self._pool_owner or self
+        if len(payloads) > 1 and pool._outbox_batch_supported is not False:
+            try:
+                response = await self.circuit("practice_sessions").call(lambda: self.client.post(
+                    f"{self.base_url}/practice-sessions/batch",
+                    json=payloads,
+                    auth=self.auth
+                ))
+            except CircuitOpenError:
+                return [OUTBOX_RETRY] * len(payloads)
+            except Exception as e:
+                logger.error(f"Error guardando sesiones por lotes: {e}")
+                return [OUTBOX_RETRY] * len(payloads)
+
+            if response.status_code in (404, 405, 501):
+                pool._outbox_batch_supported = False
+            elif response.status_code in (200, 201):
+                pool._outbox_batch_supported = True
+                for payload in payloads:
+                    self._add_to_progress_stats(payload)
+                return [OUTBOX_SENT] * len(payloads)
+            elif _outbox_outcome(response.status_code) == OUTBOX_RETRY:
+                return [OUTBOX_RETRY] * len(payloads)
+            # Lote rechazado: se envían una a una para apartar solo las inválidas
+
+        # En orden; si el backend falla, las restantes esperan al siguiente intento
+        results = []
+        for payload in payloads:
+            try:
+                outcome = await self._post_practice_session(payload)
+            except CircuitOpenError:
+                outcome = OUTBOX_RETRY
+            except Exception as e:
+                logger.error(f"Error guardando la sesión: {e}")
+                outcome = OUTBOX_RETRY
+            results.append(outcome)
+            if outcome == OUTBOX_RETRY:
+                break
+        return results + [OUTBOX_RETRY] * (len(payloads) - len(results))
+
+    async def _post_practice_session(self, payload: Dict[str, Any]) -> str:
+        response = await self.circuit("practice_sessions").call(lambda: self.client.post(
+            f"{self.base_url}/practice-sessions",
+            json=payload,
+            auth=self.auth
+        ))
+
+        outcome = _outbox_outcome(response.status_code)
+        if outcome == OUTBOX_SENT:
+            self._add_to_progress_stats(payload)
+        elif outcome == OUTBOX_REJECTED:
+            logger.warning(f"Sesión {payload.get('client_session_id')} rechazada: {response.status_code}")
+        return outcome
+
+    def _add_to_progress_stats(self, payload: Dict[str, Any]):
+        """Suma la sesión guardada al agregado en caché en lugar de recalcularlo."""
+        pool = self._pool_owner or self
+        pool._progress_stats.add_session(payload["user_id"], self._parse_practice_session(payload))
+
+    def _practice_session_payload(self, session: QuizSession) -> Dict[str, Any]:
+        """Datos de la sesión en el formato del endpoint /practice-sessions."""
+        stats = session.get_stats_by_domain()
+        return {
+            # Generado una vez al encolar: los reintentos lo repiten y el backend deduplica
+            "client_session_id": str(uuid.uuid4()),
+            "user_id": self.current_user.id,
+            "start_time": session.start_time.isoformat(),
+            "end_time": datetime.now().isoformat(),
+            "personas_total": stats.get("personas", {}).get("total", 0),
+            "personas_correct": stats.get("personas", {}).get("correct", 0),
+            "proceso_total": stats.get("proceso", {}).get("total", 0),
+            "proceso_correct": stats.get("proceso", {}).get("correct", 0),
+            "entorno_total": stats.get("entorno", {}).get("total", 0),
+            "entorno_correct": stats.get("entorno", {}).get("correct", 0)
+        }
+
+    def _remember_question(self, question: Question):
+        pool = self._pool_owner or self
+        recent = pool._recent_questions.setdefault(
+            question.domain, deque(maxlen=settings.QUESTION_FALLBACK_CACHE_SIZE)
+        )
+        recent.append(question)
+
+    def _cached_question(self, domain: str) -> Optional[Question]:
+        """Pregunta recibida recientemente del dominio (None si no hay ninguna)."""
+        pool = self._pool_owner or self
+        recent = pool._recent_questions.get(domain)
+        return random.choice(recent) if recent else None
+
+    def _parse_practice_session(self, session: Dict[str, Any]) -> PracticeSession:
+        """Convierte los datos JSON de una sesión de práctica en un objeto PracticeSession."""
+        return PracticeSession(
+            user_id=session["user_id"],
+            start_time=datetime.fromisoformat(session["start_time"]),
+            end_time=datetime.fromisoformat(session["end_time"]),
+            personas_total=session["personas_total"],
+            personas_correct=session["personas_correct"],
+            proceso_total=session["proceso_total"],
+            proceso_correct=session["proceso_correct"],
+            entorno_total=session["entorno_total"],
+            entorno_correct=session["entorno_correct"],
+            id=session.get("id")
+        )
+
     def _parse_question(self, question_data: Dict[str, Any]) -> Question:
         """Convierte los datos JSON de una pregunta en un objeto Question."""
         return Question(
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Optional
+import httpx
+from jose import jwt, JWTError
+from src.config.settings import settings
+from src.models.user import User
+
+if TYPE_CHECKING:
+    from src.services.api_service import APIService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenClaims:
+    """Datos del usuario que se leen directamente del access token."""
+    user_id: Optional[str]
+    email: Optional[str]
+    expires_at: Optional[datetime]
+
+
+def decode_access_token(
+    token: str,
+    public_key: str = settings.JWT_PUBLIC_KEY,
+    algorithms: str = settings.JWT_ALGORITHMS,
+    user_id_claim: str = settings.JWT_USER_ID_CLAIM
+) -> Optional[TokenClaims]:
+    """Lee los claims del JWT sin consultar al backend.
+
+    Si hay clave pública configurada se verifica la firma y un token que no la
+    supera se descarta. Devuelve None si el token no se puede decodificar; el
+    llamador debe recurrir entonces a /auth/me.
+    """
+    try:
+        if public_key:
+            claims = jwt.decode(
+                token,
+                public_key,
+                algorithms=[algorithm.strip() for algorithm in algorithms.split(",")],
+                # La audiencia la valida el backend; aquí solo interesa la firma
+                options={"verify_aud": False}
+            )
+        else:
+            claims = jwt.get_unverified_claims(token)
+    except JWTError as e:
+        logger.warning(f"No se pudo leer el access token: {e}")
+        return None
+
+    return TokenClaims(
+        user_id=_claim_str(claims, user_id_claim),
+        email=_claim_str(claims, "email"),
+        expires_at=_claim_datetime(claims, "exp")
+    )
+
+
+def _claim_str(claims: Dict[str, Any], name: str) -> Optional[str]:
+    value = claims.get(name)
+    return str(value) if value not in (None, "") else None
+
+
+def _claim_datetime(claims: Dict[str, Any], name: str) -> Optional[datetime]:
+    try:
+        return datetime.fromtimestamp(int(claims[name]), tz=timezone.utc)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class AuthManager(httpx.Auth):
+    """Mantiene vigente el access token del usuario de un APIService.
+
+    Se pasa como `auth=` en las peticiones autenticadas: añade la cabecera
+    Authorization y, si el backend responde 401, renueva el token y repite la
+    petición una sola vez. En segundo plano renueva el token `refresh_margin`
+    segundos antes de que caduque según su claim `exp` (o a mitad de su vida si
+    el token dura menos que el margen). Las renovaciones simultáneas comparten
+    una única petición a AUTH_REFRESH_PATH, también entre los servicios del pool
+    que comparten usuario (la pestaña y el envío de la cola): con refresh tokens
+    rotatorios, dos renovaciones con el mismo token cerrarían la sesión.
+    """
+
+    def __init__(
+        self,
+        api_service: "APIService",
+        refresh_margin: float = settings.AUTH_REFRESH_MARGIN,
+        retry_interval: float = settings.AUTH_REFRESH_RETRY_INTERVAL,
+        min_refresh_interval: float = settings.AUTH_REFRESH_MIN_INTERVAL
+    ):
+        self.api_service = api_service
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.min_refresh_interval = min_refresh_interval
+        # None hasta saber si el backend permite renovar tokens
+        self.refresh_supported: Optional[bool] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._proactive_task: Optional[asyncio.Task] = None
+
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        user = self.api_service.current_user
+        if user is None or not user.access_token:
+            yield request
+            return
+
+        if self._expires_in(user) is not None and self._expires_in(user) <= 0:
+            # Ya caducado: renovar antes evita un 401 seguro
+            await self.refresh(stale_token=user.access_token)
+
+        token = self.api_service.current_user.access_token if self.api_service.current_user else None
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+
+        if response.status_code == 401 and token and await self.refresh(stale_token=token):
+            request.headers["Authorization"] = f"Bearer {self.api_service.current_user.access_token}"
+            yield request
+
+    def start(self):
+        """Arranca la renovación proactiva del token del usuario actual."""
+        if self._proactive_task is None or self._proactive_task.done():
+            self._proactive_task = asyncio.create_task(self._run())
+
+    def stop(self):
+        for task in (self._proactive_task, self._refresh_task):
+            if task is not None:
+                task.cancel()
+        self._proactive_task = None
+        self._refresh_task = None
+
+    async def refresh(self, stale_token: Optional[str] = None) -> bool:
+        """Renueva el access token; devuelve si hay un token nuevo disponible.
+
+        Si `stale_token` ya no es el token actual, otra petición lo renovó mientras
+        tanto y no hace falta volver a pedirlo.
+        """
+        user = self.api_service.current_user
+        if user is None:
+            return False
+        if stale_token is not None and user.access_token != stale_token:
+            return True
+        if self.refresh_supported is False:
+            return False
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(user))
+        # shield: si se cancela quien espera, la renovación sigue para los demás
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self, user: User) -> bool:
+        stale_token = user.access_token
+        pool = self.api_service._pool_owner or self.api_service
+        async with pool._refresh_locks.setdefault(user.id, asyncio.Lock()):
+            if user.access_token != stale_token:
+                # Otro servicio que comparte este usuario ya lo renovó
+                return True
+            return await self._request_refresh(user)
+
+    async def _request_refresh(self, user: User) -> bool:
+        try:
+            response = await self.api_service.client.post(
+                f"{self.api_service.base_url}{settings.AUTH_REFRESH_PATH}",
+                json={"refresh_token": user.refresh_token} if user.refresh_token else None,
+                headers={"Authorization": f"Bearer {user.access_token}"}
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"No se pudo renovar el token: {e}")
+            return False
+
+        if response.status_code in (404, 405, 501):
+            logger.info("El backend no permite renovar tokens")
+            self.refresh_supported = False
+            return False
+        if response.status_code != 200:
+            logger.warning(f"Renovación de token rechazada: {response.status_code}")
+            return False
+
+        self.refresh_supported = True
+        data = response.json()
+        claims = decode_access_token(data["access_token"])
+        # Se actualiza el mismo objeto para que todas las vistas vean el token nuevo
+        user.access_token = data["access_token"]
+        user.refresh_token = data.get("refresh_token", user.refresh_token)
+        user.expires_at = claims.expires_at if claims else None
+        return True
+
+    async def _run(self):
+        while True:
+            user = self.api_service.current_user
+            expires_in = self._expires_in(user) if user else None
+            if expires_in is None or self.refresh_supported is False:
+                return
+
+            # Con tokens más cortos que el margen se renueva a mitad de su vida,
+            # y nunca más a menudo que min_refresh_interval
+            margin = min(self.refresh_margin, expires_in / 2)
+            await asyncio.sleep(max(expires_in - margin, self.min_refresh_interval))
+            if self.api_service.current_user is not user:
+                return
+            if not await self.refresh():
+                if self.refresh_supported is False or self._expires_in(user) <= 0:
+                    return
+                # Fallo pasajero: se reintenta mientras el token siga vigente
+                await asyncio.sleep(min(self.retry_interval, self._expires_in(user)))
+
+    def _expires_in(self, user: User) -> Optional[float]:
+        if user.expires_at is None:
+            return None
+        return (user.expires_at - datetime.now(timezone.utc)).total_seconds()
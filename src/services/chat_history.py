@@ -0,0 +1,130 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from src.config.settings import settings
+
+# Aproximación habitual: un token equivale a unos 4 caracteres
+CHARS_PER_TOKEN = 4
+# Coste fijo aproximado por mensaje (rol y separadores)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Fracción del presupuesto reservada al resumen de los turnos descartados
+SUMMARY_BUDGET_SHARE = 0.2
+# Longitud máxima de cada mensaje dentro del resumen
+SUMMARY_LINE_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimación aproximada de tokens de un texto."""
+    return len(text) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def payload_bytes(messages: Sequence[Dict[str, str]]) -> int:
+    """Bytes que ocupan los mensajes serializados como JSON en la petición."""
+    return len(json.dumps(messages).encode())
+
+
+@dataclass
+class HistoryWindowStats:
+    """Métricas acumuladas del ahorro conseguido al recortar el historial."""
+    requests: int = 0
+    full_bytes: int = 0
+    sent_bytes: int = 0
+    dropped_messages: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.full_bytes - self.sent_bytes
+
+
+class ChatHistoryWindow:
+    """Selecciona qué parte del historial se envía en cada mensaje.
+
+    Conserva los últimos `max_turns` turnos (pregunta y respuesta) dentro de un
+    presupuesto aproximado de tokens, recortando siempre turnos completos para
+    que la ventana empiece por un mensaje del usuario. Opcionalmente antepone al
+    primer mensaje un resumen breve de los que quedaron fuera; el resumen viaja
+    dentro del mensaje del usuario porque el API solo acepta los roles `user` y
+    `assistant`.
+    """
+
+    def __init__(
+        self,
+        max_turns: int = settings.CHAT_HISTORY_MAX_TURNS,
+        token_budget: int = settings.CHAT_HISTORY_TOKEN_BUDGET,
+        summarize: bool = settings.CHAT_HISTORY_SUMMARY
+    ):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summarize = summarize
+        self.stats = HistoryWindowStats()
+
+    def build(self, history: Sequence[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Devuelve la ventana de historial a enviar y actualiza las métricas."""
+        turns = _split_turns(history)
+        recent = turns[-self.max_turns:] if self.max_turns > 0 else []
+        # Una respuesta sin su pregunta al principio no se envía
+        if recent and recent[0][0]["role"] != "user":
+            recent = recent[1:]
+
+        # Recortar desde el turno más antiguo hasta entrar en el presupuesto
+        tokens = sum(_turn_tokens(turn) for turn in recent)
+        while recent and tokens > self.token_budget:
+            tokens -= _turn_tokens(recent.pop(0))
+
+        sent = sum(len(turn) for turn in recent)
+        if self.summarize and sent < len(history):
+            # Reservar parte del presupuesto para resumir lo que queda fuera
+            recent_budget = int(self.token_budget * (1 - SUMMARY_BUDGET_SHARE))
+            while recent and tokens > recent_budget:
+                tokens -= _turn_tokens(recent.pop(0))
+            sent = sum(len(turn) for turn in recent)
+
+        window = [msg for turn in recent for msg in turn]
+        if self.summarize and window and sent < len(history):
+            summary = self._summarize(history[:len(history) - sent], self.token_budget - tokens)
+            if summary:
+                first = window[0]
+                window[0] = {**first, "content": f"{summary}\n\n{first['content']}"}
+
+        self.stats.requests += 1
+        self.stats.full_bytes += payload_bytes(history)
+        self.stats.sent_bytes += payload_bytes(window)
+        self.stats.dropped_messages += len(history) - sent
+        return window
+
+    def _summarize(self, dropped: Sequence[Dict[str, str]], budget: int) -> Optional[str]:
+        """Resumen extractivo: el comienzo de los mensajes descartados más recientes."""
+        header = "Resumen de la conversación anterior:"
+        used = estimate_tokens(header)
+        lines: List[str] = []
+
+        for msg in reversed(dropped):
+            speaker = "Usuario" if msg["role"] == "user" else "Asistente"
+            content = " ".join(msg["content"].split())
+            if len(content) > SUMMARY_LINE_CHARS:
+                content = content[:SUMMARY_LINE_CHARS].rstrip() + "..."
+            line = f"- {speaker}: {content}"
+            cost = len(line) // CHARS_PER_TOKEN + 1
+            if used + cost > budget:
+                break
+            lines.insert(0, line)
+            used += cost
+
+        if not lines:
+            return None
+        return "\n".join([header] + lines)
+
+
+def _split_turns(history: Sequence[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+    """Agrupa el historial en turnos: un mensaje del usuario y sus respuestas."""
+    turns: List[List[Dict[str, str]]] = []
+    for msg in history:
+        if msg["role"] == "user" or not turns:
+            turns.append([msg])
+        else:
+            turns[-1].append(msg)
+    return turns
+
+
+def _turn_tokens(turn: Sequence[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(msg["content"]) for msg in turn)
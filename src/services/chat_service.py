@@ -1,7 +1,11 @@
 import httpx
+import json
 import logging
-from typing import Optional, List
-from src.services.api_service import api_service
+from typing import Optional, List, AsyncIterator, Dict, Any
+from src.services.api_service import APIService, api_service as shared_api_service
+from src.services.chat_history import ChatHistoryWindow, HistoryWindowStats
+from src.services.retry import RetryPolicy
+from src.services.circuit_breaker import CircuitOpenError, SERVICE_UNAVAILABLE_MESSAGE
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -13,58 +17,60 @@ class ChatMessage:
         self.content = content
 
 
+class ChatStreamError(Exception):
+    """Error al recibir una respuesta en streaming; `message` es el texto para el usuario."""
+
+    def __init__(self, message: str, session_expired: bool = False):
+        super().__init__(message)
+        self.message = message
+        self.session_expired = session_expired
+
+
 class ChatService:
-    def __init__(self):
-        self.api_service = api_service
+    def __init__(self, api_service: Optional[APIService] = None):
+        self.api_service = api_service or shared_api_service
         self.API_URL = f"{settings.API_URL}/chat/"
         self.max_retries = 3
+        # Un mensaje de chat no es idempotente: solo se reintenta si no llegó a procesarse
+        self.retry_policy = RetryPolicy(max_attempts=self.max_retries, idempotent=False)
         self.timeout = settings.API_TIMEOUT
         self.message_history: List[ChatMessage] = []
+        # Solo se envía una ventana acotada del historial en cada mensaje
+        self.history_window = ChatHistoryWindow()
 
     async def send_message(self, message: str) -> Optional[str]:
         if not self.api_service.current_user:
             return "Error: No has iniciado sesión"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info("Enviando mensaje al API")
-
-                # Estructura la solicitud con el historial
-                data = {
-                    "message": message,
-                    "message_history": [
-                        {"role": msg.role, "content": msg.content}
-                        for msg in self.message_history
-                    ],
-                    "max_tokens": 4096,
-                    "temperature": 0.7
-                }
-
-                response = await client.post(
+            logger.info("Enviando mensaje al API")
+
+            data = self._build_request(message)
+            headers = self._headers()
+            response = await self.api_service.circuit("chat").call(
+                lambda: self.api_service.client.post(
                     self.API_URL,
                     json=data,
-                    headers={
-                        "Authorization": f"Bearer {self.api_service.current_user.access_token}",
-                        "Content-Type": "application/json"
-                    }
-                )
+                    headers=headers,
+                    auth=self.api_service.auth
+                ),
+                retry_policy=self.retry_policy
+            )
+
+            error = self._status_error(response)
+            if error:
+                return error
 
-                if response.status_code == 401:
-                    return "Error: Sesión expirada. Por favor, inicia sesión nuevamente."
-                elif response.status_code == 404:
-                    return "Error: El servicio de chat no está disponible."
-                elif response.status_code == 422:
-                    logger.error(f"Error de validación: {response.text}")
-                    return "Error: Los datos enviados no son válidos."
+            response.raise_for_status()
+            data = response.json()
 
-                response.raise_for_status()
-                data = response.json()
+            # Actualizar el historial
+            self._add_to_history(message, data["response"])
 
-                # Actualizar el historial
-                self.message_history.append(ChatMessage("user", message))
-                self.message_history.append(ChatMessage("assistant", data["response"]))
+            return data["response"]
 
-                return data["response"]
+        except CircuitOpenError:
+            return f"Error: {SERVICE_UNAVAILABLE_MESSAGE}"
 
         except httpx.TimeoutException:
             logger.error("Timeout en la solicitud")
@@ -74,9 +80,132 @@ class ChatService:
             logger.error(f"Error al enviar mensaje: {str(e)}")
             return f"Error: {str(e)}"
 
+    async def stream_message(self, message: str) -> AsyncIterator[str]:
+        """Envía un mensaje y entrega la respuesta en fragmentos a medida que llegan.
+
+        Acepta Server-Sent Events (`data: ...`) o JSON por líneas; si el backend no
+        transmite en streaming, entrega la respuesta completa en un único fragmento.
+        Los errores, aunque ya hayan llegado fragmentos, se lanzan como
+        ChatStreamError; solo las respuestas completas y no vacías pasan al historial.
+        """
+        if not self.api_service.current_user:
+            raise ChatStreamError("Error: No has iniciado sesión", session_expired=True)
+
+        chunks: List[str] = []
+        try:
+            logger.info("Enviando mensaje al API (streaming)")
+
+            data = self._build_request(message)
+            data["stream"] = True
+            headers = self._headers()
+            headers["Accept"] = "text/event-stream, application/x-ndjson, application/json"
+
+            client = self.api_service.client
+            request = client.build_request("POST", self.API_URL, json=data, headers=headers)
+            response = await self.api_service.circuit("chat").call(
+                lambda: client.send(request, auth=self.api_service.auth, stream=True),
+                retry_policy=self.retry_policy
+            )
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                    error = self._status_error(response)
+                    if error:
+                        raise ChatStreamError(error, session_expired=response.status_code == 401)
+                    response.raise_for_status()
+
+                content_type = response.headers.get("content-type", "")
+                if "text/event-stream" in content_type or "ndjson" in content_type:
+                    async for line in response.aiter_lines():
+                        if line.startswith("data:"):
+                            line = line[5:].strip()
+                        if not line:
+                            continue
+                        if line == "[DONE]":
+                            break
+                        chunk = self._parse_chunk(line)
+                        if chunk:
+                            chunks.append(chunk)
+                            yield chunk
+                else:
+                    body = await response.aread()
+                    chunk = json.loads(body)["response"]
+                    if chunk:
+                        chunks.append(chunk)
+                        yield chunk
+            finally:
+                await response.aclose()
+
+        except ChatStreamError:
+            raise
+
+        except CircuitOpenError:
+            raise ChatStreamError(f"Error: {SERVICE_UNAVAILABLE_MESSAGE}")
+
+        except httpx.TimeoutException:
+            logger.error("Timeout en la solicitud")
+            raise ChatStreamError("Error: El servidor tardó demasiado en responder.")
+
+        except Exception as e:
+            logger.error(f"Error al enviar mensaje: {str(e)}")
+            raise ChatStreamError(f"Error: {str(e)}")
+
+        # Actualizar el historial solo con respuestas completas
+        if chunks:
+            self._add_to_history(message, "".join(chunks))
+
+    @property
+    def history_stats(self) -> HistoryWindowStats:
+        """Métricas de bytes enviados y ahorrados al recortar el historial."""
+        return self.history_window.stats
+
     def clear_history(self):
         """Limpia el historial de mensajes"""
         self.message_history = []
 
+    def _build_request(self, message: str) -> Dict[str, Any]:
+        """Estructura la solicitud con la ventana del historial."""
+        history = self.history_window.build([
+            {"role": msg.role, "content": msg.content}
+            for msg in self.message_history
+        ])
+        logger.debug(f"Historial: {len(history)} mensajes, {self.history_stats.bytes_saved} bytes ahorrados")
+        return {
+            "message": message,
+            "message_history": history,
+            "max_tokens": 4096,
+            "temperature": 0.7
+        }
+
+    def _headers(self) -> Dict[str, str]:
+        # La cabecera Authorization la pone api_service.auth, que renueva el token si caduca
+        return {"Content-Type": "application/json"}
+
+    def _status_error(self, response: httpx.Response) -> Optional[str]:
+        """Traduce los códigos de error conocidos a mensajes para el usuario."""
+        if response.status_code == 401:
+            # Solo llega aquí si no se pudo renovar el token
+            return "Error: Sesión expirada. Por favor, inicia sesión nuevamente."
+        elif response.status_code == 404:
+            return "Error: El servicio de chat no está disponible."
+        elif response.status_code == 422:
+            logger.error(f"Error de validación: {response.text}")
+            return "Error: Los datos enviados no son válidos."
+        return None
+
+    def _parse_chunk(self, payload: str) -> str:
+        """Extrae el texto de un fragmento JSON; si no es JSON, es texto plano."""
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return payload
+        if isinstance(data, dict):
+            return data.get("delta") or data.get("content") or data.get("response") or ""
+        return str(data)
+
+    def _add_to_history(self, message: str, response: str):
+        self.message_history.append(ChatMessage("user", message))
+        self.message_history.append(ChatMessage("assistant", response))
+
 
-chat_service = ChatService()
\ No newline at end of file
+chat_service = ChatService()
@@ -0,0 +1,195 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import httpx
+from src.config.settings import settings
+from src.services.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+SERVICE_UNAVAILABLE_MESSAGE = "El servicio no está disponible en este momento. Inténtalo de nuevo en unos segundos."
+
+
+class CircuitOpenError(Exception):
+    """Se lanza sin llegar a contactar con el backend mientras el circuito está abierto."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Servicio '{name}' no disponible temporalmente")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Corta las llamadas a un endpoint del backend cuando falla o va lento.
+
+    Lleva una ventana con el resultado de las últimas llamadas; si la proporción
+    de errores (excepciones de red o respuestas 5xx) o de llamadas lentas supera
+    el umbral, el circuito se abre y las llamadas fallan al instante con
+    CircuitOpenError. Pasado `open_seconds` pasa a semiabierto y deja pasar unas
+    pocas llamadas de prueba: si van bien se cierra y, si no, vuelve a abrirse.
+
+    Con `slow_call_seconds` None no se cuentan las llamadas lentas (p. ej. el
+    chat, cuya duración depende de la respuesta del modelo).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = settings.CIRCUIT_WINDOW_SIZE,
+        min_calls: int = settings.CIRCUIT_MIN_CALLS,
+        failure_rate: float = settings.CIRCUIT_FAILURE_RATE,
+        slow_call_seconds: Optional[float] = settings.CIRCUIT_SLOW_CALL_SECONDS,
+        slow_call_rate: float = settings.CIRCUIT_SLOW_CALL_RATE,
+        open_seconds: float = settings.CIRCUIT_OPEN_SECONDS,
+        half_open_calls: int = settings.CIRCUIT_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self._state = CLOSED
+        # (falló, fue lenta) de las últimas llamadas
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at: Optional[float] = None
+        self._probes = 0
+        self._probe_ok = 0
+        # Contadores acumulados para métricas
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado efectivo del circuito; solo lee, las transiciones ocurren en `call()`."""
+        if self._state == OPEN and self._open_expired():
+            return HALF_OPEN
+        return self._state
+
+    async def call(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        retry_policy: Optional[RetryPolicy] = None
+    ) -> httpx.Response:
+        """Ejecuta `send` si el circuito lo permite y registra su resultado.
+
+        Con `retry_policy` los reintentos ocurren dentro del circuito y solo cuenta
+        la duración del último intento: las esperas entre intentos no son lentitud
+        del backend.
+        """
+        self._acquire()
+        attempts: List[float] = []
+
+        async def attempt() -> httpx.Response:
+            started = self.clock()
+            try:
+                return await send()
+            finally:
+                attempts.append(self.clock() - started)
+
+        try:
+            response = await (retry_policy.request(attempt) if retry_policy else attempt())
+        except httpx.TransportError:
+            self._record(failed=True, elapsed=attempts[-1] if attempts else 0.0)
+            raise
+        except BaseException:
+            # Cancelaciones o errores propios de la llamada: no dicen nada del backend
+            self._release()
+            raise
+        # 501 indica un endpoint no implementado, no un backend degradado
+        failed = response.status_code >= 500 and response.status_code != 501
+        self._record(failed=failed, elapsed=attempts[-1])
+        return response
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado y contadores del circuito para exponerlos como métricas."""
+        state = self.state
+        window = len(self._window)
+        return {
+            "name": self.name,
+            "state": state,
+            "window_calls": window,
+            "failure_rate": sum(failed for failed, _ in self._window) / window if window else 0.0,
+            "slow_call_rate": sum(slow for _, slow in self._window) / window if window else 0.0,
+            "retry_in": self._retry_in() if state == OPEN else 0.0,
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+    def reset(self):
+        self._state = CLOSED
+        self._window.clear()
+        self._opened_at = None
+
+    def _acquire(self):
+        if self._state == OPEN and self._open_expired():
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._probe_ok = 0
+        state = self._state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_calls):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self._retry_in())
+        if state == HALF_OPEN:
+            self._probes += 1
+
+    def _release(self):
+        if self._state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def _record(self, failed: bool, elapsed: float):
+        slow = self.slow_call_seconds is not None and elapsed >= self.slow_call_seconds
+        self.calls += 1
+        self.failures += failed
+        self.slow_calls += slow
+
+        if self._state == HALF_OPEN:
+            if failed or slow:
+                self._open()
+            else:
+                self._probe_ok += 1
+                if self._probe_ok >= self.half_open_calls:
+                    logger.info(f"Circuito '{self.name}' cerrado: el backend se ha recuperado")
+                    self.reset()
+            return
+        if self._state == OPEN:
+            # Llamada que empezó antes de abrirse el circuito
+            return
+
+        self._window.append((failed, slow))
+        window = len(self._window)
+        if window < self.min_calls:
+            return
+        failures = sum(f for f, _ in self._window)
+        slow_calls = sum(s for _, s in self._window)
+        if failures / window >= self.failure_rate or slow_calls / window >= self.slow_call_rate:
+            self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._window.clear()
+        self.times_opened += 1
+        logger.warning(f"Circuito '{self.name}' abierto durante {self.open_seconds}s")
+
+    def _open_expired(self) -> bool:
+        return self.clock() - self._opened_at >= self.open_seconds
+
+    def _retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(self.open_seconds - (self.clock() - self._opened_at), 0.0)
@@ -0,0 +1,406 @@
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import inspect
+import json
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+import httpx
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Límites en segundos, pensados para llamadas HTTP y renderizado de vistas
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+CONTROL_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+# Un colector devuelve (nombre, etiquetas, valor) que se leen en cada exportación
+Collector = Callable[[], Iterable[Tuple[str, Dict[str, Any], float]]]
+# Espera máxima del servidor de métricas a que el bucle de eventos ejecute un colector
+COLLECT_TIMEOUT_SECONDS = 2.0
+
+
+class Histogram:
+    """Histograma acumulado con límites fijos, como los de Prometheus."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimación del cuantil `q` interpolando dentro del bucket que lo contiene."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """Histogramas y contadores en memoria del proceso, exportables a Prometheus o JSON."""
+
+    def __init__(self, prefix: str = "pmp_"):
+        self.prefix = prefix
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Tuple[Collector, Optional[asyncio.AbstractEventLoop]]] = []
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def add_collector(self, collector: Collector, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Registra una función que aporta valores instantáneos (gauges) al exportar.
+
+        Si el colector lee objetos del bucle de eventos (circuitos, servicios), se
+        indica `loop`: desde otro hilo, como el del servidor de métricas, la lectura
+        se programa en ese bucle y se espera su resultado en lugar de tocar los
+        objetos a la vez que él.
+        """
+        self._collectors.append((collector, loop))
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_prometheus(self) -> str:
+        """Formato de texto de exposición de Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                full_name = self.prefix + name
+                self._header(lines, name, "histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                        cumulative += bucket_count
+                        le = bound if bound == "+Inf" else _format_number(bound)
+                        lines.append(f"{full_name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in series.items():
+                    lines.append(f"{self.prefix}{name}{_format_labels(key)} {_format_number(value)}")
+
+        gauges: Dict[str, List[Tuple[LabelKey, float]]] = {}
+        for name, labels, value in self._collect():
+            gauges.setdefault(name, []).append((_label_key(labels), value))
+        for name, series in sorted(gauges.items()):
+            self._header(lines, name, "gauge")
+            for key, value in series:
+                lines.append(f"{self.prefix}{name}{_format_labels(key)} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Todas las series en un diccionario serializable a JSON."""
+        with self._lock:
+            data: Dict[str, Any] = {
+                "histograms": {
+                    name: [{"labels": dict(key), **histogram.to_dict()} for key, histogram in series.items()]
+                    for name, series in self._histograms.items()
+                },
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+            }
+        gauges: Dict[str, List[Dict[str, Any]]] = {}
+        for name, labels, value in self._collect():
+            gauges.setdefault(name, []).append({"labels": {k: str(v) for k, v in labels.items()}, "value": value})
+        data["gauges"] = gauges
+        return data
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def _collect(self) -> Iterable[Tuple[str, Dict[str, Any], float]]:
+        for collector, loop in self._collectors:
+            try:
+                yield from _run_collector(collector, loop)
+            except Exception as e:
+                logger.warning(f"Error en un colector de métricas: {e}")
+
+    def _header(self, lines: List[str], name: str, kind: str):
+        if name in self._help:
+            lines.append(f"# HELP {self.prefix}{name} {self._help[name]}")
+        lines.append(f"# TYPE {self.prefix}{name} {kind}")
+
+
+def _run_collector(
+    collector: Collector,
+    loop: Optional[asyncio.AbstractEventLoop]
+) -> List[Tuple[str, Dict[str, Any], float]]:
+    """Ejecuta el colector en el hilo de su bucle de eventos y devuelve sus valores."""
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return list(collector())
+    try:
+        if asyncio.get_running_loop() is loop:
+            return list(collector())
+    except RuntimeError:
+        pass
+
+    future: concurrent.futures.Future = concurrent.futures.Future()
+
+    def snapshot():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(list(collector()))
+        except Exception as e:
+            future.set_exception(e)
+
+    loop.call_soon_threadsafe(snapshot)
+    try:
+        return future.result(timeout=COLLECT_TIMEOUT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError("el bucle de eventos no respondió a tiempo")
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+metrics = MetricsRegistry()
+metrics.describe("http_client_request_duration_seconds", "Duración de las peticiones HTTP al backend, hasta leer la respuesta.")
+metrics.describe("http_client_time_to_headers_seconds", "Tiempo hasta recibir las cabeceras de la respuesta del backend.")
+metrics.describe("http_client_request_bytes_total", "Bytes enviados al backend.")
+metrics.describe("http_client_response_bytes_total", "Bytes recibidos del backend.")
+metrics.describe("view_build_duration_seconds", "Tiempo de build() de cada vista, incluido el envío al cliente.")
+metrics.describe("view_controls", "Controles montados en la página tras el build() de cada vista.")
+
+
+# Segmentos de ruta variables (ids numéricos, UUID, hashes o emails)
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|[^/]+@[^/]+)$")
+_BASE_PATH = urlparse(settings.API_URL).path.rstrip("/")
+
+
+def route_template(path: str) -> str:
+    """Ruta con los ids sustituidos por `{id}` para no crear una serie por usuario."""
+    if _BASE_PATH and path.startswith(_BASE_PATH):
+        path = path[len(_BASE_PATH):]
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transporte que mide cada petición al backend: ruta, estado, latencia y bytes.
+
+    Envuelve al transporte real; la duración se registra al cerrar la respuesta,
+    de modo que en el streaming del chat incluye la respuesta completa.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, registry: MetricsRegistry = metrics):
+        self.transport = transport
+        self.registry = registry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        route = route_template(request.url.path)
+        labels = {
+            "service": "chat" if route.startswith("/chat") else "api",
+            "method": request.method,
+            "route": route,
+        }
+        self.registry.inc("http_client_request_bytes_total", _request_size(request), **labels)
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            self.registry.observe(
+                "http_client_request_duration_seconds", time.perf_counter() - started,
+                status=type(e).__name__, **labels
+            )
+            raise
+
+        labels["status"] = str(response.status_code)
+        self.registry.observe("http_client_time_to_headers_seconds", time.perf_counter() - started, **labels)
+        stream = _MeteredStream(response.stream, started, labels, self.registry)
+        if response.is_closed:
+            # Respuesta ya leída en memoria (p. ej. transportes simulados): se registra ahora
+            stream._bytes = len(response.content)
+            await stream.aclose()
+        else:
+            response.stream = stream
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, started: float, labels: Dict[str, str], registry: MetricsRegistry):
+        self._stream = stream
+        self._started = started
+        self._labels = labels
+        self._registry = registry
+        self._bytes = 0
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self):
+        await self._stream.aclose()
+        if not self._closed:
+            self._closed = True
+            self._registry.observe(
+                "http_client_request_duration_seconds", time.perf_counter() - self._started, **self._labels
+            )
+            self._registry.inc("http_client_response_bytes_total", self._bytes, **self._labels)
+
+
+def _request_size(request: httpx.Request) -> int:
+    try:
+        return len(request.content)
+    except httpx.RequestNotRead:
+        return int(request.headers.get("content-length", 0))
+
+
+def _count_controls(controls: Iterable[Any]) -> int:
+    """Cuenta los controles del árbol siguiendo sus propiedades públicas `controls` y `content`."""
+    count = 0
+    pending = list(controls)
+    while pending:
+        control = pending.pop()
+        count += 1
+        children = getattr(control, "controls", None)
+        if isinstance(children, list):
+            pending.extend(children)
+        # Algunos controles aceptan texto en `content`; solo se siguen los controles
+        content = getattr(control, "content", None)
+        if content is not None and not isinstance(content, str):
+            pending.append(content)
+    return count
+
+
+def timed_build(view_name: str, build: Callable, registry: MetricsRegistry = metrics) -> Callable:
+    """Envuelve el build() de una vista para medir su duración y los controles resultantes."""
+
+    def record(page: Any, started: float):
+        registry.observe("view_build_duration_seconds", time.perf_counter() - started, view=view_name)
+        controls = getattr(page, "controls", None)
+        if controls is None:
+            logger.debug(f"{view_name}: la página no expone sus controles, no se cuentan")
+            return
+        registry.observe("view_controls", _count_controls(controls), buckets=CONTROL_BUCKETS, view=view_name)
+
+    if inspect.iscoroutinefunction(build):
+        @functools.wraps(build)
+        async def timed_async(page, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await build(page, *args, **kwargs)
+            finally:
+                record(page, started)
+        return timed_async
+
+    @functools.wraps(build)
+    def timed(page, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return build(page, *args, **kwargs)
+        finally:
+            record(page, started)
+    return timed
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            body = self.registry.to_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.registry.to_dict()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any):
+        logger.debug(format % args)
+
+
+def start_metrics_server(
+    host: str = settings.METRICS_HOST,
+    port: int = settings.METRICS_PORT,
+    registry: MetricsRegistry = metrics
+) -> ThreadingHTTPServer:
+    """Sirve /metrics (Prometheus) y /metrics.json en un hilo aparte."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Métricas disponibles en http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from src.config.settings import settings
+from src.models.quiz_session import PracticeSession
+
+PROGRESS_DOMAINS = ["personas", "proceso", "entorno"]
+
+
+def _empty_domains() -> Dict[str, Dict[str, int]]:
+    return {domain: {"total": 0, "correct": 0} for domain in PROGRESS_DOMAINS}
+
+
+@dataclass
+class ProgressStats:
+    """Agregado del progreso de un usuario que se actualiza sesión a sesión."""
+    total_sessions: int = 0
+    domain_stats: Dict[str, Dict[str, int]] = field(default_factory=_empty_domains)
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[PracticeSession]) -> "ProgressStats":
+        stats = cls()
+        for session in sessions:
+            stats.add_session(session)
+        return stats
+
+    @classmethod
+    def from_aggregate(cls, data: Dict[str, Any]) -> "ProgressStats":
+        """Crea el agregado a partir de la respuesta del endpoint de estadísticas.
+
+        Se espera `total_sessions` y los campos `<dominio>_total` / `<dominio>_correct`
+        con los mismos nombres que en PracticeSession.
+        """
+        stats = cls(total_sessions=data.get("total_sessions", 0))
+        for domain in PROGRESS_DOMAINS:
+            stats.domain_stats[domain]["total"] = data.get(f"{domain}_total", 0)
+            stats.domain_stats[domain]["correct"] = data.get(f"{domain}_correct", 0)
+        return stats
+
+    def add_session(self, session: PracticeSession):
+        """Suma una sesión al agregado sin recorrer las anteriores."""
+        self.total_sessions += 1
+        for domain in PROGRESS_DOMAINS:
+            self.domain_stats[domain]["total"] += getattr(session, f"{domain}_total")
+            self.domain_stats[domain]["correct"] += getattr(session, f"{domain}_correct")
+
+    @property
+    def total_questions(self) -> int:
+        return sum(stats["total"] for stats in self.domain_stats.values())
+
+    @property
+    def total_correct(self) -> int:
+        return sum(stats["correct"] for stats in self.domain_stats.values())
+
+    @property
+    def average_score(self) -> float:
+        total = self.total_questions
+        return (self.total_correct / total * 100) if total > 0 else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato que usa ProgressView para pintar el resumen."""
+        return {
+            "total_sessions": self.total_sessions,
+            "total_questions": self.total_questions,
+            "total_correct": self.total_correct,
+            "average_score": self.average_score,
+            "domain_stats": {domain: dict(stats) for domain, stats in self.domain_stats.items()}
+        }
+
+
+class ProgressStatsCache:
+    """Estadísticas de progreso por usuario, con los usuarios menos recientes descartados.
+
+    Cada agregado caduca a los `ttl` segundos de obtenerse del backend, de modo que
+    las sesiones guardadas desde otro dispositivo acaban apareciendo.
+    """
+
+    def __init__(
+        self,
+        max_users: int = settings.PROGRESS_STATS_CACHE_SIZE,
+        ttl: float = settings.PROGRESS_STATS_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.clock = clock
+        # Agregado y momento en que se obtuvo del backend
+        self._stats: "OrderedDict[str, Tuple[ProgressStats, float]]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[ProgressStats]:
+        entry = self._stats.get(user_id)
+        if entry is None:
+            return None
+        stats, stored_at = entry
+        if self.clock() - stored_at >= self.ttl:
+            del self._stats[user_id]
+            return None
+        self._stats.move_to_end(user_id)
+        return stats
+
+    def set(self, user_id: str, stats: ProgressStats):
+        self._stats[user_id] = (stats, self.clock())
+        self._stats.move_to_end(user_id)
+        while len(self._stats) > self.max_users:
+            self._stats.popitem(last=False)
+
+    def add_session(self, user_id: str, session: PracticeSession):
+        """Incorpora una sesión recién guardada si el usuario ya tiene agregado en caché."""
+        entry = self._stats.get(user_id)
+        if entry is not None:
+            entry[0].add_session(session)
+
+    def invalidate(self, user_id: str):
+        self._stats.pop(user_id, None)
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+from src.config.settings import settings
+from src.models.question import Question
+from src.services.api_service import APIService
+from src.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPrefetcher:
+    """Mantiene en segundo plano las siguientes preguntas de cada dominio de una sesión."""
+
+    def __init__(self, api_service: APIService, depth: int = settings.QUESTION_PREFETCH_DEPTH):
+        self.api_service = api_service
+        self.depth = depth
+        self._buffers: Dict[str, asyncio.Queue] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._fillers: Dict[str, asyncio.Task] = {}
+        # Textos ya entregados o en el buffer, para no repetir preguntas en la práctica
+        self._seen: Set[str] = set()
+        # Peticiones simultáneas del mismo dominio (p. ej. un doble clic) reciben la misma pregunta
+        self._single_flight = SingleFlight()
+        # Tras close() no se vuelve a precargar hasta que se pida otra pregunta
+        self._closed = False
+        # Cargas canceladas por close() que aún no han terminado
+        self._closing: Set[asyncio.Task] = set()
+
+    def has_ready(self, domain: str) -> bool:
+        """Indica si hay una pregunta del dominio lista para mostrarse sin esperar."""
+        buffer = self._buffers.get(domain)
+        return buffer is not None and not buffer.empty()
+
+    def warm(self, domain: str):
+        """Empieza a cargar en segundo plano las próximas preguntas del dominio."""
+        if self.depth <= 0 or self._closed:
+            return
+
+        filler = self._fillers.get(domain)
+        if filler is None or filler.done():
+            self._fillers[domain] = asyncio.create_task(self._fill(domain))
+
+    async def get(self, domain: str) -> Optional[Question]:
+        """Devuelve la siguiente pregunta del dominio, usando el buffer si es posible.
+
+        Pedir una pregunta reabre el prefetcher si se había cerrado (p. ej. al
+        empezar otra práctica tras finalizar la anterior).
+        """
+        self._closed = False
+        return await self._single_flight.do(domain, lambda: self._next(domain))
+
+    async def _next(self, domain: str) -> Optional[Question]:
+        buffer = self._buffer(domain)
+        # Referencia local: close() puede vaciar los diccionarios mientras se espera
+        slots = self._slots[domain]
+        filler = self._fillers.get(domain)
+
+        if buffer.empty() and filler is not None and not filler.done():
+            # Ya hay una petición en curso: esperarla es más rápido que lanzar otra
+            getter = asyncio.ensure_future(buffer.get())
+            await asyncio.wait({getter, filler}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                question = getter.result()
+                slots.release()
+            else:
+                getter.cancel()
+                question = None
+        elif not buffer.empty():
+            question = buffer.get_nowait()
+            slots.release()
+        else:
+            question = None
+
+        if self._closed:
+            # Cerrado mientras se esperaba: la sesión ya no necesita la pregunta
+            return question
+
+        if question is None:
+            questions = await self.api_service.get_questions(domain, 1, exclude=self._seen)
+            question = questions[0] if questions else None
+            if question and not self._closed:
+                self._seen.add(question.question_text)
+
+        self.warm(domain)
+        return question
+
+    def close(self):
+        """Cancela las cargas en segundo plano y descarta las preguntas pendientes."""
+        self._closed = True
+        for filler in self._fillers.values():
+            filler.cancel()
+            if not filler.done():
+                self._closing.add(filler)
+                filler.add_done_callback(self._closing.discard)
+        self._fillers.clear()
+        self._buffers.clear()
+        self._slots.clear()
+        self._seen.clear()
+        # Una petición nueva no debe unirse a la que quedó a medias al cerrar
+        self._single_flight = SingleFlight()
+
+    async def wait_closed(self):
+        """Espera a que terminen las cargas canceladas por close().
+
+        Conviene llamarlo antes de cerrar el cliente HTTP para que ninguna carga
+        llegue a usarlo ya cerrado.
+        """
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _buffer(self, domain: str) -> asyncio.Queue:
+        if domain not in self._buffers:
+            self._buffers[domain] = asyncio.Queue()
+            self._slots[domain] = asyncio.Semaphore(max(self.depth, 1))
+        return self._buffers[domain]
+
+    async def _fill(self, domain: str):
+        """Rellena el buffer; espera mientras esté lleno y termina si el API falla."""
+        buffer = self._buffer(domain)
+        slots = self._slots[domain]
+        while True:
+            # Un hueco libre por pregunta pedida: nunca hay más de `depth` precargadas
+            await slots.acquire()
+            wanted = 1
+            while not slots.locked():
+                await slots.acquire()
+                wanted += 1
+
+            questions = await self.api_service.get_questions(domain, wanted, exclude=self._seen)
+            for question in questions:
+                self._seen.add(question.question_text)
+                buffer.put_nowait(question)
+            for _ in range(wanted - len(questions)):
+                slots.release()
+
+            if not questions:
+                logger.warning(f"Precarga detenida para el dominio {domain}")
+                return
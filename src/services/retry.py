@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, FrozenSet, Optional
+import httpx
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que indican un fallo pasajero del backend o de un proxy intermedio
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Respuestas que garantizan que la petición no se procesó
+UNPROCESSED_STATUSES = frozenset({429, 503})
+
+
+@dataclass
+class RetryPolicy:
+    """Reintentos con espera exponencial, jitter, `Retry-After` y plazo total.
+
+    Con `idempotent=False` solo se reintenta cuando la petición no llegó a
+    procesarse (fallo al conectar, 429 o 503), de modo que es seguro usarla
+    también con peticiones POST.
+    """
+    max_attempts: int = settings.HTTP_RETRY_ATTEMPTS
+    base_delay: float = settings.HTTP_RETRY_BASE_DELAY
+    max_delay: float = settings.HTTP_RETRY_MAX_DELAY
+    deadline: Optional[float] = settings.HTTP_RETRY_DEADLINE
+    idempotent: bool = True
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    sleep: Callable[[float], Awaitable[None]] = field(default=asyncio.sleep, repr=False)
+
+    async def request(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Ejecuta `send` hasta obtener una respuesta definitiva o agotar intentos y plazo.
+
+        Devuelve la última respuesta aunque sea un error; las excepciones de red se
+        propagan si no quedan intentos. Superar el plazo lanza httpx.TimeoutException.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = self._remaining(started)
+            try:
+                if remaining is None:
+                    response = await send()
+                else:
+                    response = await asyncio.wait_for(send(), timeout=remaining)
+            except asyncio.TimeoutError:
+                raise httpx.TimeoutException("Plazo de la petición agotado")
+            except httpx.TransportError as e:
+                if attempt >= self.max_attempts or not self._can_retry_error(e):
+                    raise
+                delay = self.backoff(attempt)
+                if not self._fits(started, delay):
+                    raise
+                logger.warning(f"Reintento {attempt}/{self.max_attempts - 1} tras error de red: {e}")
+            else:
+                if attempt >= self.max_attempts or not self._can_retry_status(response.status_code):
+                    return response
+                delay = self.retry_after(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                if not self._fits(started, delay):
+                    return response
+                logger.warning(f"Reintento {attempt}/{self.max_attempts - 1} tras respuesta {response.status_code}")
+                await response.aclose()
+
+            await self.sleep(delay)
+
+    def backoff(self, attempt: int) -> float:
+        """Espera exponencial con jitter completo para el intento `attempt` (desde 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Segundos indicados en la cabecera Retry-After (número o fecha HTTP)."""
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def _can_retry_status(self, status_code: int) -> bool:
+        if status_code not in self.retry_statuses:
+            return False
+        return self.idempotent or status_code in UNPROCESSED_STATUSES
+
+    def _can_retry_error(self, error: httpx.TransportError) -> bool:
+        if self.idempotent:
+            return True
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+    def _remaining(self, started: float) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(self.deadline - (time.monotonic() - started), 0)
+
+    def _fits(self, started: float, delay: float) -> bool:
+        """Indica si aún queda plazo para esperar `delay` y volver a intentarlo."""
+        remaining = self._remaining(started)
+        return remaining is None or delay < remaining
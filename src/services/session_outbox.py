@@ -0,0 +1,166 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from src.config.settings import settings
+
+
+@dataclass
+class OutboxEntry:
+    """Sesión de práctica pendiente de enviar al backend."""
+    id: int
+    user_id: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class PracticeSessionOutbox:
+    """Cola persistente (SQLite) de sesiones de práctica pendientes de guardar.
+
+    Las sesiones se escriben primero aquí y se envían después en segundo plano,
+    de modo que sobreviven a caídas del backend o a reinicios de la aplicación.
+    Tras cada fallo temporal las pendientes se reprograman con espera exponencial
+    y jitter; las que el backend rechaza de forma definitiva pasan a la tabla
+    `rejected_sessions` para no bloquear a las siguientes. Cada llamada escribe
+    en disco, así que el envío en segundo plano la hace con asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.SESSION_OUTBOX_PATH,
+        retry_base: float = settings.OUTBOX_RETRY_BASE,
+        retry_max: float = settings.OUTBOX_RETRY_MAX
+    ):
+        # Sin ruta la cola sigue funcionando, pero solo en memoria
+        self.path = path or ":memory:"
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending_sessions ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "user_id TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rejected_sessions ("
+                "id INTEGER PRIMARY KEY, "
+                "user_id TEXT NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "reason TEXT NOT NULL, "
+                "rejected_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def add(self, user_id: str, payload: Dict[str, Any]) -> int:
+        """Guarda una sesión pendiente y devuelve su id en la cola."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO pending_sessions (user_id, payload, next_attempt_at) VALUES (?, ?, ?)",
+                    (user_id, json.dumps(payload), time.time())
+                )
+            return cursor.lastrowid
+
+    def due(self, user_id: str, limit: int) -> List[OutboxEntry]:
+        """Entradas pendientes del usuario, en orden de llegada, si ya toca reintentar.
+
+        El reintento es por usuario: cuando vence el de cualquier entrada se envían
+        todas las pendientes juntas, para poder agruparlas en un mismo lote.
+        """
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT MIN(next_attempt_at) FROM pending_sessions WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+            if row[0] is None or row[0] > time.time():
+                return []
+            rows = conn.execute(
+                "SELECT id, user_id, payload, attempts FROM pending_sessions "
+                "WHERE user_id = ? ORDER BY id LIMIT ?",
+                (user_id, limit)
+            ).fetchall()
+        return [OutboxEntry(id=row[0], user_id=row[1], payload=json.loads(row[2]), attempts=row[3]) for row in rows]
+
+    def remove(self, entry_ids: Iterable[int]):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("DELETE FROM pending_sessions WHERE id = ?", [(i,) for i in entry_ids])
+
+    def reject(self, entries: Iterable[OutboxEntry], reason: str):
+        """Saca de la cola las entradas rechazadas por el backend y las guarda aparte."""
+        entries = list(entries)
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rejected_sessions (id, user_id, payload, reason, rejected_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(entry.id, entry.user_id, json.dumps(entry.payload), reason, now) for entry in entries]
+                )
+                conn.executemany("DELETE FROM pending_sessions WHERE id = ?", [(entry.id,) for entry in entries])
+
+    def rejected_count(self, user_id: str) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM rejected_sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def retry_later(self, entries: Iterable[OutboxEntry]):
+        """Reprograma las entradas con espera exponencial y jitter."""
+        entries = list(entries)
+        if not entries:
+            return
+        attempts = max(entry.attempts for entry in entries)
+        delay = min(self.retry_base * (2 ** attempts), self.retry_max)
+        next_attempt_at = time.time() + random.uniform(delay / 2, delay)
+        updates = [(next_attempt_at, entry.id) for entry in entries]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE pending_sessions SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?",
+                    updates
+                )
+
+    def next_delay(self, user_id: str) -> Optional[float]:
+        """Segundos hasta el próximo intento pendiente del usuario (None si no hay)."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT MIN(next_attempt_at) FROM pending_sessions WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(row[0] - time.time(), 0)
+
+    def pending_count(self, user_id: str) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM pending_sessions WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
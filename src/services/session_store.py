@@ -0,0 +1,199 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+from src.config.settings import settings
+from src.models.quiz_session import PracticeSession
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS practice_sessions (
+    user_id TEXT NOT NULL,
+    id INTEGER,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    personas_total INTEGER NOT NULL,
+    personas_correct INTEGER NOT NULL,
+    proceso_total INTEGER NOT NULL,
+    proceso_correct INTEGER NOT NULL,
+    entorno_total INTEGER NOT NULL,
+    entorno_correct INTEGER NOT NULL,
+    PRIMARY KEY (user_id, start_time, end_time)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    latest_start_time TEXT
+);
+"""
+
+COLUMNS = [
+    "user_id", "id", "start_time", "end_time",
+    "personas_total", "personas_correct",
+    "proceso_total", "proceso_correct",
+    "entorno_total", "entorno_correct",
+]
+
+
+@dataclass
+class SyncState:
+    """Validadores de la última sincronización del historial de un usuario."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    latest_start_time: Optional[datetime] = None
+
+
+class PracticeSessionStore:
+    """Caché en SQLite de las sesiones de práctica de cada usuario.
+
+    Guarda las sesiones ya descargadas y los validadores HTTP (ETag, Last-Modified
+    y la fecha de la sesión más reciente) para pedir al backend solo las nuevas.
+    Las sesiones de los usuarios usados recientemente se mantienen además en
+    memoria, de modo que cada registro se convierte en PracticeSession una vez.
+    Los métodos son bloqueantes; el APIService los ejecuta en un hilo aparte.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.SESSION_CACHE_PATH,
+        memory_users: int = settings.SESSION_CACHE_MEMORY_USERS
+    ):
+        self.path = path
+        self.memory_users = memory_users
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, List[PracticeSession]]" = OrderedDict()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def load(self, user_id: str, limit: Optional[int] = None, offset: int = 0) -> List[PracticeSession]:
+        """Sesiones guardadas del usuario, de la más reciente a la más antigua.
+
+        Con `limit` devuelve solo esa página: de memoria si el usuario está en ella
+        y, si no, leyendo de SQLite únicamente esas filas.
+        """
+        with self._lock:
+            sessions = self._memory.get(user_id)
+            if sessions is None and limit is not None:
+                rows = self._connection().execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM practice_sessions "
+                    "WHERE user_id = ? ORDER BY start_time DESC LIMIT ? OFFSET ?",
+                    (user_id, limit, offset)
+                ).fetchall()
+                return [self._from_row(row) for row in rows]
+            if sessions is None:
+                rows = self._connection().execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM practice_sessions "
+                    "WHERE user_id = ? ORDER BY start_time DESC",
+                    (user_id,)
+                ).fetchall()
+                sessions = [self._from_row(row) for row in rows]
+                self._remember(user_id, sessions)
+            else:
+                self._memory.move_to_end(user_id)
+            if limit is not None:
+                return sessions[offset:offset + limit]
+            return list(sessions)
+
+    def sync_state(self, user_id: str) -> Optional[SyncState]:
+        """Validadores de la última sincronización; None si el usuario nunca se sincronizó."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT etag, last_modified, latest_start_time FROM sync_state WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return SyncState(
+            etag=row[0],
+            last_modified=row[1],
+            latest_start_time=datetime.fromisoformat(row[2]) if row[2] else None
+        )
+
+    def merge(self, user_id: str, sessions: Iterable[PracticeSession], state: SyncState):
+        """Añade o actualiza sesiones y guarda los validadores de la sincronización."""
+        sessions = list(sessions)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO practice_sessions ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                    [self._to_row(user_id, session) for session in sessions]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (user_id, etag, last_modified, latest_start_time) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        user_id,
+                        state.etag,
+                        state.last_modified,
+                        state.latest_start_time.isoformat() if state.latest_start_time else None
+                    )
+                )
+
+            cached = self._memory.get(user_id)
+            if cached is not None and sessions:
+                # Sustituir las que ya estaban y mantener el orden por fecha
+                keys = {(s.start_time, s.end_time) for s in sessions}
+                cached = [s for s in cached if (s.start_time, s.end_time) not in keys] + sessions
+                cached.sort(key=lambda s: s.start_time, reverse=True)
+                self._remember(user_id, cached)
+
+    def clear(self, user_id: str):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM practice_sessions WHERE user_id = ?", (user_id,))
+                conn.execute("DELETE FROM sync_state WHERE user_id = ?", (user_id,))
+            self._memory.pop(user_id, None)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._memory.clear()
+
+    def _remember(self, user_id: str, sessions: List[PracticeSession]):
+        self._memory[user_id] = sessions
+        self._memory.move_to_end(user_id)
+        while len(self._memory) > self.memory_users:
+            self._memory.popitem(last=False)
+
+    def _to_row(self, user_id: str, session: PracticeSession) -> tuple:
+        return (
+            user_id,
+            session.id,
+            session.start_time.isoformat(),
+            session.end_time.isoformat(),
+            session.personas_total,
+            session.personas_correct,
+            session.proceso_total,
+            session.proceso_correct,
+            session.entorno_total,
+            session.entorno_correct,
+        )
+
+    def _from_row(self, row: tuple) -> PracticeSession:
+        return PracticeSession(
+            user_id=row[0],
+            id=row[1],
+            start_time=datetime.fromisoformat(row[2]),
+            end_time=datetime.fromisoformat(row[3]),
+            personas_total=row[4],
+            personas_correct=row[5],
+            proceso_total=row[6],
+            proceso_correct=row[7],
+            entorno_total=row[8],
+            entorno_correct=row[9],
+        )
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Agrupa llamadas idénticas simultáneas en una sola ejecución.
+
+    Mientras una llamada con la misma clave está en curso, las siguientes esperan
+    su resultado (o su excepción) en lugar de repetirla. Al terminar, la clave se
+    libera y la próxima llamada vuelve a ejecutarse.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        # Contadores para métricas: llamadas recibidas y cuántas se ahorraron
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+        # shield: si se cancela quien espera, la llamada sigue para los demás
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Evita el aviso de "excepción no recuperada" si nadie quedó esperando
+            task.exception()
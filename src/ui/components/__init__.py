@@ -4,10 +4,14 @@ from .base import (
     create_container,
     show_loading,
     hide_loading,
+    loading,
     show_error_message,
     hide_error_message
 )
-from .chat import ChatMessage, create_message_container
+from .chat import ChatMessage, create_message_container, stream_into_text
+from .layout import LayoutShell
+from .overlay import LoadingOverlay, LoadingHandle
+from .updates import UpdateScheduler, UpdateStats
 
 __all__ = [
     'create_title',
@@ -15,8 +19,15 @@ __all__ = [
     'create_container',
     'show_loading',
     'hide_loading',
+    'loading',
     'show_error_message',
     'hide_error_message',
     'ChatMessage',
-    'create_message_container'
+    'create_message_container',
+    'stream_into_text',
+    'LayoutShell',
+    'LoadingOverlay',
+    'LoadingHandle',
+    'UpdateScheduler',
+    'UpdateStats'
 ]
\ No newline at end of file
@@ -1,4 +1,6 @@
 import flet as ft
+from typing import Optional
+from .overlay import LoadingOverlay, LoadingHandle
 
 def create_title(text: str, size: int = 32, color: str = ft.colors.BLUE_GREY_900) -> ft.Text:
     """Crea un título con el estilo estándar de la aplicación."""
@@ -53,54 +55,23 @@ def create_container(content: ft.Control, padding: int = 50) -> ft.Container:
         ),
     )
 
-def show_loading(page: ft.Page):
-    """Muestra un overlay de carga sobre toda la página."""
-    loading_overlay = ft.Stack(
-        controls=[
-            ft.Container(
-                expand=True,
-                bgcolor=ft.colors.BLACK,
-                opacity=0.3,
-            ),
-            ft.Container(
-                content=ft.Column(
-                    controls=[
-                        ft.ProgressRing(
-                            width=40,
-                            height=40,
-                            stroke_width=3,
-                            color=ft.colors.BLUE,
-                        ),
-                        ft.Container(height=20),  # Espaciado
-                        ft.Text(
-                            "Cargando...",
-                            size=16,
-                            weight=ft.FontWeight.W_500,
-                            color=ft.colors.WHITE,
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    alignment=ft.MainAxisAlignment.CENTER,
-                ),
-                alignment=ft.alignment.center,
-                expand=True,
-            ),
-        ],
-        expand=True,
-    )
+def show_loading(page: ft.Page) -> LoadingHandle:
+    """Pide el overlay de carga; solo aparece si la carga dura más de LOADING_OVERLAY_DELAY."""
+    return LoadingOverlay.for_page(page).show()
 
-    if hasattr(page, 'loading_overlay'):
-        page.controls.remove(page.loading_overlay)
-    page.loading_overlay = loading_overlay
-    page.overlay.append(loading_overlay)
-    page.update()
+def hide_loading(page: ft.Page, handle: Optional[LoadingHandle] = None):
+    """Libera la carga de `handle` o, sin handle, oculta el overlay por completo."""
+    overlay = getattr(page, 'loading_overlay', None)
+    if overlay is None:
+        return
+    if handle is None:
+        overlay.hide_all()
+    else:
+        overlay.hide(handle)
 
-def hide_loading(page: ft.Page):
-    """Oculta el overlay de carga."""
-    if hasattr(page, 'loading_overlay'):
-        page.overlay.remove(page.loading_overlay)
-        delattr(page, 'loading_overlay')
-        page.update()
+def loading(page: ft.Page):
+    """Context manager que mantiene el overlay de carga mientras dura el bloque."""
+    return LoadingOverlay.for_page(page).loading()
 
 def show_error_message(page: ft.Page, message: str):
     """Muestra un mensaje de error."""
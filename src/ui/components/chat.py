@@ -1,6 +1,9 @@
+import asyncio
 import flet as ft
 from dataclasses import dataclass
 from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+from src.config.settings import settings
 
 @dataclass
 class ChatMessage:
@@ -48,4 +51,33 @@ def create_message_container(message: ChatMessage) -> ft.Container:
             left=50 if is_user else 0,
             right=0 if is_user else 50
         )
-    )
\ No newline at end of file
+    )
+
+async def stream_into_text(
+        text_control: ft.Text,
+        chunks: AsyncIterator[str],
+        on_start: Optional[Callable[[], None]] = None,
+        interval: float = settings.CHAT_STREAM_UPDATE_INTERVAL,
+) -> str:
+    """Vuelca los fragmentos en `text_control`, actualizándolo como mucho cada `interval` segundos.
+
+    `on_start` se llama con el primer fragmento para montar el control en la página.
+    """
+    loop = asyncio.get_running_loop()
+    received = []
+    last_update = None
+
+    async for chunk in chunks:
+        received.append(chunk)
+        text_control.value = "".join(received)
+        now = loop.time()
+        if last_update is None and on_start:
+            on_start()
+            last_update = now
+        elif last_update is None or now - last_update >= interval:
+            text_control.update()
+            last_update = now
+
+    if last_update is not None:
+        text_control.update()
+    return "".join(received)
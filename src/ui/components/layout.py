@@ -0,0 +1,29 @@
+import flet as ft
+
+
+class LayoutShell:
+    """Mantiene montadas en la página las vistas que se alternan con frecuencia.
+
+    Cada vista registra su contenedor la primera vez que se muestra y, a partir de
+    ahí, cambiar de vista solo alterna su visibilidad: los controles no se vuelven a
+    enviar al navegador, solo las propiedades que hayan cambiado.
+    """
+
+    def __init__(self):
+        self.root = ft.Column(
+            controls=[],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+    def show(self, page: ft.Page, content: ft.Control):
+        """Muestra `content` y oculta el resto de vistas del shell."""
+        if content not in self.root.controls:
+            self.root.controls.append(content)
+        for control in self.root.controls:
+            control.visible = control is content
+
+        if page.controls != [self.root]:
+            # Otra vista limpió la página: montar de nuevo el shell completo
+            page.controls.clear()
+            page.controls.append(self.root)
+        page.update()
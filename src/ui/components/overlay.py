@@ -0,0 +1,158 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import flet as ft
+from src.config.settings import settings
+
+
+class LoadingHandle:
+    """Petición de carga concreta; ocultarla dos veces no tiene efecto."""
+
+    def __init__(self, overlay: "LoadingOverlay", generation: int):
+        self.overlay = overlay
+        self.generation = generation
+        self.released = False
+
+    def release(self):
+        self.overlay.hide(self)
+
+
+class LoadingOverlay:
+    """Overlay de carga de una página, compartido por todas las tareas que la usan.
+
+    Cuenta cuántas cargas hay en curso: el overlay se muestra solo si la primera
+    sigue activa pasado `delay` segundos y se oculta cuando termina la última.
+    El control se crea una vez por página y después solo cambia su visibilidad,
+    de modo que mostrarlo u ocultarlo envía un parche mínimo al cliente.
+    """
+
+    def __init__(self, page: ft.Page, delay: float = settings.LOADING_OVERLAY_DELAY):
+        self.page = page
+        self.delay = delay
+        self.control = self._build()
+        self._count = 0
+        # Al ocultar todo se invalidan los handles anteriores
+        self._generation = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "LoadingOverlay":
+        overlay = getattr(page, "loading_overlay", None)
+        if overlay is None:
+            overlay = cls(page)
+            page.loading_overlay = overlay
+        return overlay
+
+    @property
+    def active(self) -> int:
+        return self._count
+
+    def show(self) -> LoadingHandle:
+        with self._lock:
+            self._count += 1
+            handle = LoadingHandle(self, self._generation)
+            if self._count == 1 and not self.control.visible:
+                self._call_in_loop(self._schedule)
+        return handle
+
+    def hide(self, handle: LoadingHandle):
+        with self._lock:
+            if handle.released or handle.generation != self._generation:
+                return
+            handle.released = True
+            self._count -= 1
+            if self._count > 0:
+                return
+        self._call_in_loop(self._disappear)
+
+    def hide_all(self):
+        """Oculta el overlay aunque queden cargas en curso (p. ej. al cambiar de vista)."""
+        with self._lock:
+            self._count = 0
+            self._generation += 1
+        self._call_in_loop(self._disappear)
+
+    @contextmanager
+    def loading(self) -> Iterator[LoadingHandle]:
+        handle = self.show()
+        try:
+            yield handle
+        finally:
+            self.hide(handle)
+
+    def _schedule(self):
+        if self._timer is None and self._count > 0:
+            self._timer = self.page.loop.call_later(self.delay, self._appear)
+
+    def _appear(self):
+        self._timer = None
+        if self._count == 0 or self.control.visible:
+            return
+        self.control.visible = True
+        if self.control in self.page.overlay:
+            self.control.update()
+        else:
+            # Primera vez en esta página: se envía el control completo una sola vez
+            self.page.overlay.append(self.control)
+            self.page.update()
+
+    def _disappear(self):
+        if self._count > 0:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.control.visible:
+            self.control.visible = False
+            if self.control in self.page.overlay:
+                self.control.update()
+
+    def _call_in_loop(self, callback):
+        """Ejecuta `callback` en el bucle de la página, aunque se llame desde otro hilo."""
+        loop = self.page.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback()
+        else:
+            loop.call_soon_threadsafe(callback)
+
+    def _build(self) -> ft.Stack:
+        return ft.Stack(
+            controls=[
+                ft.Container(
+                    expand=True,
+                    bgcolor=ft.colors.BLACK,
+                    opacity=0.3,
+                ),
+                ft.Container(
+                    content=ft.Column(
+                        controls=[
+                            ft.ProgressRing(
+                                width=40,
+                                height=40,
+                                stroke_width=3,
+                                color=ft.colors.BLUE,
+                            ),
+                            ft.Container(height=20),  # Espaciado
+                            ft.Text(
+                                "Cargando...",
+                                size=16,
+                                weight=ft.FontWeight.W_500,
+                                color=ft.colors.WHITE,
+                            ),
+                        ],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        alignment=ft.MainAxisAlignment.CENTER,
+                    ),
+                    alignment=ft.alignment.center,
+                    expand=True,
+                ),
+            ],
+            expand=True,
+            visible=False,
+        )
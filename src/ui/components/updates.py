@@ -0,0 +1,175 @@
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Deque, Iterator, List, Optional, Tuple
+import flet as ft
+from flet.core.protocol import CommandEncoder
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Acción en curso de cada tarea: manejadores que se solapan en la misma página
+# no se atribuyen el tráfico del otro
+_current_action: "ContextVar[Optional[Tuple[UpdateScheduler, UpdateStats]]]" = ContextVar(
+    "update_action", default=None
+)
+
+
+@dataclass
+class UpdateStats:
+    """Actualizaciones enviadas al cliente durante una acción del usuario."""
+    action: str
+    requested: int = 0
+    updates: int = 0
+    bytes_sent: int = 0
+
+
+class UpdateScheduler:
+    """Agrupa las actualizaciones de una página en un único envío por iteración del bucle.
+
+    Las vistas piden actualizar controles con `request(...)` en lugar de llamar a
+    `update()`; al terminar la iteración actual del bucle se envían todos juntos
+    con un solo `page.update(*controles)` (o `page.update()` si se pidió la página
+    completa). `flush()` envía lo pendiente en el momento.
+
+    Con UI_UPDATE_METRICS activo también se miden los mensajes y bytes que la
+    página envía por el websocket, agrupados por acción con `action(nombre)`.
+    """
+
+    def __init__(self, page: ft.Page, measure: bool = settings.UI_UPDATE_METRICS):
+        self.page = page
+        self._dirty: List[ft.Control] = []
+        self._whole_page = False
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self.totals = UpdateStats("total")
+        self.history: Deque[UpdateStats] = deque(maxlen=settings.UI_UPDATE_HISTORY)
+        if measure:
+            _ConnectionMeter.install(page, self)
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "UpdateScheduler":
+        scheduler = getattr(page, "update_scheduler", None)
+        if scheduler is None:
+            scheduler = cls(page)
+            page.update_scheduler = scheduler
+        return scheduler
+
+    def request(self, *controls: ft.Control):
+        """Marca controles para actualizar; sin argumentos se actualiza la página completa."""
+        with self._lock:
+            self._count("requested", 1)
+            if controls:
+                for control in controls:
+                    if control not in self._dirty:
+                        self._dirty.append(control)
+            else:
+                self._whole_page = True
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._call_in_loop(self.flush)
+
+    def flush(self):
+        """Envía ya las actualizaciones pendientes en un único mensaje."""
+        with self._lock:
+            controls, whole_page = self._dirty, self._whole_page
+            self._dirty, self._whole_page, self._scheduled = [], False, False
+        if whole_page:
+            self.page.update()
+        else:
+            # Los controles que ya no están en la página (p. ej. tras cambiar de vista) se descartan
+            controls = [control for control in controls if control.page is not None]
+            if not controls:
+                return
+            self.page.update(*controls)
+        if not getattr(self.page, "_update_meter", None):
+            self._count("updates", 1)
+
+    @contextmanager
+    def action(self, name: str) -> Iterator[UpdateStats]:
+        """Cuenta las actualizaciones enviadas mientras dura la acción `name`."""
+        stats = UpdateStats(name)
+        token = _current_action.set((self, stats))
+        try:
+            yield stats
+        finally:
+            self.flush()
+            _current_action.reset(token)
+            self.history.append(stats)
+            logger.debug(
+                f"{name}: {stats.updates} actualizaciones, {stats.bytes_sent} bytes "
+                f"({stats.requested} pedidas)"
+            )
+
+    def _count(self, field: str, amount: int):
+        current = _current_action.get()
+        action = current[1] if current is not None and current[0] is self else None
+        for stats in (self.totals, action):
+            if stats is not None:
+                setattr(stats, field, getattr(stats, field) + amount)
+
+    def _call_in_loop(self, callback):
+        """Ejecuta `callback` en el bucle de la página, aunque se llame desde otro hilo."""
+        loop = self.page.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.call_soon(callback)
+        else:
+            loop.call_soon_threadsafe(callback)
+
+
+class _ConnectionMeter:
+    """Envuelve el envío de comandos de la conexión para contar mensajes y bytes por página.
+
+    Usa `send_command`/`send_commands` de las conexiones de Flet (0.25), que no
+    son API pública; si no existen, la página funciona igual sin medición.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        # Débil: el planificador desaparece junto con su página
+        self.schedulers: "weakref.WeakValueDictionary[str, UpdateScheduler]" = weakref.WeakValueDictionary()
+        self._send_command = connection.send_command
+        self._send_commands = connection.send_commands
+        connection.send_command = self.send_command
+        connection.send_commands = self.send_commands
+
+    @classmethod
+    def install(cls, page: ft.Page, scheduler: UpdateScheduler):
+        connection = page.connection
+        if not all(callable(getattr(connection, name, None)) for name in ("send_command", "send_commands")):
+            # Interfaz interna de Flet: si cambia, se pierde la medición pero no la aplicación
+            logger.warning("La conexión de Flet no permite medir el tráfico de actualizaciones")
+            return
+        meter = getattr(connection, "_update_meter", None)
+        if meter is None:
+            meter = cls(connection)
+            connection._update_meter = meter
+        meter.schedulers[page.session_id] = scheduler
+        page._update_meter = meter
+
+    def send_command(self, session_id: str, command):
+        self._measure(session_id, [command])
+        return self._send_command(session_id, command)
+
+    def send_commands(self, session_id: str, commands):
+        self._measure(session_id, commands)
+        return self._send_commands(session_id, commands)
+
+    def _measure(self, session_id: str, commands):
+        scheduler = self.schedulers.get(session_id)
+        if scheduler is None or not commands:
+            return
+        size = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")).encode())
+        scheduler._count("updates", 1)
+        scheduler._count("bytes_sent", size)
@@ -1,5 +1,6 @@
 import flet as ft
-from typing import Callable
+from typing import Callable, Optional
+from src.services.api_service import APIService, api_service as shared_api_service
 from src.ui.components import create_title, create_container, create_button, show_error_message
 
 
@@ -7,10 +8,12 @@ class AuthView:
     def __init__(
             self,
             on_login_success: Callable,
-            on_signup_success: Callable
+            on_signup_success: Callable,
+            api_service: Optional[APIService] = None
     ):
         self.on_login_success = on_login_success
         self.on_signup_success = on_signup_success
+        self.api_service = api_service or shared_api_service
         self.page = None
         self.is_signup_mode = False
 
@@ -202,41 +205,41 @@ class AuthView:
     async def handle_login(self, e):
         """Maneja el proceso de login."""
         try:
-            from src.services.api_service import api_service
             from src.ui.components import show_loading, hide_loading
 
-            show_loading(self.page)
-            success, error = await api_service.login(
-                self.email_field.value,
-                self.password_field.value
-            )
-            hide_loading(self.page)
+            handle = show_loading(self.page)
+            try:
+                success, error = await self.api_service.login(
+                    self.email_field.value,
+                    self.password_field.value
+                )
+            finally:
+                hide_loading(self.page, handle)
 
             if success:
                 await self.on_login_success(e)
             else:
                 show_error_message(self.page, f"Error al iniciar sesión: {error}")
         except Exception as ex:
-            hide_loading(self.page)
             show_error_message(self.page, f"Error inesperado: {str(ex)}")
 
     async def handle_signup(self, e):
         """Maneja el proceso de registro."""
         try:
-            from src.services.api_service import api_service
             from src.ui.components import show_loading, hide_loading
 
-            show_loading(self.page)
-            success, error = await api_service.signup(
-                self.email_field.value,
-                self.password_field.value
-            )
-            hide_loading(self.page)
+            handle = show_loading(self.page)
+            try:
+                success, error = await self.api_service.signup(
+                    self.email_field.value,
+                    self.password_field.value
+                )
+            finally:
+                hide_loading(self.page, handle)
 
             if success:
                 await self.on_signup_success(e)
             else:
                 show_error_message(self.page, f"Error al registrarse: {error}")
         except Exception as ex:
-            hide_loading(self.page)
             show_error_message(self.page, f"Error inesperado: {str(ex)}")
\ No newline at end of file
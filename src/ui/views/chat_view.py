@@ -1,15 +1,29 @@
 import flet as ft
-from typing import Callable, List
-from src.services.chat_service import chat_service
-from src.ui.components import ChatMessage, create_title, create_container
+from typing import Callable, List, Optional
+from src.services.chat_service import ChatService, ChatStreamError, chat_service as shared_chat_service
+from src.ui.components import ChatMessage, UpdateScheduler, create_title, create_container, stream_into_text
+
+EMPTY_REPLY_MESSAGE = "El asistente no devolvió ninguna respuesta. Por favor, intenta nuevamente."
 
 class ChatView:
-    def __init__(self, on_return_home: Callable):
+    def __init__(self, on_return_home: Callable, chat_service: Optional[ChatService] = None):
         self.on_return_home = on_return_home
+        self.chat_service = chat_service or shared_chat_service
         self.messages: List[ChatMessage] = []
         self.page = None
+        self.updates: Optional[UpdateScheduler] = None
+
+    def create_message_text(self, message: ChatMessage) -> ft.Text:
+        """Crea el texto del mensaje; se conserva para poder ampliarlo en streaming."""
+        return ft.Text(
+            message.text,
+            size=14,
+            color=ft.colors.BLACK,
+            weight=ft.FontWeight.W_400,
+            selectable=True,
+        )
 
-    def create_message_container(self, message: ChatMessage) -> ft.Container:
+    def create_message_container(self, message: ChatMessage, message_text: ft.Text = None) -> ft.Container:
         """Crea un contenedor de mensaje con el nuevo diseño."""
         is_user = message.message_type == "user"
         return ft.Container(
@@ -35,13 +49,7 @@ class ChatView:
                 ], spacing=4),
                 # Contenido del mensaje
                 ft.Container(
-                    content=ft.Text(
-                        message.text,
-                        size=14,
-                        color=ft.colors.BLACK if is_user else ft.colors.BLACK,
-                        weight=ft.FontWeight.W_400,
-                        selectable=True,
-                    ),
+                    content=message_text or self.create_message_text(message),
                     bgcolor=ft.colors.WHITE,
                     padding=10,
                     border_radius=8,
@@ -144,10 +152,11 @@ class ChatView:
         message = ChatMessage(user_name=user_name, text=text, message_type=message_type)
         self.messages.append(message)
         self.chat_history.controls.append(self.create_message_container(message))
-        self.page.update()
+        self.updates.request(self.chat_history)
 
     def build(self, page: ft.Page):
         self.page = page
+        self.updates = UpdateScheduler.for_page(page)
         page.clean()
         page.bgcolor = ft.colors.GREY_50
         page.padding = 40
@@ -190,10 +199,14 @@ class ChatView:
         if not self.new_message.value:
             return
 
-        # Guardar y limpiar el mensaje del usuario
+        with self.updates.action("chat_send_message"):
+            await self._send_message(e)
+
+    async def _send_message(self, e):
+        # Los cambios hasta la primera espera se envían juntos en un solo mensaje
         user_text = self.new_message.value
         self.new_message.value = ""
-        self.page.update()
+        self.updates.request(self.new_message)
 
         # Mostrar el mensaje del usuario
         self.add_message(user_text, "user")
@@ -204,26 +217,53 @@ class ChatView:
             ft.Text("El asistente está escribiendo...", italic=True, size=12)
         ], spacing=10)
         self.chat_history.controls.append(typing_indicator)
-        self.page.update()
+        self.updates.request(self.chat_history)
 
-        try:
-            # Enviar mensaje y obtener respuesta
-            response = await chat_service.send_message(user_text)
+        # Mensaje del asistente que se irá completando con la respuesta en streaming
+        bot_message = ChatMessage(user_name="Asistente", text="", message_type="bot")
+        bot_text = self.create_message_text(bot_message)
 
-            if response.startswith("Error: Sesión expirada"):
-                self.on_return_home(e)
-                return
+        def show_bot_message():
+            if typing_indicator in self.chat_history.controls:
+                self.chat_history.controls.remove(typing_indicator)
+            self.messages.append(bot_message)
+            self.chat_history.controls.append(self.create_message_container(bot_message, bot_text))
+            self.updates.request(self.chat_history)
+            # El texto debe estar montado antes de recibir los siguientes fragmentos
+            self.updates.flush()
+
+        session_expired = False
+        try:
+            # Enviar mensaje y mostrar la respuesta a medida que llega
+            response = await stream_into_text(
+                bot_text,
+                self.chat_service.stream_message(user_text),
+                on_start=show_bot_message
+            )
+            if not response:
+                response = EMPTY_REPLY_MESSAGE
 
-            # Mostrar la respuesta
-            self.add_message(response, "bot")
+        except ChatStreamError as error:
+            # Un error a mitad de respuesta sustituye al texto parcial
+            response = error.message
+            session_expired = error.session_expired
 
         finally:
             # Remover indicador de escritura
             if typing_indicator in self.chat_history.controls:
                 self.chat_history.controls.remove(typing_indicator)
-            self.page.update()
+                self.updates.request(self.chat_history)
+
+        bot_message.text = bot_text.value = response
+        if bot_message in self.messages:
+            self.updates.request(bot_text)
+        else:
+            show_bot_message()
+
+        if session_expired:
+            self.on_return_home(e)
 
     def handle_return(self, e):
         """Maneja el regreso a la vista principal."""
-        chat_service.clear_history()
+        self.chat_service.clear_history()
         self.on_return_home(e)
\ No newline at end of file
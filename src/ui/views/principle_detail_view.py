@@ -1,13 +1,19 @@
 import flet as ft
 from typing import Callable, Optional
-from src.ui.components import create_title, create_container, create_button
-from src.models.quiz_session import QuizAnswer
+from src.services.chat_service import ChatService, ChatStreamError, chat_service as shared_chat_service
+from src.ui.components import create_title, create_container, create_button, stream_into_text, UpdateScheduler
+from src.models.principle import Principle, get_principle
 
 
 class PrincipleDetailView:
-    def __init__(self, on_return_to_principles: Callable):
+    """Vista de detalle común a todos los principios, generada desde el catálogo."""
+
+    def __init__(self, on_return_to_principles: Callable, chat_service: Optional[ChatService] = None):
         self.on_return_to_principles = on_return_to_principles
+        self.chat_service = chat_service or shared_chat_service
         self.page = None
+        self.principle: Optional[Principle] = None
+        self.explanation_dialog: Optional[ft.AlertDialog] = None
         self.chat_input = ft.Ref[ft.TextField]()
 
         # Crear una Column para los mensajes que podamos referenciar
@@ -16,7 +22,7 @@ class PrincipleDetailView:
             scroll=ft.ScrollMode.AUTO,
             spacing=10,
             height=300,
-            auto_scroll=True  # Añadir auto-scroll
+            auto_scroll=True
         )
 
         # El contenedor ahora contiene la column
@@ -66,20 +72,15 @@ class PrincipleDetailView:
 
     def create_practice_question(self) -> ft.Container:
         """Crea la sección de pregunta de práctica."""
-        options = [
-            "Remover inmediatamente al miembro del equipo del proyecto",
-            "Documentar la situación y reportarla siguiendo los canales apropiados",
-            "Confrontar al miembro del equipo en la próxima reunión de equipo",
-            "Ignorar la situación si no impacta significativamente al proyecto"
-        ]
+        practice = self.principle.detail.practice_question
+        options = practice.options
 
         radio_group = ft.RadioGroup(
             content=ft.Column([
                 ft.Radio(
                     value=str(i),
-                    label=f"{chr(65)}) {opt}" if i == 0 else
-                    f"{chr(65 + i)}) {opt}",
-                    label_style=ft.TextStyle(  # Añadir el estilo para el texto del label
+                    label=f"{chr(65 + i)}) {opt}",
+                    label_style=ft.TextStyle(
                         color=ft.colors.BLACK,
                         size=14,
                     ),
@@ -97,7 +98,7 @@ class PrincipleDetailView:
         return ft.Container(
             content=ft.Column([
                 ft.Text(
-                    "Durante la ejecución de un proyecto, descubres que un miembro clave del equipo está utilizando recursos del proyecto para beneficio personal. ¿Cuál debería ser tu primera acción como Project Manager?",
+                    practice.question,
                     size=14,
                     color=ft.colors.BLACK,
                 ),
@@ -161,7 +162,7 @@ class PrincipleDetailView:
                     color=ft.colors.BLUE,
                 ),
                 ft.Text(
-                    "Consulta tus dudas sobre el Principio 1: Ser un administrador diligente",
+                    f"Consulta tus dudas sobre el {self.principle.full_title}",
                     size=14,
                     color=ft.colors.GREY_700,
                 ),
@@ -174,7 +175,18 @@ class PrincipleDetailView:
             border=ft.border.all(1, ft.colors.GREY_200),
         )
 
-    def build(self, page: ft.Page):
+    def build(self, page: ft.Page, principle_number: int):
+        principle = get_principle(principle_number)
+        if principle is None or not principle.has_detail:
+            return
+
+        if principle != self.principle:
+            # El chat y la explicación pertenecen al principio que se estaba viendo
+            self.principle = principle
+            self.explanation_dialog = None
+            self.messages_column.controls.clear()
+        detail = principle.detail
+
         self.page = page
         page.clean()
         page.scroll = ft.ScrollMode.AUTO
@@ -190,39 +202,32 @@ class PrincipleDetailView:
             on_click=self.on_return_to_principles,
         )
 
+        concept_cards = [
+            self.create_concept_card(concept.title, concept.description)
+            for concept in detail.concepts
+        ]
+
         # Contenido principal
         content = ft.Column([
             # Título y descripción
-            create_title("Principio 1: Ser un administrador diligente"),
+            create_title(principle.full_title),
             ft.Text(
-                "Demuestra comportamiento ético y responsable en la gestión de proyectos",
+                detail.subtitle,
                 size=16,
                 color=ft.colors.GREY_700,
                 weight=ft.FontWeight.W_500,
             ),
             ft.Divider(height=30, color=ft.colors.GREY_300),
 
-            # Conceptos Clave
+            # Conceptos Clave: los dos primeros lado a lado, el resto debajo
             ft.Text(
                 "Conceptos Clave",
                 size=18,
                 weight=ft.FontWeight.BOLD,
                 color=ft.colors.BLACK,
             ),
-            ft.Row([
-                self.create_concept_card(
-                    "Responsabilidad Ética",
-                    "Toma decisiones basadas en estándares éticos y profesionales, considerando el impacto en todos los interesados."
-                ),
-                self.create_concept_card(
-                    "Gestión de Recursos",
-                    "Administra recursos del proyecto (humanos, materiales, financieros) de manera eficiente y responsable."
-                ),
-            ], wrap=True),
-            self.create_concept_card(
-                "Transparencia",
-                "Mantiene comunicación abierta y honesta sobre el estado del proyecto, riesgos y desafíos."
-            ),
+            ft.Row(concept_cards[:2], wrap=True),
+            *concept_cards[2:],
 
             ft.Divider(height=30, color=ft.colors.GREY_300),
 
@@ -234,17 +239,7 @@ class PrincipleDetailView:
                 color=ft.colors.BLACK,
             ),
             ft.Row(
-                controls=[
-                    self.create_keyword_chip(word) for word in [
-                        "Integridad",
-                        "Responsabilidad",
-                        "Transparencia",
-                        "Conflicto de intereses",
-                        "Código de conducta",
-                        "Cumplimiento",
-                        "Rendición de cuentas"
-                    ]
-                ],
+                controls=[self.create_keyword_chip(word) for word in detail.keywords],
                 wrap=True,
                 spacing=10,
             ),
@@ -261,25 +256,10 @@ class PrincipleDetailView:
             ft.Container(
                 content=ft.Column([
                     ft.Text(
-                        "• En preguntas sobre conflictos éticos, la respuesta correcta generalmente prioriza la transparencia y la comunicación.",
-                        size=14,
-                        color=ft.colors.BLACK,  # Añadir el color negro explícitamente
-                    ),
-                    ft.Text(
-                        "• Recuerda que el Project Manager debe ser proactivo en identificar y abordar problemas éticos.",
-                        size=14,
-                        color=ft.colors.BLACK,  # Añadir el color negro explícitamente
-                    ),
-                    ft.Text(
-                        "• La integridad del proyecto siempre debe mantenerse, incluso bajo presión de plazos o costos.",
-                        size=14,
-                        color=ft.colors.BLACK,  # Añadir el color negro explícitamente
-                    ),
-                    ft.Text(
-                        "• Las decisiones deben considerar el beneficio de todos los stakeholders, no solo del sponsor.",
+                        f"• {tip}",
                         size=14,
-                        color=ft.colors.BLACK,  # Añadir el color negro explícitamente
-                    ),
+                        color=ft.colors.BLACK,
+                    ) for tip in detail.tips
                 ]),
                 padding=20,
                 bgcolor=ft.colors.ORANGE_50,
@@ -313,25 +293,20 @@ class PrincipleDetailView:
 
     def handle_option_selected(self, e):
         """Maneja la selección de una opción en la pregunta de práctica."""
+        # La selección ya se ve en el cliente: no hay nada que enviar
         self.selected_option = e.data
-        self.page.update()
 
     def handle_show_explanation(self, e):
         """Muestra la explicación de la respuesta correcta."""
-        if not hasattr(self.page, 'explanation_dialog'):
-            self.page.explanation_dialog = ft.AlertDialog(
+        if self.explanation_dialog is None:
+            self.explanation_dialog = ft.AlertDialog(
                 title=ft.Text("Explicación de la Respuesta"),
-                content=ft.Text(
-                    "La respuesta correcta es B) Documentar la situación y reportarla siguiendo los canales apropiados.\n\n"
-                    "Como administrador diligente, es importante seguir los procedimientos establecidos y mantener "
-                    "la documentación apropiada. Remover inmediatamente al miembro sería prematuro, confrontarlo "
-                    "en una reunión podría ser contraproducente, e ignorar la situación sería poco ético."
-                ),
+                content=ft.Text(self.principle.detail.practice_question.explanation),
                 actions=[
                     ft.TextButton("Cerrar", on_click=lambda e: self.close_dialog()),
                 ],
             )
-        self.page.dialog = self.page.explanation_dialog
+        self.page.dialog = self.explanation_dialog
         self.page.dialog.open = True
         self.page.update()
 
@@ -345,51 +320,71 @@ class PrincipleDetailView:
         if not self.chat_input.current.value:
             return
 
+        updates = UpdateScheduler.for_page(self.page)
+        with updates.action("principle_chat_send_message"):
+            await self._send_message(updates)
+
+    async def _send_message(self, updates: UpdateScheduler):
+        # Los cambios hasta la primera espera se envían juntos en un solo mensaje
         message = self.chat_input.current.value
         self.chat_input.current.value = ""
-        self.page.update()
+        updates.request(self.chat_input.current)
 
         # Mostrar mensaje del usuario
         self.add_chat_message(message, is_user=True)
 
         # Mostrar indicador de escritura
         typing_indicator = self.create_typing_indicator()
-        self.chat_messages_container.content.controls.append(typing_indicator)
-        self.page.update()
+        self.messages_column.controls.append(typing_indicator)
+        updates.request(self.messages_column)
 
         try:
             # Preparar el prompt con contexto del principio
-            context_prompt = """
-            Estás ayudando con dudas sobre el Principio 1 del PMBOK 7: Ser un administrador diligente.
-            Este principio trata sobre demostrar comportamiento ético y responsable en la gestión de proyectos.
-            Conceptos clave incluyen: responsabilidad ética, gestión de recursos y transparencia.
-            La consulta del usuario debe ser respondida en este contexto.
-            """
-
-            from src.services.chat_service import chat_service
-            response = await chat_service.send_message(
-                f"{context_prompt}\n\nPregunta del usuario: {message}"
-            )
-
-            # Remover indicador de escritura
-            if typing_indicator in self.chat_messages_container.content.controls:
-                self.chat_messages_container.content.controls.remove(typing_indicator)
-
-            # Mostrar respuesta
-            if response.startswith("Error"):
-                self.add_chat_message("Lo siento, hubo un error al procesar tu mensaje. Por favor, intenta nuevamente.",
-                                      is_user=False)
-            else:
-                self.add_chat_message(response, is_user=False)
+            context_prompt = self.principle.detail.chat_context
+
+            # Mensaje del asistente que se completa a medida que llega la respuesta
+            bot_text = ft.Text("", size=14, color=ft.colors.BLACK)
+
+            def show_bot_message():
+                if typing_indicator in self.messages_column.controls:
+                    self.messages_column.controls.remove(typing_indicator)
+                self.add_chat_message("", is_user=False, message_text=bot_text)
+                # El texto debe estar montado antes de recibir los siguientes fragmentos
+                updates.flush()
+
+            try:
+                response = await stream_into_text(
+                    bot_text,
+                    self.chat_service.stream_message(
+                        f"{context_prompt}\n\nPregunta del usuario: {message}"
+                    ),
+                    on_start=show_bot_message
+                )
+            except ChatStreamError:
+                response = None
+
+            # Un error, aunque ya hubiera texto parcial, o una respuesta vacía se indican explícitamente
+            if not response:
+                bot_text.value = (
+                    "El asistente no devolvió ninguna respuesta. Por favor, intenta nuevamente."
+                    if response is not None else
+                    "Lo siento, hubo un error al procesar tu mensaje. Por favor, intenta nuevamente."
+                )
+                if bot_text.page is None:
+                    show_bot_message()
+                else:
+                    updates.request(bot_text)
 
         except Exception as e:
             # Manejo de errores
-            if typing_indicator in self.chat_messages_container.content.controls:
-                self.chat_messages_container.content.controls.remove(typing_indicator)
+            if typing_indicator in self.messages_column.controls:
+                self.messages_column.controls.remove(typing_indicator)
             self.add_chat_message("Lo siento, ocurrió un error inesperado.", is_user=False)
 
         finally:
-            self.page.update()
+            if typing_indicator in self.messages_column.controls:
+                self.messages_column.controls.remove(typing_indicator)
+                updates.request(self.messages_column)
 
     def create_typing_indicator(self) -> ft.Container:
         """Crea un indicador de escritura."""
@@ -401,8 +396,15 @@ class PrincipleDetailView:
             padding=10,
         )
 
-    def add_chat_message(self, message: str, is_user: bool):
-        """Añade un mensaje al chat."""
+    def add_chat_message(self, message: str, is_user: bool, message_text: Optional[ft.Text] = None) -> ft.Text:
+        """Añade un mensaje al chat y devuelve su texto para poder ampliarlo."""
+        if message_text is None:
+            message_text = ft.Text(
+                message,
+                size=14,
+                color=ft.colors.BLACK,
+            )
+
         message_container = ft.Container(
             content=ft.Column([
                 ft.Row([
@@ -419,11 +421,7 @@ class PrincipleDetailView:
                     ),
                 ], spacing=4),
                 ft.Container(
-                    content=ft.Text(
-                        message,
-                        size=14,
-                        color=ft.colors.BLACK,
-                    ),
+                    content=message_text,
                     bgcolor=ft.colors.WHITE,
                     border_radius=8,
                     padding=10,
@@ -438,5 +436,6 @@ class PrincipleDetailView:
 
         # Añadir el mensaje a la column en lugar del container
         self.messages_column.controls.append(message_container)
-        # La actualización de la página causará que auto_scroll funcione
-        self.page.update()
\ No newline at end of file
+        # La actualización de la columna hace que auto_scroll funcione
+        UpdateScheduler.for_page(self.page).request(self.messages_column)
+        return message_text
\ No newline at end of file
@@ -1,5 +1,6 @@
 import flet as ft
 from typing import Callable, Optional
+from src.models.principle import Principle, load_principles
 from src.ui.components import create_title, create_container
 
 class PrinciplesView:
@@ -11,94 +12,9 @@ class PrinciplesView:
         self.on_return_home = on_return_home
         self.on_principle_detail = on_principle_detail
         self.page = None
-        self.principles = [
-            {
-                "number": 1,
-                "title": "Ser un administrador diligente",
-                "description": "Demuestra comportamiento ético y responsable",
-                "icon": ft.icons.ADMIN_PANEL_SETTINGS,
-                "has_detail": True
-            },
-            {
-                "number": 2,
-                "title": "Crear un ambiente colaborativo",
-                "description": "Fomenta el trabajo en equipo efectivo",
-                "icon": ft.icons.GROUP_WORK,
-                "has_detail": True
-            },
-            {
-                "number": 3,
-                "title": "Involucrar a los interesados",
-                "description": "Gestiona expectativas y comunicación",
-                "icon": ft.icons.PEOPLE_OUTLINE,
-                "has_detail": True
-            },
-            {
-                "number": 4,
-                "title": "Enfocarse en el valor",
-                "description": "Prioriza la entrega de beneficios",
-                "icon": ft.icons.TRENDING_UP,
-                "has_detail": True
-            },
-            {
-                "number": 5,
-                "title": "Reconocer interacciones del sistema",
-                "description": "Gestiona dependencias e impactos",
-                "icon": ft.icons.HUB,
-                "has_detail": True
-            },
-            {
-                "number": 6,
-                "title": "Demostrar liderazgo",
-                "description": "Guía y motiva al equipo",
-                "icon": ft.icons.EMOJI_EVENTS,
-                "has_detail": False
-            },
-            {
-                "number": 7,
-                "title": "Adaptar según el contexto",
-                "description": "Ajusta el enfoque según necesidades",
-                "icon": ft.icons.TUNE,
-                "has_detail": False
-            },
-            {
-                "number": 8,
-                "title": "Incorporar la calidad",
-                "description": "Asegura estándares en entregables",
-                "icon": ft.icons.VERIFIED,
-                "has_detail": False
-            },
-            {
-                "number": 9,
-                "title": "Navegar en la complejidad",
-                "description": "Gestiona situaciones complejas",
-                "icon": ft.icons.ACCOUNT_TREE,
-                "has_detail": False
-            },
-            {
-                "number": 10,
-                "title": "Optimizar respuestas a riesgos",
-                "description": "Gestiona amenazas y oportunidades",
-                "icon": ft.icons.SECURITY,
-                "has_detail": False
-            },
-            {
-                "number": 11,
-                "title": "Adoptar adaptabilidad",
-                "description": "Mantiene flexibilidad ante cambios",
-                "icon": ft.icons.AUTO_MODE,
-                "has_detail": False
-            },
-            {
-                "number": 12,
-                "title": "Permitir el cambio",
-                "description": "Facilita la transición efectiva",
-                "icon": ft.icons.CHANGE_CIRCLE,
-                "has_detail": False
-            }
-        ]
+        self.principles = load_principles()
 
-    def create_principle_card(self, principle: dict) -> ft.Container:
+    def create_principle_card(self, principle: Principle) -> ft.Container:
         """Crea una tarjeta para un principio con el estilo de la aplicación."""
         content = ft.Row([
             # Contenido principal
@@ -107,13 +23,13 @@ class PrinciplesView:
                 ft.Container(
                     content=ft.Stack([
                         ft.Icon(
-                            principle["icon"],
+                            getattr(ft.icons, principle.icon),
                             size=24,
                             color=ft.colors.BLUE
                         ),
                         ft.Container(
                             content=ft.Text(
-                                str(principle["number"]),
+                                str(principle.number),
                                 size=12,
                                 color=ft.colors.WHITE,
                                 weight=ft.FontWeight.BOLD,
@@ -130,13 +46,13 @@ class PrinciplesView:
                 # Textos
                 ft.Column([
                     ft.Text(
-                        principle["title"],
+                        principle.title,
                         size=16,
                         weight=ft.FontWeight.W_500,
                         color=ft.colors.BLACK,
                     ),
                     ft.Text(
-                        principle["description"],
+                        principle.description,
                         size=14,
                         color=ft.colors.GREY_700,
                     ),
@@ -150,7 +66,7 @@ class PrinciplesView:
                 ft.icons.ARROW_FORWARD_IOS,
                 size=20,
                 color=ft.colors.GREY_400,
-            ) if principle.get("has_detail") else ft.Container(),
+            ) if principle.has_detail else ft.Container(),
         ])
 
         container = ft.Container(
@@ -160,8 +76,8 @@ class PrinciplesView:
             border_radius=8,
             border=ft.border.all(1, ft.colors.GREY_200),
             margin=ft.margin.only(bottom=10),
-            ink=True if principle.get("has_detail") else False,
-            on_click=lambda e, p=principle: self.handle_principle_click(e, p) if p.get("has_detail") else None,
+            ink=True if principle.has_detail else False,
+            on_click=lambda e, p=principle: self.handle_principle_click(e, p) if p.has_detail else None,
             shadow=ft.BoxShadow(
                 spread_radius=1,
                 blur_radius=4,
@@ -171,7 +87,7 @@ class PrinciplesView:
         )
 
         # Si el principio no tiene detalle, agregar un mensaje de "próximamente"
-        if not principle.get("has_detail"):
+        if not principle.has_detail:
             container = ft.Container(
                 content=ft.Stack([
                     container,
@@ -193,10 +109,10 @@ class PrinciplesView:
 
         return container
 
-    def handle_principle_click(self, e, principle: dict):
+    def handle_principle_click(self, e, principle: Principle):
         """Maneja el clic en un principio."""
-        if principle.get("has_detail") and self.on_principle_detail:
-            self.on_principle_detail(e, principle["number"])
+        if principle.has_detail and self.on_principle_detail:
+            self.on_principle_detail(e, principle.number)
 
     def build(self, page: ft.Page):
         self.page = page
@@ -1,16 +1,36 @@
+import asyncio
+import logging
 import flet as ft
-from typing import Callable, List
+from typing import Any, Callable, List, Optional, Set, Tuple
 from datetime import datetime
-from src.ui.components import create_title, create_container, create_button
-from src.services.api_service import api_service
+from src.ui.components import create_title, create_container, create_button, UpdateScheduler
+from src.services.api_service import APIService, api_service as shared_api_service
 from src.models.quiz_session import PracticeSession
+from src.services.progress_stats import ProgressStats
+from src.config.settings import settings
 
+logger = logging.getLogger(__name__)
 
 class ProgressView:
-    def __init__(self, on_return_home: Callable):
+    def __init__(self, on_return_home: Callable, api_service: Optional[APIService] = None):
         self.on_return_home = on_return_home
+        self.api_service = api_service or shared_api_service
         self.page = None
         self.sessions: List[PracticeSession] = []
+        self._session_keys: Set[Tuple[Any, datetime]] = set()
+        self.page_size = settings.SESSION_HISTORY_PAGE_SIZE
+        self.has_more_sessions = False
+        self.loading_sessions = False
+        # Lista virtualizada: solo se pintan las tarjetas visibles y se pide otra
+        # página al acercarse al final
+        self.history_list = ft.ListView(
+            controls=[],
+            height=400,
+            spacing=0,
+            first_item_prototype=True,
+            on_scroll_interval=100,
+            on_scroll=self.handle_history_scroll,
+        )
 
     def create_stat_card(self, icon: str, title: str, value: str, description: str = None) -> ft.Container:
         """Crea una tarjeta de estadística con el nuevo diseño."""
@@ -194,9 +214,13 @@ class ProgressView:
         page.padding = 40
         page.bgcolor = ft.colors.GREY_50
 
-        # Cargar las sesiones del usuario
-        await self.load_sessions()
-        stats = self.calculate_stats()
+        # El resumen sale del agregado en caché; del historial solo la primera página
+        self.sessions = []
+        self._session_keys = set()
+        self.history_list.controls = []
+        self.has_more_sessions = True
+        stats, _ = await asyncio.gather(self.load_stats(), self.load_more_sessions())
+        self.history_list.visible = bool(self.sessions)
 
         # Contenido principal
         content = ft.Column([
@@ -254,7 +278,7 @@ class ProgressView:
 
             # Sección de Historial
             self.create_section_title("Historial de Sesiones"),
-            *[self.create_session_card(session) for session in self.sessions],
+            self.history_list,
 
             # Botón de retorno
             ft.Container(
@@ -281,60 +305,52 @@ class ProgressView:
         page.add(container)
         page.update()
 
-    async def load_sessions(self):
-        """Carga las sesiones de práctica del usuario."""
+    async def load_stats(self) -> dict:
+        """Obtiene las estadísticas agregadas del usuario."""
         try:
-            if api_service.current_user:
-                self.sessions = await api_service.get_user_practice_sessions(
-                    api_service.current_user.id
+            if self.api_service.current_user:
+                stats = await self.api_service.get_user_progress_stats(
+                    self.api_service.current_user.id
                 )
+                return stats.to_dict()
         except Exception as e:
-            print(f"Error cargando sesiones: {e}")
-            self.sessions = []
-
-    def calculate_stats(self):
-        """Calcula estadísticas generales de las sesiones."""
-        if not self.sessions:
-            return {
-                "total_sessions": 0,
-                "total_questions": 0,
-                "average_score": 0,
-                "domain_stats": {
-                    "personas": {"total": 0, "correct": 0},
-                    "proceso": {"total": 0, "correct": 0},
-                    "entorno": {"total": 0, "correct": 0}
-                }
-            }
-
-        stats = {
-            "total_sessions": len(self.sessions),
-            "total_questions": 0,
-            "total_correct": 0,
-            "domain_stats": {
-                "personas": {"total": 0, "correct": 0},
-                "proceso": {"total": 0, "correct": 0},
-                "entorno": {"total": 0, "correct": 0}
-            }
-        }
+            logger.error(f"Error cargando estadísticas: {e}")
+        return ProgressStats().to_dict()
 
-        for session in self.sessions:
-            # Estadísticas por dominio
-            stats["domain_stats"]["personas"]["total"] += session.personas_total
-            stats["domain_stats"]["personas"]["correct"] += session.personas_correct
-            stats["domain_stats"]["proceso"]["total"] += session.proceso_total
-            stats["domain_stats"]["proceso"]["correct"] += session.proceso_correct
-            stats["domain_stats"]["entorno"]["total"] += session.entorno_total
-            stats["domain_stats"]["entorno"]["correct"] += session.entorno_correct
+    async def load_more_sessions(self) -> bool:
+        """Carga la siguiente página del historial; devuelve si se añadieron sesiones."""
+        if self.loading_sessions or not self.has_more_sessions or not self.api_service.current_user:
+            return False
 
-            # Totales generales
-            total_session = (session.personas_total + session.proceso_total + session.entorno_total)
-            correct_session = (session.personas_correct + session.proceso_correct + session.entorno_correct)
-
-            stats["total_questions"] += total_session
-            stats["total_correct"] += correct_session
+        self.loading_sessions = True
+        try:
+            # Una sesión de más indica si hay otra página
+            sessions = await self.api_service.get_user_practice_sessions(
+                self.api_service.current_user.id,
+                limit=self.page_size + 1,
+                offset=len(self.sessions)
+            )
+        except Exception as e:
+            logger.error(f"Error cargando sesiones: {e}")
+            sessions = []
+        finally:
+            self.loading_sessions = False
 
-        # Calcular porcentaje general
-        stats["average_score"] = (stats["total_correct"] / stats["total_questions"] * 100) if stats[
-                                                                                                  "total_questions"] > 0 else 0
+        # Si el backend ignora el offset repite sesiones ya mostradas: se descartan
+        new_sessions = [
+            session for session in sessions
+            if (session.id, session.start_time) not in self._session_keys
+        ][:self.page_size]
+        self.has_more_sessions = len(sessions) > self.page_size and bool(new_sessions)
+        sessions = new_sessions
+        self._session_keys.update((session.id, session.start_time) for session in sessions)
+        self.sessions.extend(sessions)
+        self.history_list.controls.extend(self.create_session_card(session) for session in sessions)
+        return bool(sessions)
 
-        return stats
\ No newline at end of file
+    async def handle_history_scroll(self, e: ft.OnScrollEvent):
+        """Pide la siguiente página cuando el scroll se acerca al final de la lista."""
+        if e.max_scroll_extent is None or e.pixels is None:
+            return
+        if e.max_scroll_extent - e.pixels < 200 and await self.load_more_sessions():
+            UpdateScheduler.for_page(self.page).request(self.history_list)
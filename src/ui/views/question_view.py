@@ -2,39 +2,63 @@ import flet as ft
 from typing import Optional, Callable
 from src.models.question import Question
 from src.models.quiz_session import QuizAnswer
-from src.ui.components import create_title, create_container, create_button
+from src.ui.components import create_title, create_container, create_button, LayoutShell, UpdateScheduler
 
 
 class QuestionView:
+    """Pregunta y respuesta en un mismo control.
+
+    La explicación y las acciones de la respuesta se envían ocultas junto con la
+    pregunta; al verificar solo cambian la visibilidad y los estilos de controles
+    que el navegador ya tiene, sin reconstruir la página.
+    """
+
     def __init__(
         self,
-        on_answer_submitted: Callable,
+        on_next_question: Callable,
+        on_finish_practice: Callable,
+        on_domain_changed: Optional[Callable] = None,
+        layout: Optional[LayoutShell] = None,
     ):
-        self.on_answer_submitted = on_answer_submitted
+        self.on_next_question = on_next_question
+        self.on_finish_practice = on_finish_practice
+        self.on_domain_changed = on_domain_changed
+        self.layout = layout or LayoutShell()
         self.page = None
         self.current_question = None
         self.selected_value = None
+        self.question_number = 0
+        self.container: Optional[ft.Container] = None
 
-    def build(self, page: ft.Page, question: Question):
-        self.page = page
-        self.current_question = question
-        self.selected_value = None
+    def _create_layout(self):
+        """Crea una sola vez los controles; cada pregunta solo cambia su contenido."""
+        self.title = create_title("")
 
-        # Obtener el número de pregunta actual
-        question_number = len(page.quiz_session.answers) + 1
+        # Resultado (Correcto/Incorrecto), visible tras verificar
+        self.result_icon = ft.Icon(size=24)
+        self.result_text = ft.Text(size=16, weight=ft.FontWeight.BOLD)
+        self.result_container = ft.Container(
+            content=ft.Row(
+                [self.result_icon, self.result_text],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=10
+            ),
+            padding=10,
+            border_radius=8,
+            visible=False,
+        )
 
-        # Configurar la página
-        page.vertical_alignment = ft.MainAxisAlignment.START
-        page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-        page.padding = ft.padding.only(top=20)
-        page.clean()
+        self.question_text = ft.Text(
+            "",
+            size=16,
+            color=ft.colors.BLACK,
+            weight=ft.FontWeight.W_500
+        )
 
-        # Crear el RadioGroup y las opciones
+        # Crear el RadioGroup; las opciones se rellenan en cada pregunta
+        self.options_column = ft.Column([], spacing=10)
         self.radio_group = ft.RadioGroup(
-            content=ft.Column(
-                [self._create_radio_option(i, option) for i, option in enumerate(question.options)],
-                spacing=10,
-            ),
+            content=self.options_column,
             on_change=lambda e: self.handle_option_selected(e)
         )
 
@@ -45,37 +69,203 @@ class QuestionView:
             disabled=True,
             bgcolor=ft.colors.BLUE_200,
         )
+        self._disabled_style = self.submit_button.style
 
-        domain_display = question.domain.capitalize()
-        content = ft.Column(
-            controls=[
-                create_title(f"Pregunta {question_number} (Dominio: {domain_display})"),
+        # Explicación y acciones de la respuesta, visibles tras verificar
+        self.explanation_text = ft.Text(
+            "",
+            size=14,
+            color=ft.colors.BLACK
+        )
+        explanation_container = ft.Container(
+            content=ft.Column([
                 ft.Text(
-                    question.question_text,
+                    "Explicación:",
                     size=16,
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.colors.BLACK
+                ),
+                self.explanation_text,
+            ]),
+            padding=20,
+            bgcolor=ft.colors.BLUE_50,
+            border_radius=8,
+        )
+
+        # Dropdown para siguiente pregunta
+        self.domain_dropdown = ft.Dropdown(
+            width=200,
+            options=[
+                ft.dropdown.Option("aleatorio", "Aleatorio"),
+                ft.dropdown.Option("personas", "Personas"),
+                ft.dropdown.Option("proceso", "Proceso"),
+                ft.dropdown.Option("entorno", "Entorno de negocio"),
+            ],
+            value="aleatorio",
+            on_change=self.handle_domain_changed,
+            text_style=ft.TextStyle(
+                color=ft.colors.BLACK,
+                weight=ft.FontWeight.W_500,
+                size=14,
+            ),
+            label_style=ft.TextStyle(
+                color=ft.colors.BLACK,
+            ),
+            focused_border_color=ft.colors.BLUE,
+            focused_bgcolor=ft.colors.WHITE,
+            border_color=ft.colors.GREY_400,
+            bgcolor=ft.colors.WHITE,
+        )
+
+        # Botones de acción
+        next_button = create_button(
+            text="Siguiente Pregunta",
+            on_click=lambda e: self.page.loop.create_task(self.handle_next_question(e, self.domain_dropdown.value)),
+            bgcolor=ft.colors.GREEN,
+            color=ft.colors.WHITE,
+        )
+
+        finish_button = create_button(
+            text="Finalizar Práctica",
+            on_click=self.handle_finish_practice,
+            bgcolor=ft.colors.RED,
+            color=ft.colors.WHITE,
+        )
+
+        # Contenedor para siguiente pregunta
+        next_question_container = ft.Container(
+            content=ft.Column([
+                ft.Text(
+                    "Siguiente pregunta:",
+                    size=14,
                     color=ft.colors.BLACK,
                     weight=ft.FontWeight.W_500
                 ),
+                ft.Row(
+                    controls=[
+                        ft.Text(
+                            "Dominio:",
+                            size=14,
+                            color=ft.colors.BLACK,
+                            weight=ft.FontWeight.W_500
+                        ),
+                        self.domain_dropdown,
+                        next_button,
+                    ],
+                    alignment=ft.MainAxisAlignment.START,
+                    spacing=10,
+                ),
+            ]),
+            padding=ft.padding.all(20),
+            bgcolor=ft.colors.BLUE_50,
+            border_radius=8,
+        )
+
+        self.answer_section = ft.Column(
+            controls=[
+                explanation_container,
+                ft.Divider(),
+                next_question_container,
+                finish_button,
+            ],
+            spacing=20,
+            visible=False,
+        )
+
+        content = ft.Column(
+            controls=[
+                self.title,
+                self.result_container,
+                self.question_text,
                 self.radio_group,
                 self.submit_button,
+                self.answer_section,
             ],
             spacing=20,
         )
+        self.container = create_container(content)
 
-        container = create_container(content)
-        page.add(container)
-        page.update()
+    def build(self, page: ft.Page, question: Question, domain: str = "aleatorio"):
+        self.page = page
+        self.current_question = question
+        self.selected_value = None
 
-    def _create_radio_option(self, index: int, option) -> ft.Radio:
-        """Crea una opción de radio con el formato adecuado."""
-        return ft.Radio(
-            value=str(index),
-            label=f"{chr(65 + index)}) {option.text}",
-            label_style=ft.TextStyle(
-                color=ft.colors.BLACK,
-                weight=ft.FontWeight.W_400,
-                size=14,
+        if self.container is None:
+            self._create_layout()
+
+        # Obtener el número de pregunta actual
+        self.question_number = len(page.quiz_session.answers) + 1
+
+        # Configurar la página
+        page.vertical_alignment = ft.MainAxisAlignment.START
+        page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
+        page.padding = ft.padding.only(top=20)
+
+        domain_display = question.domain.capitalize()
+        self.title.value = f"Pregunta {self.question_number} (Dominio: {domain_display})"
+        self.question_text.value = question.question_text
+        self.explanation_text.value = question.explanation
+
+        # Reutilizar las opciones existentes y solo cambiar su texto
+        options = self.options_column.controls
+        for i, option in enumerate(question.options):
+            if i == len(options):
+                options.append(self._create_radio_option(i))
+            options[i].content.label = f"{chr(65 + i)}) {option.text}"
+            self._style_option(options[i], is_selected=False, is_correct=False, revealed=False)
+        del options[len(question.options):]
+        self.radio_group.value = None
+        self.radio_group.disabled = False
+
+        self.submit_button.disabled = True
+        self.submit_button.style = self._disabled_style
+        self.submit_button.visible = True
+
+        self.result_container.visible = False
+        self.answer_section.visible = False
+        # La siguiente pregunta sigue por defecto en el dominio que se practica, el ya precargado
+        self.domain_dropdown.value = domain
+
+        self.layout.show(page, self.container)
+
+    def _create_radio_option(self, index: int) -> ft.Container:
+        """Crea una opción de radio con el formato adecuado; su texto se asigna después."""
+        return ft.Container(
+            content=ft.Radio(
+                value=str(index),
+                label_style=ft.TextStyle(
+                    color=ft.colors.BLACK,
+                    weight=ft.FontWeight.W_400,
+                    size=14,
+                ),
             ),
+            padding=ft.padding.symmetric(horizontal=5),
+            border_radius=5,
+            border=ft.border.all(1, ft.colors.GREY_300),
+        )
+
+    def _style_option(self, option: ft.Container, is_selected: bool, is_correct: bool, revealed: bool):
+        """Colorea una opción según si es la seleccionada o la correcta una vez verificada.
+
+        Las opciones neutras tienen el mismo estilo antes y después de verificar, así
+        que al revelar la respuesta solo cambian la seleccionada y la correcta.
+        """
+        background_color = ft.colors.WHITE
+        text_color = ft.colors.BLACK
+
+        if revealed and is_correct:
+            background_color = ft.colors.GREEN_50
+            text_color = ft.colors.GREEN_900
+        elif revealed and is_selected:
+            background_color = ft.colors.RED_50
+            text_color = ft.colors.RED_900
+
+        emphasized = revealed and (is_selected or is_correct)
+        option.bgcolor = background_color
+        option.content.label_style = ft.TextStyle(
+            color=text_color,
+            weight=ft.FontWeight.W_500 if emphasized else ft.FontWeight.W_400,
+            size=14,
         )
 
     def handle_option_selected(self, e):
@@ -87,24 +277,25 @@ class QuestionView:
             bgcolor=ft.colors.BLUE_800,
             color=ft.colors.WHITE,
         )
-        self.page.update()
+        UpdateScheduler.for_page(self.page).request(self.submit_button)
 
     async def handle_submit_answer(self, e):
-        """Maneja la verificación de la respuesta."""
+        """Verifica la respuesta y la muestra sobre los controles ya presentes."""
         if self.current_question and self.selected_value:
             # Obtener la opción correcta
             correct_option = next(
                 (i for i, opt in enumerate(self.current_question.options) if opt.is_correct),
                 None
             )
-            is_correct = int(self.selected_value) == correct_option
+            selected_index = int(self.selected_value)
+            is_correct = selected_index == correct_option
 
             # Registrar la respuesta en la sesión
             if hasattr(self.page, 'quiz_session'):
                 self.page.quiz_session.add_answer(
                     QuizAnswer(
                         question_text=self.current_question.question_text,
-                        selected_option=chr(65 + int(self.selected_value)),
+                        selected_option=chr(65 + selected_index),
                         correct_option=chr(65 + correct_option),
                         is_correct=is_correct,
                         domain=self.current_question.domain,
@@ -112,10 +303,36 @@ class QuestionView:
                     )
                 )
 
-            # Notificar que se ha enviado una respuesta
-            await self.on_answer_submitted(
-                e,
-                self.current_question,
-                chr(65 + int(self.selected_value)),
-                is_correct
-            )
\ No newline at end of file
+            self.reveal(selected_index, correct_option, is_correct)
+
+    def reveal(self, selected_index: int, correct_option: Optional[int], is_correct: bool):
+        """Muestra el resultado, la explicación y los colores de cada opción."""
+        self.title.value = f"Respuesta Pregunta {self.question_number}"
+
+        result_color = ft.colors.GREEN if is_correct else ft.colors.RED
+        self.result_icon.name = ft.icons.CHECK_CIRCLE if is_correct else ft.icons.ERROR
+        self.result_icon.color = result_color
+        self.result_text.value = "¡Correcto!" if is_correct else "Incorrecto"
+        self.result_text.color = result_color
+        self.result_container.visible = True
+
+        for i, option in enumerate(self.options_column.controls):
+            self._style_option(option, i == selected_index, i == correct_option, revealed=True)
+        self.radio_group.disabled = True
+
+        self.submit_button.visible = False
+        self.answer_section.visible = True
+        UpdateScheduler.for_page(self.page).request(self.container)
+
+    async def handle_next_question(self, e, domain: str):
+        """Maneja la navegación a la siguiente pregunta."""
+        await self.on_next_question(e, domain)
+
+    async def handle_domain_changed(self, e):
+        """Avisa del cambio de dominio para precargar sus preguntas."""
+        if self.on_domain_changed:
+            await self.on_domain_changed(e.control.value)
+
+    async def handle_finish_practice(self, e):
+        """Maneja la finalización de la práctica."""
+        await self.on_finish_practice(e)
@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.models.user import User
+from src.services.api_service import APIService
+from src.services.retry import RetryPolicy
+
+
+class Clock:
+    """Reloj manual para los componentes que aceptan `clock=`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _no_sleep(delay: float):
+    pass
+
+
+@pytest.fixture
+def no_sleep():
+    return _no_sleep
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def question_data() -> dict:
+    return {
+        "question_text": "¿Qué principio aplica?",
+        "options": [{"text": "A", "is_correct": True}, {"text": "B", "is_correct": False}],
+        "explanation": "Porque sí",
+        "domain": "personas",
+    }
+
+
+@pytest.fixture
+def session_data():
+    """Construye la sesión `number` del usuario 1 tal como la devuelve el backend."""
+    def build(number: int, personas_correct: int = 1) -> dict:
+        return {
+            "id": number, "user_id": "1",
+            "start_time": f"2024-01-{number + 1:02d}T10:00:00", "end_time": f"2024-01-{number + 1:02d}T10:10:00",
+            "personas_total": 2, "personas_correct": personas_correct,
+            "proceso_total": 1, "proceso_correct": 1, "entorno_total": 0, "entorno_correct": 0,
+        }
+    return build
+
+
+@pytest.fixture
+def make_service(no_sleep):
+    """Crea un APIService contra `handler` cuyos reintentos no esperan."""
+    def build(handler) -> APIService:
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01, deadline=5, sleep=no_sleep)
+        return APIService(transport=httpx.MockTransport(handler), retry_policy=policy)
+    return build
+
+
+@pytest.fixture
+def logged_in(make_service):
+    """Como make_service, con el usuario 1 ya autenticado."""
+    def build(handler) -> APIService:
+        service = make_service(handler)
+        service.current_user = User(email="ana@example.com", id="1", access_token="token", is_authenticated=True)
+        return service
+    return build
+
+
+@pytest.fixture
+def run():
+    """Ejecuta `coro` en un bucle nuevo y cierra el servicio al terminar."""
+    def run_and_close(service: APIService, coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await service.close()
+        return asyncio.run(main())
+    return run_and_close
@@ -0,0 +1,328 @@
+import asyncio
+import json
+from dataclasses import replace
+
+import httpx
+import pytest
+from jose import jwt
+
+from src.config.settings import settings
+from src.models.user import User
+from src.services.chat_service import ChatService, ChatStreamError
+
+
+def test_question_fetch_recovers_from_transient_errors(make_service, run, question_data):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("caído")
+        if len(calls) == 2:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"data": question_data})
+
+    service = make_service(handler)
+    question = run(service, service.get_single_question("personas"))
+
+    assert question is not None
+    assert question.question_text == question_data["question_text"]
+    assert len(calls) == 3
+
+
+def test_login_is_not_retried_after_server_error(make_service, run):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(500, json={"detail": "fallo"})
+
+    service = make_service(handler)
+    success, _ = run(service, service.login("ana@example.com", "secreto"))
+
+    assert not success
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def make_chat(logged_in, no_sleep):
+    def build(handler) -> ChatService:
+        chat = ChatService(api_service=logged_in(handler))
+        chat.retry_policy = replace(chat.retry_policy, sleep=no_sleep)
+        return chat
+    return build
+
+
+def test_chat_stream_retries_unprocessed_request(run, make_chat):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        body = "data: {\"response\": \"Hola\"}\n\ndata: {\"response\": \" mundo\"}\n\ndata: [DONE]\n\n"
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, text=body)
+
+    chat = make_chat(handler)
+
+    async def collect():
+        return [chunk async for chunk in chat.stream_message("Hola")]
+
+    chunks = run(chat.api_service, collect())
+
+    assert "".join(chunks) == "Hola mundo"
+    assert len(calls) == 2
+    assert json.loads(calls[1].content)["stream"] is True
+
+
+def test_chat_message_is_not_resent_after_server_error(run, make_chat):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    chat = make_chat(handler)
+    response = run(chat.api_service, chat.send_message("Hola"))
+
+    assert response.startswith("Error")
+    assert len(calls) == 1
+
+
+def test_open_question_circuit_serves_a_recent_question(make_service, run, question_data):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(200, json={"data": question_data})
+        return httpx.Response(503)
+
+    service = make_service(handler)
+    service.circuit("question").min_calls = 2
+
+    async def main():
+        first = await service.get_single_question("personas")
+        await service.get_single_question("personas")
+        # El circuito ya está abierto: no se contacta con el backend
+        fallback = await service.get_single_question("personas")
+        return first, fallback
+
+    first, fallback = run(service, main())
+
+    assert service.circuit_states()["question"]["state"] == "open"
+    assert fallback == first
+    assert len(calls) == 4
+
+
+def test_open_auth_circuit_fails_login_fast_with_friendly_message(make_service, run):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    service = make_service(handler)
+    breaker = service.circuit("auth")
+    breaker.min_calls = 1
+
+    async def main():
+        await service.login("ana@example.com", "secreto")
+        return await service.login("ana@example.com", "secreto")
+
+    success, message = run(service, main())
+
+    assert not success
+    assert "no está disponible" in message
+    assert len(calls) == 3
+
+
+def test_login_reads_user_id_from_token_claims(make_service, run):
+    calls = []
+    token = jwt.encode({"user_id": "42", "exp": 1900000000}, "secreto", algorithm="HS256")
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"access_token": token, "token_type": "bearer"})
+
+    service = make_service(handler)
+    success, _ = run(service, service.login("ana@example.com", "secreto"))
+
+    assert success
+    assert service.current_user.id == "42"
+    assert service.current_user.expires_at.timestamp() == 1900000000
+    assert calls == ["/api/auth/token"]
+
+
+def test_login_falls_back_to_auth_me_without_claims(make_service, run):
+    calls = []
+    token = jwt.encode({"sub": "ana@example.com"}, "secreto", algorithm="HS256")
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/auth/token"):
+            return httpx.Response(200, json={"access_token": token, "token_type": "bearer"})
+        return httpx.Response(200, json={"id": "42", "email": "ana@example.com"})
+
+    service = make_service(handler)
+    success, _ = run(service, service.login("ana@example.com", "secreto"))
+
+    assert success
+    assert service.current_user.id == "42"
+    assert calls == ["/api/auth/token", "/api/auth/me"]
+
+
+def test_current_user_is_cached_and_concurrent_checks_share_one_request(make_service, run):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": "42", "email": "ana@example.com"})
+
+    service = make_service(handler)
+    service.current_user = User(email="ana@example.com", id="42", access_token="token", is_authenticated=True)
+
+    async def main():
+        users = await asyncio.gather(*[service.get_current_user() for _ in range(10)])
+        users.append(await service.get_current_user())
+        return users
+
+    users = run(service, main())
+
+    assert len(calls) == 1
+    assert all(user is service.current_user for user in users)
+    assert users[0].id == "42"
+
+
+def test_current_user_is_none_when_token_is_rejected(make_service, run):
+    def handler(request):
+        return httpx.Response(401)
+
+    service = make_service(handler)
+    service.current_user = User(email="ana@example.com", id="42", access_token="token", is_authenticated=True)
+    service.auth.refresh_supported = False
+
+    assert run(service, service.get_current_user()) is None
+
+
+def test_concurrent_identical_reads_make_one_backend_hit(monkeypatch, make_service, run):
+    # Sin caché local: cada lectura del historial va al backend
+    monkeypatch.setattr(settings, "SESSION_CACHE_PATH", "")
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[])
+
+    service = make_service(handler)
+    service.current_user = User(email="ana@example.com", id="42", access_token="token", is_authenticated=True)
+    other = service.for_session()
+    other.current_user = User(email="luis@example.com", id="7", access_token="otro", is_authenticated=True)
+
+    async def main():
+        await asyncio.gather(
+            *[service.get_user_practice_sessions("42", limit=20) for _ in range(10)],
+            *[other.get_user_practice_sessions("7", limit=20) for _ in range(10)]
+        )
+        # Terminada la anterior, una nueva lectura vuelve a consultar al backend
+        await service.get_user_practice_sessions("42", limit=20)
+
+    run(service, main())
+
+    assert sorted(calls) == ["/api/practice-sessions/user/42"] * 2 + ["/api/practice-sessions/user/7"]
+    assert service.single_flight.shared == 18
+
+
+def test_question_reads_are_not_coalesced(make_service, run, question_data):
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"data": question_data})
+
+    service = make_service(handler)
+
+    async def main():
+        await asyncio.gather(*[service.get_single_question("personas") for _ in range(4)])
+
+    run(service, main())
+
+    # Cada pregunta debe ser una petición propia: el backend las elige al azar
+    assert len(calls) == 4
+
+
+def test_chat_stream_failure_after_partial_answer_is_raised_and_not_stored(run, make_chat):
+    async def broken_stream():
+        yield b'data: {"delta": "Hola"}\n\n'
+        raise httpx.ReadError("conexión cortada")
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=broken_stream())
+
+    chat = make_chat(handler)
+    chunks = []
+
+    async def collect():
+        try:
+            async for chunk in chat.stream_message("Hola"):
+                chunks.append(chunk)
+        except ChatStreamError as error:
+            return error
+
+    error = run(chat.api_service, collect())
+
+    assert chunks == ["Hola"]
+    assert isinstance(error, ChatStreamError)
+    assert error.message.startswith("Error")
+    assert chat.message_history == []
+
+
+def test_chat_stream_expired_session_is_signalled(run, make_chat):
+    chat = make_chat(lambda request: httpx.Response(401))
+
+    async def collect():
+        try:
+            return [chunk async for chunk in chat.stream_message("Hola")]
+        except ChatStreamError as error:
+            return error
+
+    error = run(chat.api_service, collect())
+
+    assert isinstance(error, ChatStreamError)
+    assert error.session_expired
+
+
+def test_empty_chat_stream_is_not_stored(run, make_chat):
+    chat = make_chat(lambda request: httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, text="data: [DONE]\n\n"
+    ))
+
+    async def collect():
+        return [chunk async for chunk in chat.stream_message("Hola")]
+
+    assert run(chat.api_service, collect()) == []
+    assert chat.message_history == []
+
+
+def test_slow_chat_replies_do_not_open_the_shared_chat_circuit(run, make_chat, clock):
+
+    async def handler(request):
+        # Cada respuesta del modelo tarda más que el umbral de llamada lenta
+        clock.now += settings.CIRCUIT_SLOW_CALL_SECONDS + 0.1
+        return httpx.Response(200, json={"response": "Respuesta larga"})
+
+    chat = make_chat(handler)
+    chat.api_service.circuit("chat").clock = clock
+
+    async def main():
+        replies = await asyncio.gather(*[chat.send_message(f"Pregunta {n}") for n in range(6)])
+        return replies + [await chat.send_message("Otra pregunta")]
+
+    replies = run(chat.api_service, main())
+
+    assert replies == ["Respuesta larga"] * 7
+    assert chat.api_service.circuit_states()["chat"]["state"] == "closed"
+    assert chat.api_service.circuit_states()["chat"]["slow_calls"] == 0
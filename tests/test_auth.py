@@ -0,0 +1,243 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from src.models.user import User
+from src.services.api_service import APIService
+from src.services.auth import decode_access_token
+
+EXP = 1900000000
+
+
+def make_keys():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def test_reads_claims_without_verification():
+    token = jwt.encode({"user_id": 42, "email": "ana@example.com", "exp": EXP}, "secreto", algorithm="HS256")
+
+    claims = decode_access_token(token, public_key="")
+
+    assert claims.user_id == "42"
+    assert claims.email == "ana@example.com"
+    assert claims.expires_at == datetime.fromtimestamp(EXP, tz=timezone.utc)
+
+
+def test_missing_claims_are_none():
+    token = jwt.encode({"sub": "ana@example.com"}, "secreto", algorithm="HS256")
+
+    claims = decode_access_token(token, public_key="")
+
+    assert claims.user_id is None
+    assert claims.expires_at is None
+
+
+def test_custom_user_id_claim():
+    token = jwt.encode({"uid": "abc"}, "secreto", algorithm="HS256")
+
+    assert decode_access_token(token, public_key="", user_id_claim="uid").user_id == "abc"
+
+
+def test_verifies_signature_with_public_key():
+    private_pem, public_pem = make_keys()
+    token = jwt.encode({"user_id": "7", "exp": EXP}, private_pem, algorithm="RS256")
+
+    claims = decode_access_token(token, public_key=public_pem, algorithms="RS256")
+
+    assert claims.user_id == "7"
+
+
+def test_rejects_token_signed_with_another_key():
+    private_pem, _ = make_keys()
+    _, other_public_pem = make_keys()
+    token = jwt.encode({"user_id": "7", "exp": EXP}, private_pem, algorithm="RS256")
+
+    assert decode_access_token(token, public_key=other_public_pem, algorithms="RS256") is None
+
+
+def test_garbage_token_is_none():
+    assert decode_access_token("no-es-un-jwt", public_key="") is None
+
+
+def make_token(user_id: str, expires_in: float) -> str:
+    return jwt.encode({"user_id": user_id, "exp": int(time.time() + expires_in)}, "secreto", algorithm="HS256")
+
+
+@pytest.fixture
+def token_service(make_service):
+    """Crea un servicio cuyo usuario tiene `token` y un refresh token."""
+    def build(handler, token: str) -> APIService:
+        service = make_service(handler)
+        service.current_user = User(
+            email="ana@example.com",
+            id="1",
+            access_token=token,
+            is_authenticated=True,
+            expires_at=decode_access_token(token, public_key="").expires_at,
+            refresh_token="refresco"
+        )
+        return service
+    return build
+
+
+def test_concurrent_401s_share_one_refresh_and_retry_once(token_service, run):
+    old_token = make_token("1", 3600)
+    new_token = make_token("1", 7200)
+    refreshes = []
+    authorizations = []
+
+    async def handler(request):
+        if request.url.path.endswith("/auth/refresh"):
+            refreshes.append(json.loads(request.content))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"access_token": new_token})
+        authorizations.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == f"Bearer {old_token}":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": None})
+
+    service = token_service(handler, old_token)
+
+    async def main():
+        return await asyncio.gather(*[
+            service.client.get("http://test/api/question", auth=service.auth) for _ in range(5)
+        ])
+
+    responses = run(service, main())
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert refreshes == [{"refresh_token": "refresco"}]
+    assert service.current_user.access_token == new_token
+    assert authorizations.count(f"Bearer {new_token}") == 5
+
+
+def test_401_is_returned_when_refresh_is_not_supported(token_service, run):
+    token = make_token("1", 3600)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/auth/refresh"):
+            return httpx.Response(404)
+        return httpx.Response(401)
+
+    service = token_service(handler, token)
+
+    async def main():
+        first = await service.client.get("http://test/api/question", auth=service.auth)
+        second = await service.client.get("http://test/api/question", auth=service.auth)
+        return first, second
+
+    first, second = run(service, main())
+
+    assert first.status_code == second.status_code == 401
+    assert service.auth.refresh_supported is False
+    assert calls.count("/api/auth/refresh") == 1
+
+
+def test_refreshes_proactively_before_expiry(token_service, run):
+    old_token = make_token("1", 1)
+    new_token = make_token("1", 3600)
+    refreshed = []
+
+    def handler(request):
+        refreshed.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"access_token": new_token, "refresh_token": "otro"})
+
+    service = token_service(handler, old_token)
+
+    async def main():
+        service.auth.min_refresh_interval = 0
+        service.auth.start()
+        # Con un margen de 60s el token de 1s se renueva a mitad de su vida
+        for _ in range(100):
+            if service.current_user.access_token == new_token:
+                break
+            await asyncio.sleep(0.01)
+
+    run(service, main())
+
+    assert refreshed == [f"Bearer {old_token}"]
+    assert service.current_user.access_token == new_token
+    assert service.current_user.refresh_token == "otro"
+    assert service.current_user.expires_at > datetime.now(timezone.utc)
+
+
+def test_short_lived_tokens_do_not_spin_the_refresh_loop(token_service, run):
+    refreshes = []
+
+    def handler(request):
+        refreshes.append(request.url.path)
+        # El backend emite tokens más cortos que el margen de renovación
+        return httpx.Response(200, json={"access_token": make_token("1", 2)})
+
+    service = token_service(handler, make_token("1", 2))
+
+    async def main():
+        service.auth.min_refresh_interval = 0.5
+        service.auth.start()
+        await asyncio.sleep(1.5)
+
+    run(service, main())
+
+    assert 1 <= len(refreshes) <= 3
+
+
+def test_outbox_flush_and_session_share_the_rotating_refresh(token_service):
+    old_token = make_token("1", 3600)
+    new_token = make_token("1", 7200)
+    valid_refresh = {"refresco"}
+    refreshes = []
+
+    async def handler(request):
+        if request.url.path.endswith("/auth/refresh"):
+            refresh_token = json.loads(request.content)["refresh_token"]
+            refreshes.append(refresh_token)
+            await asyncio.sleep(0.01)
+            # Rotatorio: cada refresh token solo sirve una vez
+            if refresh_token not in valid_refresh:
+                return httpx.Response(401)
+            valid_refresh.discard(refresh_token)
+            return httpx.Response(200, json={"access_token": new_token, "refresh_token": "refresco-2"})
+        if request.headers["Authorization"] == f"Bearer {old_token}":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": None})
+
+    pool = APIService(transport=httpx.MockTransport(handler))
+    session = token_service(handler, old_token)
+    session._pool_owner = pool
+    # El envío de la cola usa otro servicio del pool con el mismo objeto User
+    flusher = pool.for_session()
+    flusher.current_user = session.current_user
+
+    async def main():
+        try:
+            return await asyncio.gather(
+                session.client.get("http://test/api/question", auth=session.auth),
+                flusher.client.get("http://test/api/practice-sessions", auth=flusher.auth),
+            )
+        finally:
+            await pool.close()
+
+    responses = asyncio.run(main())
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert refreshes == ["refresco"]
+    assert session.current_user.refresh_token == "refresco-2"
@@ -0,0 +1,60 @@
+from src.services.chat_history import ChatHistoryWindow, estimate_tokens
+
+
+def conversation(turns: int, length: int = 40):
+    history = []
+    for number in range(turns):
+        history.append({"role": "user", "content": f"pregunta {number} " + "p" * length})
+        history.append({"role": "assistant", "content": f"respuesta {number} " + "r" * length})
+    return history
+
+
+def test_window_keeps_the_last_turns():
+    window = ChatHistoryWindow(max_turns=3, token_budget=10_000, summarize=False)
+
+    sent = window.build(conversation(5))
+
+    assert len(sent) == 6
+    assert sent[0]["content"].startswith("pregunta 2")
+    assert window.stats.dropped_messages == 4
+
+
+def test_token_budget_trims_whole_turns():
+    history = conversation(4)
+    history[-1]["content"] += "x" * 200
+    window = ChatHistoryWindow(max_turns=10, token_budget=120, summarize=False)
+
+    sent = window.build(history)
+
+    assert sum(estimate_tokens(msg["content"]) for msg in sent) <= 120
+    assert sent[0]["role"] == "user"
+    assert [msg["role"] for msg in sent] == ["user", "assistant"] * (len(sent) // 2)
+
+
+def test_leading_answer_without_question_is_not_sent():
+    history = conversation(2)[1:]
+    window = ChatHistoryWindow(max_turns=10, token_budget=10_000, summarize=False)
+
+    sent = window.build(history)
+
+    assert sent[0]["role"] == "user"
+    assert len(sent) == 2
+
+
+def test_summary_goes_inside_the_first_user_message_within_budget():
+    history = conversation(10)
+    window = ChatHistoryWindow(max_turns=10, token_budget=150, summarize=True)
+
+    sent = window.build(history)
+
+    assert {msg["role"] for msg in sent} <= {"user", "assistant"}
+    assert sent[0]["role"] == "user"
+    assert sent[0]["content"].startswith("Resumen de la conversación anterior:")
+    assert sum(estimate_tokens(msg["content"]) for msg in sent) <= 150
+
+
+def test_summary_is_skipped_when_nothing_is_dropped():
+    history = conversation(2)
+    window = ChatHistoryWindow(max_turns=10, token_budget=10_000, summarize=True)
+
+    assert window.build(history) == history
@@ -0,0 +1,174 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from src.services.retry import RetryPolicy
+
+
+def make_breaker(clock, **kwargs) -> CircuitBreaker:
+    kwargs.setdefault("window_size", 10)
+    kwargs.setdefault("min_calls", 4)
+    kwargs.setdefault("failure_rate", 0.5)
+    kwargs.setdefault("slow_call_seconds", 2)
+    kwargs.setdefault("slow_call_rate", 0.5)
+    kwargs.setdefault("open_seconds", 30)
+    kwargs.setdefault("half_open_calls", 1)
+    return CircuitBreaker("question", clock=clock, **kwargs)
+
+
+def call(breaker: CircuitBreaker, status: int = 200, clock=None, elapsed: float = 0):
+    async def send():
+        if clock is not None:
+            clock.now += elapsed
+        return httpx.Response(status)
+    return asyncio.run(breaker.call(send))
+
+
+def test_opens_after_failure_rate_and_fails_fast(clock):
+    breaker = make_breaker(clock)
+
+    for status in (200, 500, 502, 503):
+        call(breaker, status)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        call(breaker)
+    assert error.value.retry_in == 30
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_stays_closed_below_minimum_calls_and_ignores_client_errors(clock):
+    breaker = make_breaker(clock)
+
+    for status in (500, 502, 503):
+        call(breaker, status)
+    assert breaker.state == CLOSED
+
+    breaker.reset()
+    for status in (404, 501, 401, 500, 200):
+        call(breaker, status)
+    assert breaker.state == CLOSED
+
+
+def test_network_errors_count_as_failures(clock):
+    breaker = make_breaker(clock, min_calls=2)
+
+    async def fail():
+        raise httpx.ConnectError("caído")
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(breaker.call(fail))
+
+    assert breaker.state == OPEN
+
+
+def test_opens_when_calls_are_slow(clock):
+    breaker = make_breaker(clock)
+
+    for _ in range(4):
+        call(breaker, 200, clock, elapsed=3)
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["slow_calls"] == 4
+
+
+def test_half_open_probe_closes_on_success(clock):
+    breaker = make_breaker(clock, min_calls=1)
+    call(breaker, 503)
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    call(breaker, 200)
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_reopens_on_failure(clock):
+    breaker = make_breaker(clock, min_calls=1)
+    call(breaker, 503)
+
+    clock.now += 30
+    call(breaker, 503)
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["times_opened"] == 2
+
+
+def test_half_open_allows_only_the_configured_probes(clock):
+    breaker = make_breaker(clock, min_calls=1)
+    call(breaker, 503)
+    clock.now += 30
+
+    async def main():
+        release = asyncio.Event()
+
+        async def slow_send():
+            await release.wait()
+            return httpx.Response(200)
+
+        probe = asyncio.create_task(breaker.call(slow_send))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(slow_send)
+        release.set()
+        return await probe
+
+    assert asyncio.run(main()).status_code == 200
+    assert breaker.state == CLOSED
+
+
+def test_reading_the_state_does_not_reset_half_open_probes(clock):
+    breaker = make_breaker(clock, min_calls=1)
+    call(breaker, 503)
+    clock.now += 30
+
+    async def main():
+        release = asyncio.Event()
+
+        async def slow_send():
+            await release.wait()
+            return httpx.Response(200)
+
+        probe = asyncio.create_task(breaker.call(slow_send))
+        await asyncio.sleep(0)
+        # Consultar el estado (p. ej. desde las métricas) no abre hueco a otra prueba
+        assert breaker.state == HALF_OPEN
+        assert breaker.snapshot()["state"] == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(slow_send)
+        release.set()
+        return await probe
+
+    assert asyncio.run(main()).status_code == 200
+    assert breaker.state == CLOSED
+
+
+def test_only_the_last_attempt_counts_as_slow(clock):
+    breaker = make_breaker(clock, min_calls=1)
+    statuses = iter([503, 200])
+
+    async def sleep(delay: float):
+        # La espera entre intentos supera con creces el umbral de llamada lenta
+        clock.now += 10
+
+    async def send():
+        return httpx.Response(next(statuses))
+
+    policy = RetryPolicy(max_attempts=2, base_delay=1, max_delay=1, deadline=None, sleep=sleep)
+    response = asyncio.run(breaker.call(send, retry_policy=policy))
+
+    assert response.status_code == 200
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["slow_calls"] == 0
+
+
+def test_slow_call_rule_can_be_disabled(clock):
+    breaker = make_breaker(clock, min_calls=1, slow_call_seconds=None)
+
+    call(breaker, 200, clock=clock, elapsed=60)
+
+    assert breaker.state == CLOSED
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import threading
+import urllib.request
+
+import flet as ft
+import httpx
+
+from benchmarks.headless import create_page
+from src.app.view_registry import ViewRegistry
+from src.services.metrics import MetricsRegistry, metrics, route_template, start_metrics_server
+
+
+class DemoView:
+    def build(self, page):
+        page.controls.clear()
+        page.add(ft.Column([ft.Text(str(i)) for i in range(5)]), ft.Container(content=ft.Text("pie")))
+
+
+def test_histogram_is_exported_as_prometheus_text():
+    registry = MetricsRegistry()
+    for value in (0.003, 0.02, 0.02, 4):
+        registry.observe("latency_seconds", value, route="/question")
+    registry.inc("bytes_total", 10, route="/question")
+    registry.add_collector(lambda: [("circuit_open", {"endpoint": "chat"}, 1.0)])
+
+    text = registry.to_prometheus()
+
+    assert 'pmp_latency_seconds_bucket{route="/question",le="0.005"} 1' in text
+    assert 'pmp_latency_seconds_bucket{route="/question",le="0.025"} 3' in text
+    assert 'pmp_latency_seconds_bucket{route="/question",le="+Inf"} 4' in text
+    assert 'pmp_latency_seconds_count{route="/question"} 4' in text
+    assert 'pmp_bytes_total{route="/question"} 10' in text
+    assert 'pmp_circuit_open{endpoint="chat"} 1' in text
+    assert registry.histogram("latency_seconds", route="/question").quantile(0.5) <= 0.025
+
+
+def test_route_template_hides_ids():
+    assert route_template("/api/practice-sessions/user/42/stats") == "/practice-sessions/user/{id}/stats"
+    assert route_template("/api/practice-sessions/user/65a1f0c2b9e4d3a1c8f7e6d5") == "/practice-sessions/user/{id}"
+    assert route_template("/api/question") == "/question"
+
+
+def test_api_calls_record_route_status_latency_and_bytes(make_service, run, question_data):
+    sent = []
+
+    def handler(request):
+        response = httpx.Response(200, json={"data": question_data})
+        sent.append(len(response.content))
+        return response
+
+    service = make_service(handler)
+    metrics.reset()
+    run(service, service.get_single_question("personas"))
+
+    labels = {"service": "api", "method": "GET", "route": "/question", "status": "200"}
+    histogram = metrics.histogram("http_client_request_duration_seconds", **labels)
+    assert histogram is not None and histogram.count == 1
+    received = metrics.to_dict()["counters"]["http_client_response_bytes_total"][0]
+    assert received["labels"] == labels
+    assert received["value"] == sent[0]
+
+
+def test_view_builds_are_timed_with_their_control_count():
+    async def main():
+        page, _ = create_page("metricas")
+        registry = ViewRegistry()
+        registry.register("demo", __name__, "DemoView")
+        metrics.reset()
+        registry["demo"].build(page)
+
+    asyncio.run(main())
+
+    assert metrics.histogram("view_build_duration_seconds", view="demo").count == 1
+    # Columna con 5 textos y contenedor con su texto
+    assert metrics.histogram("view_controls", view="demo").sum == 8
+
+
+def test_metrics_server_serves_prometheus_and_json():
+    registry = MetricsRegistry()
+    registry.inc("requests_total", route="/chat")
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        text = urllib.request.urlopen(f"{base}/metrics").read().decode()
+        data = json.loads(urllib.request.urlopen(f"{base}/metrics.json").read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'pmp_requests_total{route="/chat"} 1' in text
+    assert data["counters"]["requests_total"][0]["value"] == 1
+
+
+def test_loop_collectors_run_on_their_event_loop_when_scraped():
+    registry = MetricsRegistry()
+    threads = []
+
+    def collector():
+        threads.append(threading.get_ident())
+        yield "circuit_open", {"endpoint": "question"}, 0.0
+
+    async def main():
+        registry.add_collector(collector, loop=asyncio.get_running_loop())
+        server = start_metrics_server(port=0, registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            text = await asyncio.to_thread(lambda: urllib.request.urlopen(url).read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+        return text, threading.get_ident()
+
+    text, loop_thread = asyncio.run(main())
+
+    assert 'pmp_circuit_open{endpoint="question"} 0' in text
+    assert threads == [loop_thread]
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.ui.views.progress_view import ProgressView
+
+
+@pytest.fixture(autouse=True)
+def no_session_cache(monkeypatch):
+    # Sin caché local: el historial se pide siempre al backend
+    monkeypatch.setattr(settings, "SESSION_CACHE_PATH", "")
+
+
+def test_stats_endpoint_is_used_and_cached(logged_in):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={
+            "total_sessions": 4, "personas_total": 10, "personas_correct": 7,
+            "proceso_total": 5, "proceso_correct": 5, "entorno_total": 5, "entorno_correct": 3,
+        })
+
+    service = logged_in(handler)
+
+    async def main():
+        first = await service.get_user_progress_stats("1")
+        second = await service.get_user_progress_stats("1")
+        await service.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert calls == ["/api/practice-sessions/user/1/stats"]
+    assert second is first
+    assert first.total_sessions == 4
+    assert first.total_questions == 20
+    assert first.average_score == 75
+
+
+def test_missing_stats_endpoint_falls_back_to_the_sessions(logged_in, session_data):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/stats"):
+            return httpx.Response(404)
+        return httpx.Response(200, json=[session_data(0), session_data(1, personas_correct=2)])
+
+    service = logged_in(handler)
+
+    async def main():
+        stats = await service.get_user_progress_stats("1")
+        # Otro usuario: el endpoint ya se sabe que no existe y no se vuelve a pedir
+        await service.get_user_progress_stats("2")
+        await service.close()
+        return stats
+
+    stats = asyncio.run(main())
+
+    assert stats.total_sessions == 2
+    assert stats.domain_stats["personas"] == {"total": 4, "correct": 3}
+    assert calls.count("/api/practice-sessions/user/1/stats") == 1
+    assert "/api/practice-sessions/user/2/stats" not in calls
+
+
+def test_cached_stats_expire_after_the_ttl(logged_in, clock):
+    totals = iter([3, 5])
+
+    def handler(request):
+        return httpx.Response(200, json={"total_sessions": next(totals)})
+
+    service = logged_in(handler)
+    service._progress_stats.clock = clock
+
+    async def main():
+        before = (await service.get_user_progress_stats("1")).total_sessions
+        clock.now += service._progress_stats.ttl
+        after = (await service.get_user_progress_stats("1")).total_sessions
+        await service.close()
+        return before, after
+
+    assert asyncio.run(main()) == (3, 5)
+
+
+def test_progress_view_logs_stats_errors(caplog, logged_in):
+    service = logged_in(lambda request: httpx.Response(200, json={}))
+
+    async def failing_stats(user_id):
+        raise RuntimeError("sin conexión")
+
+    service.get_user_progress_stats = failing_stats
+    view = ProgressView(on_return_home=lambda e: None, api_service=service)
+
+    with caplog.at_level(logging.ERROR):
+        stats = asyncio.run(view.load_stats())
+
+    assert stats["total_sessions"] == 0
+    assert "Error cargando estadísticas: sin conexión" in caplog.text
@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+from benchmarks.headless import FakeEvent, create_page
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.services.question_prefetcher import QuestionPrefetcher
+
+
+@pytest.fixture
+def question_backend(question_data):
+    """Backend de preguntas con textos únicos que anota cada petición recibida."""
+    def build(batch: bool = True, delay: float = 0):
+        numbers = itertools.count()
+        calls = []
+
+        def make_question():
+            return {**question_data, "question_text": f"Pregunta {next(numbers)}"}
+
+        async def handler(request):
+            calls.append((request.url.path, dict(request.url.params)))
+            await asyncio.sleep(delay)
+            if request.url.path.endswith("/questions"):
+                if not batch:
+                    return httpx.Response(404)
+                count = int(request.url.params["count"])
+                return httpx.Response(200, json={"data": [make_question() for _ in range(count)]})
+            return httpx.Response(200, json={"data": make_question()})
+
+        return handler, calls
+    return build
+
+
+def test_concurrent_gets_share_one_question(make_service, question_backend):
+    handler, calls = question_backend(delay=0.01)
+    service = make_service(handler)
+    prefetcher = QuestionPrefetcher(service, depth=0)
+
+    async def main():
+        first, second = await asyncio.gather(prefetcher.get("personas"), prefetcher.get("personas"))
+        await service.close()
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first is second
+    assert len(calls) == 1
+
+
+def test_buffer_never_holds_more_than_depth_questions(make_service, question_backend):
+    handler, calls = question_backend()
+    service = make_service(handler)
+    prefetcher = QuestionPrefetcher(service, depth=3)
+
+    async def main():
+        prefetcher.warm("personas")
+        await asyncio.sleep(0.05)
+        buffered = prefetcher._buffers["personas"].qsize()
+        question = await prefetcher.get("personas")
+        await asyncio.sleep(0.05)
+        refilled = prefetcher._buffers["personas"].qsize()
+        prefetcher.close()
+        await service.close()
+        return buffered, question, refilled
+
+    buffered, question, refilled = asyncio.run(main())
+
+    assert buffered == 3
+    assert question.question_text in {"Pregunta 0", "Pregunta 1", "Pregunta 2"}
+    assert refilled == 3
+    assert [int(params["count"]) for _, params in calls] == [3, 1]
+
+
+def test_missing_batch_endpoint_falls_back_to_single_questions(make_service, question_backend):
+    handler, calls = question_backend(batch=False)
+    service = make_service(handler)
+    prefetcher = QuestionPrefetcher(service, depth=2)
+
+    async def main():
+        prefetcher.warm("personas")
+        await asyncio.sleep(0.05)
+        question = await prefetcher.get("personas")
+        prefetcher.close()
+        await service.close()
+        return question
+
+    question = asyncio.run(main())
+
+    paths = [path for path, _ in calls]
+    assert question is not None
+    assert paths[0].endswith("/questions")
+    assert paths.count(paths[0]) == 1
+    assert all(path.endswith("/question") for path in paths[1:])
+
+
+def test_close_during_pending_get_neither_fails_nor_warms_again(make_service, question_backend):
+    handler, calls = question_backend(delay=0.05)
+    service = make_service(handler)
+    prefetcher = QuestionPrefetcher(service, depth=2)
+
+    async def main():
+        prefetcher.warm("personas")
+        await asyncio.sleep(0)
+        pending = asyncio.create_task(prefetcher.get("personas"))
+        await asyncio.sleep(0.01)
+        prefetcher.close()
+        question = await pending
+        await asyncio.sleep(0.1)
+        result = question, dict(prefetcher._fillers), len(calls)
+        await service.close()
+        return result
+
+    question, fillers, requests = asyncio.run(main())
+
+    assert question is None
+    assert fillers == {}
+    assert requests == 1
+
+
+def test_wait_closed_lets_cancelled_loads_finish_before_the_client_closes(caplog, make_service, question_backend):
+    async def main(steps: int):
+        handler, _ = question_backend(delay=0.05)
+        service = make_service(handler)
+        prefetcher = QuestionPrefetcher(service, depth=2)
+        prefetcher.warm("personas")
+        # Cerrar en distintos puntos de la carga, también con la petición a punto de enviarse
+        for _ in range(steps):
+            await asyncio.sleep(0)
+        prefetcher.close()
+        await prefetcher.wait_closed()
+        await service.close()
+        await asyncio.sleep(0.06)
+
+    for steps in range(6):
+        asyncio.run(main(steps))
+
+    assert "client has been closed" not in caplog.text
+
+
+def test_practice_warms_only_the_domain_being_played(logged_in, question_backend):
+    handler, calls = question_backend()
+    app = PMPQuizApp(api_service=logged_in(handler))
+
+    async def main():
+        page, _ = create_page("practica")
+        app.page = page
+        await app.handle_practice(FakeEvent(page), "personas")
+        await asyncio.sleep(0.05)
+        await app.handle_next_question(FakeEvent(page), "personas")
+        await asyncio.sleep(0.05)
+        app.close()
+        await app.prefetcher.wait_closed()
+        await app.api_service.close()
+
+    asyncio.run(main())
+
+    assert {params["domain"] for path, params in calls if "question" in path} == {"personas"}
+    assert app.views["question"].domain_dropdown.value == "personas"
@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.retry import RetryPolicy
+
+
+class Recorder:
+    """Sustituye a asyncio.sleep y anota las esperas pedidas."""
+
+    def __init__(self):
+        self.delays = []
+
+    async def __call__(self, delay: float):
+        self.delays.append(delay)
+
+
+def make_policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("base_delay", 0.1)
+    kwargs.setdefault("max_delay", 1.0)
+    kwargs.setdefault("deadline", None)
+    kwargs.setdefault("sleep", Recorder())
+    return RetryPolicy(**kwargs)
+
+
+def run(policy: RetryPolicy, handler) -> httpx.Response:
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await policy.request(lambda: client.get("http://test/question"))
+    return asyncio.run(main())
+
+
+def sequence(*responses):
+    """Handler que devuelve (o lanza) cada elemento en orden y cuenta las llamadas."""
+    calls = []
+
+    def handler(request):
+        item = responses[min(len(calls), len(responses) - 1)]
+        calls.append(request)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    handler.calls = calls
+    return handler
+
+
+def test_retries_transient_status_until_success():
+    handler = sequence(httpx.Response(502), httpx.Response(503), httpx.Response(200, json={"ok": True}))
+    policy = make_policy()
+
+    response = run(policy, handler)
+
+    assert response.status_code == 200
+    assert len(handler.calls) == 3
+    assert len(policy.sleep.delays) == 2
+
+
+def test_does_not_retry_client_errors():
+    handler = sequence(httpx.Response(404), httpx.Response(200))
+
+    response = run(make_policy(), handler)
+
+    assert response.status_code == 404
+    assert len(handler.calls) == 1
+
+
+def test_returns_last_response_when_attempts_exhausted():
+    handler = sequence(httpx.Response(502))
+
+    response = run(make_policy(max_attempts=3), handler)
+
+    assert response.status_code == 502
+    assert len(handler.calls) == 3
+
+
+def test_retries_network_errors_and_reraises_at_the_end():
+    handler = sequence(httpx.ConnectError("caído"))
+
+    with pytest.raises(httpx.ConnectError):
+        run(make_policy(max_attempts=2), handler)
+    assert len(handler.calls) == 2
+
+
+def test_backoff_grows_exponentially_with_jitter_and_is_capped():
+    policy = make_policy(base_delay=0.5, max_delay=2.0)
+
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (6, 2.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_honours_retry_after_seconds():
+    handler = sequence(httpx.Response(429, headers={"Retry-After": "0.7"}), httpx.Response(200))
+    policy = make_policy()
+
+    response = run(policy, handler)
+
+    assert response.status_code == 200
+    assert policy.sleep.delays == [0.7]
+
+
+def test_honours_retry_after_http_date():
+    handler = sequence(
+        httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+        httpx.Response(200),
+    )
+    policy = make_policy()
+
+    run(policy, handler)
+
+    # Una fecha ya pasada significa reintentar sin esperar
+    assert policy.sleep.delays == [0]
+
+
+def test_gives_up_when_wait_would_exceed_deadline():
+    handler = sequence(httpx.Response(503, headers={"Retry-After": "30"}), httpx.Response(200))
+
+    response = run(make_policy(deadline=1.0), handler)
+
+    assert response.status_code == 503
+    assert len(handler.calls) == 1
+
+
+def test_deadline_cancels_slow_attempt():
+    async def slow_handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200)
+
+    with pytest.raises(httpx.TimeoutException):
+        run(make_policy(deadline=0.05), slow_handler)
+
+
+def test_non_idempotent_only_retries_unprocessed_requests():
+    policy = make_policy(idempotent=False)
+
+    handler = sequence(httpx.Response(500), httpx.Response(200))
+    assert run(policy, handler).status_code == 500
+    assert len(handler.calls) == 1
+
+    handler = sequence(httpx.Response(503), httpx.Response(200))
+    assert run(policy, handler).status_code == 200
+    assert len(handler.calls) == 2
+
+    handler = sequence(httpx.ReadTimeout("sin respuesta"), httpx.Response(200))
+    with pytest.raises(httpx.ReadTimeout):
+        run(policy, handler)
+    assert len(handler.calls) == 1
+
+    handler = sequence(httpx.ConnectError("caído"), httpx.Response(200))
+    assert run(policy, handler).status_code == 200
+    assert len(handler.calls) == 2
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from benchmarks.headless import create_page
+from src.app.session import SessionRegistry
+
+
+def attach_pages(registry: SessionRegistry, count: int, prefix: str = "sesion"):
+    async def main():
+        pages = []
+        for number in range(count):
+            page, _ = create_page(f"{prefix}-{number}")
+            registry.attach(page)
+            pages.append(page)
+        return pages
+    return asyncio.run(main())
+
+
+def test_connected_sessions_are_never_evicted(caplog):
+    registry = SessionRegistry(max_sessions=2, idle_timeout=3600)
+
+    attach_pages(registry, 3)
+
+    assert len(registry) == 3
+    assert "superan MAX_SESSIONS" in caplog.text
+
+
+def test_disconnected_sessions_are_evicted_first():
+    registry = SessionRegistry(max_sessions=2, idle_timeout=3600)
+    first, second = attach_pages(registry, 2)
+    second.on_disconnect(None)
+
+    attach_pages(registry, 1, prefix="nueva")
+
+    assert registry.get(first.session_id) is not None
+    assert registry.get(second.session_id) is None
+    assert len(registry) == 2
+
+
+def test_idle_sessions_are_evicted_and_navigation_counts_as_activity():
+    registry = SessionRegistry(max_sessions=2, idle_timeout=60)
+    idle, active = attach_pages(registry, 2)
+    for page in (idle, active):
+        registry.get(page.session_id).last_seen = time.monotonic() - 120
+    # Acceder a una vista renueva la actividad de la sesión
+    registry.get(active.session_id).app.views["results"]
+
+    attach_pages(registry, 1, prefix="nueva")
+
+    assert registry.get(idle.session_id) is None
+    assert registry.get(active.session_id) is not None
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.models.quiz_session import QuizAnswer, QuizSession
+from src.services.session_outbox import PracticeSessionOutbox
+
+
+@pytest.fixture(autouse=True)
+def outbox_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.sqlite3")
+    monkeypatch.setattr(settings, "SESSION_OUTBOX_PATH", path)
+    return path
+
+
+def make_session() -> QuizSession:
+    return QuizSession(start_time=datetime.now(), answers=[
+        QuizAnswer("¿Pregunta?", "A", "A", True, "personas", "Porque sí")
+    ])
+
+
+def posted(request):
+    body = json.loads(request.content)
+    return body if isinstance(body, list) else [body]
+
+
+def test_queued_sessions_are_sent_in_one_batch(logged_in):
+    received = []
+
+    def handler(request):
+        received.append((request.url.path, posted(request)))
+        return httpx.Response(200, json={})
+
+    service = logged_in(handler)
+
+    async def main():
+        outbox = service.sessions_outbox
+        for _ in range(2):
+            await asyncio.to_thread(outbox.add, "1", service._practice_session_payload(make_session()))
+        saved = await service.flush_practice_sessions()
+        pending = outbox.pending_count("1")
+        await service.close()
+        return saved, pending
+
+    saved, pending = asyncio.run(main())
+
+    assert saved == 2
+    assert pending == 0
+    assert [path for path, _ in received] == ["/api/practice-sessions/batch"]
+    ids = [payload["client_session_id"] for payload in received[0][1]]
+    assert len(set(ids)) == 2
+
+
+def test_server_errors_keep_the_entry_with_backoff(logged_in):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    service = logged_in(handler)
+
+    async def main():
+        outbox = service.sessions_outbox
+        await asyncio.to_thread(outbox.add, "1", service._practice_session_payload(make_session()))
+        first = await service.flush_practice_sessions()
+        sent_before = len(calls)
+        # El reintento aún no toca: no se vuelve a llamar al backend
+        second = await service.flush_practice_sessions()
+        result = first, second, sent_before, len(calls), outbox.pending_count("1"), outbox.next_delay("1")
+        await service.close()
+        return result
+
+    first, second, sent_before, sent_after, pending, delay = asyncio.run(main())
+
+    assert first == second == 0
+    assert sent_before == sent_after
+    assert pending == 1
+    assert delay > 0
+
+
+def test_rejected_session_does_not_block_the_following_ones(logged_in):
+    received = []
+
+    def handler(request):
+        if request.url.path.endswith("/batch"):
+            return httpx.Response(404)
+        payload = json.loads(request.content)
+        received.append(payload["client_session_id"])
+        return httpx.Response(422 if len(received) == 2 else 200, json={})
+
+    service = logged_in(handler)
+
+    async def main():
+        outbox = service.sessions_outbox
+        for _ in range(3):
+            await asyncio.to_thread(outbox.add, "1", service._practice_session_payload(make_session()))
+        saved = await service.flush_practice_sessions()
+        result = saved, outbox.pending_count("1"), outbox.rejected_count("1")
+        await service.close()
+        return result
+
+    saved, pending, rejected = asyncio.run(main())
+
+    assert len(received) == 3
+    assert saved == 2
+    assert pending == 0
+    assert rejected == 1
+
+
+def test_queued_session_survives_a_restart(outbox_path, logged_in):
+    previous = PracticeSessionOutbox(outbox_path)
+    previous.add("1", {"user_id": "1", "client_session_id": "abc", "start_time": datetime.now().isoformat(),
+                       "end_time": datetime.now().isoformat(), "personas_total": 1, "personas_correct": 1,
+                       "proceso_total": 0, "proceso_correct": 0, "entorno_total": 0, "entorno_correct": 0})
+    previous.close()
+    received = []
+
+    def handler(request):
+        received.extend(posted(request))
+        return httpx.Response(200, json={})
+
+    service = logged_in(handler)
+
+    async def main():
+        saved = await service.flush_practice_sessions()
+        await service.close()
+        return saved
+
+    assert asyncio.run(main()) == 1
+    assert [payload["client_session_id"] for payload in received] == ["abc"]
+
+
+def test_logout_does_not_interrupt_the_background_flush(logged_in):
+    received = []
+
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        received.extend(posted(request))
+        return httpx.Response(200, json={})
+
+    service = logged_in(handler)
+
+    async def main():
+        await service.queue_practice_session(make_session())
+        service.logout()
+        await asyncio.sleep(0.3)
+        pending = service.sessions_outbox.pending_count("1")
+        await service.close()
+        return pending
+
+    assert asyncio.run(main()) == 0
+    assert len(received) == 1
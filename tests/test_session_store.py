@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.models.quiz_session import PracticeSession
+from src.services.session_store import PracticeSessionStore, SyncState
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "sessions.sqlite3")
+    monkeypatch.setattr(settings, "SESSION_CACHE_PATH", path)
+    return path
+
+
+def practice_session(day: int) -> PracticeSession:
+    return PracticeSession(
+        user_id="1", start_time=datetime(2024, 1, day, 10), end_time=datetime(2024, 1, day, 10, 10),
+        personas_total=1, personas_correct=1, proceso_total=0, proceso_correct=0,
+        entorno_total=0, entorno_correct=0, id=day
+    )
+
+
+@pytest.fixture
+def sync(make_service, run):
+    """Sincroniza el historial del usuario 1 con un servicio nuevo y lo cierra."""
+    def sync_history(handler):
+        service = make_service(handler)
+        return run(service, service.get_user_practice_sessions("1"))
+    return sync_history
+
+
+def test_store_keeps_sessions_and_validators_across_restarts(cache_path):
+    store = PracticeSessionStore(cache_path)
+    store.merge("1", [practice_session(1), practice_session(3)], SyncState(etag='"v1"'))
+    assert [s.id for s in store.load("1")] == [3, 1]
+    # Una sesión repetida se sustituye y la caché en memoria sigue ordenada
+    store.merge("1", [practice_session(2), practice_session(3)], SyncState(
+        etag='"v2"', latest_start_time=datetime(2024, 1, 3, 10)
+    ))
+    assert [s.id for s in store.load("1")] == [3, 2, 1]
+    store.close()
+
+    reopened = PracticeSessionStore(cache_path)
+    state = reopened.sync_state("1")
+
+    assert [s.id for s in reopened.load("1")] == [3, 2, 1]
+    assert state.etag == '"v2"'
+    assert state.latest_start_time == datetime(2024, 1, 3, 10)
+    assert reopened.load("2") == []
+    reopened.close()
+
+
+def test_first_sync_downloads_everything_and_stores_the_validators(session_data, sync):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[session_data(1), session_data(0)], headers={"ETag": '"v1"'})
+
+    sessions = sync(handler)
+
+    assert [s.id for s in sessions] == [1, 0]
+    assert "if-none-match" not in requests[0].headers
+    assert "since" not in requests[0].url.params
+
+
+def test_not_modified_serves_the_cache_after_a_restart(session_data, sync):
+    sync(lambda request: httpx.Response(200, json=[session_data(0)], headers={"ETag": '"v1"'}))
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(304)
+
+    sessions = sync(handler)
+
+    assert [s.id for s in sessions] == [0]
+    assert requests[0].headers["if-none-match"] == '"v1"'
+    assert requests[0].url.params["since"] == "2024-01-01T10:00:00"
+
+
+def test_delta_sync_merges_only_the_new_sessions(session_data, sync):
+    sync(lambda request: httpx.Response(200, json=[session_data(1), session_data(0)], headers={"ETag": '"v1"'}))
+
+    # El backend puede devolver de más: lo ya conocido no se vuelve a convertir ni duplica
+    def handler(request):
+        return httpx.Response(200, json=[session_data(2), session_data(1)], headers={"ETag": '"v2"'})
+
+    sessions = sync(handler)
+    store = PracticeSessionStore(settings.SESSION_CACHE_PATH)
+    state = store.sync_state("1")
+    store.close()
+
+    assert [s.id for s in sessions] == [2, 1, 0]
+    assert state.etag == '"v2"'
+    assert state.latest_start_time == datetime(2024, 1, 3, 10)
+
+
+def test_backend_errors_fall_back_to_the_cache(session_data, sync):
+    sync(lambda request: httpx.Response(200, json=[session_data(0)]))
+
+    def handler(request):
+        raise httpx.ConnectError("caído")
+
+    assert [s.id for s in sync(handler)] == [0]
+
+
+def test_cold_cache_fetches_one_page_and_backfills_in_the_background(make_service, session_data):
+    history = [session_data(number) for number in reversed(range(30))]
+    requests = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        requests.append(params)
+        sessions = history
+        if "since" in params:
+            sessions = [s for s in sessions if s["start_time"] > params["since"]]
+        if "limit" in params:
+            offset = int(params["offset"])
+            sessions = sessions[offset:offset + int(params["limit"])]
+        return httpx.Response(200, json=sessions)
+
+    service = make_service(handler)
+
+    async def main():
+        first_page = await service.get_user_practice_sessions("1", limit=11)
+        cold_requests = list(requests)
+        await asyncio.gather(*service._history_backfills.values())
+        history.insert(0, session_data(30))
+        requests.clear()
+        refreshed = await service.get_user_practice_sessions("1", limit=11)
+        second_page = await service.get_user_practice_sessions("1", limit=11, offset=11)
+        await service.close()
+        return first_page, cold_requests, refreshed, second_page
+
+    first_page, cold_requests, refreshed, second_page = asyncio.run(main())
+
+    assert [s.id for s in first_page] == list(range(29, 18, -1))
+    # Solo la primera página bloquea la carga; el historial completo llega después
+    assert cold_requests[0] == {"limit": "11", "offset": "0"}
+    assert cold_requests[1:] == [{}]
+    # Con la caché llena solo se pide lo nuevo, con límite, y la página siguiente sale de la caché
+    assert requests == [{"since": "2024-01-30T10:00:00", "limit": "11", "offset": "0"}]
+    assert [s.id for s in refreshed] == list(range(30, 19, -1))
+    assert [s.id for s in second_page] == list(range(19, 8, -1))
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    single_flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return "resultado"
+
+    async def main():
+        return await asyncio.gather(*[single_flight.do("clave", fetch) for _ in range(20)])
+
+    results = asyncio.run(main())
+
+    assert results == ["resultado"] * 20
+    assert len(executions) == 1
+    assert single_flight.shared == 19
+    assert single_flight.in_flight() == 0
+
+
+def test_different_keys_run_separately_and_finished_keys_run_again():
+    single_flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0)
+        return len(executions)
+
+    async def main():
+        await asyncio.gather(single_flight.do("a", fetch), single_flight.do("b", fetch))
+        await single_flight.do("a", fetch)
+
+    asyncio.run(main())
+
+    assert len(executions) == 3
+
+
+def test_errors_are_shared_by_every_waiter():
+    single_flight = SingleFlight()
+    executions = []
+
+    async def fail():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("fallo")
+
+    async def main():
+        return await asyncio.gather(*[single_flight.do("clave", fail) for _ in range(5)], return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert len(executions) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "resultado"
+
+    async def main():
+        first = asyncio.create_task(single_flight.do("clave", fetch))
+        second = asyncio.create_task(single_flight.do("clave", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "resultado"
@@ -0,0 +1,284 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import flet as ft
+import httpx
+import pytest
+
+from benchmarks.headless import FakeEvent, create_page
+from src.app.pmp_quiz_app import PMPQuizApp
+from src.config.settings import settings
+from src.services.chat_service import ChatService
+from src.ui.components import UpdateScheduler, show_loading, hide_loading, loading
+from src.ui.views.chat_view import ChatView
+from src.ui.views.progress_view import ProgressView
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_quick_loads_never_show_the_overlay():
+    async def main():
+        page, connection = create_page("rapida")
+        connection.reset()
+        handle = show_loading(page)
+        await asyncio.sleep(0.01)
+        hide_loading(page, handle)
+        await asyncio.sleep(0.4)
+        return page, connection
+
+    page, connection = run(main())
+
+    assert connection.messages == 0
+    assert not page.loading_overlay.control.visible
+
+
+def test_overlay_stays_until_the_last_concurrent_load_finishes():
+    async def main():
+        page, _ = create_page("concurrente")
+        overlay = None
+
+        async def load(seconds: float):
+            with loading(page):
+                await asyncio.sleep(seconds)
+
+        first = asyncio.create_task(load(0.4))
+        second = asyncio.create_task(load(0.6))
+        await first
+        overlay = page.loading_overlay
+        visible_while_second = overlay.control.visible
+        await second
+        return overlay, visible_while_second
+
+    overlay, visible_while_second = run(main())
+
+    assert visible_while_second
+    assert not overlay.control.visible
+    assert overlay.active == 0
+
+
+def test_releasing_a_handle_twice_does_not_hide_other_loads():
+    async def main():
+        page, _ = create_page("doble")
+        first = show_loading(page)
+        second = show_loading(page)
+        hide_loading(page, first)
+        hide_loading(page, first)
+        active = page.loading_overlay.active
+        hide_loading(page, second)
+        return active, page
+
+    active, page = run(main())
+
+    assert active == 1
+    assert page.loading_overlay.active == 0
+
+
+def test_overlay_control_is_reused_between_loads():
+    async def main():
+        page, connection = create_page("reutiliza")
+        for _ in range(2):
+            handle = show_loading(page)
+            await asyncio.sleep(0.4)
+            hide_loading(page, handle)
+        connection.reset()
+        handle = show_loading(page)
+        await asyncio.sleep(0.4)
+        hide_loading(page, handle)
+        return page, connection
+
+    page, connection = run(main())
+
+    assert page.overlay.count(page.loading_overlay.control) == 1
+    # Mostrar y ocultar un overlay ya creado solo envía el cambio de visibilidad
+    assert connection.bytes_sent < 400
+
+
+def test_update_requests_in_one_tick_are_sent_together():
+    async def main():
+        page, connection = create_page("coalesce")
+        first, second = ft.Text("a"), ft.Text("b")
+        page.add(first, second)
+        updates = UpdateScheduler(page, measure=True)
+        connection.reset()
+
+        with updates.action("editar") as stats:
+            first.value = "uno"
+            updates.request(first)
+            second.value = "dos"
+            updates.request(second)
+            updates.request(first)
+            await asyncio.sleep(0)
+        return connection, stats
+
+    connection, stats = run(main())
+
+    assert connection.messages == 1
+    assert stats.requested == 3
+    assert stats.updates == 1
+    assert stats.bytes_sent > 0
+
+
+def test_overlapping_actions_count_only_their_own_updates():
+    async def main():
+        page, connection = create_page("solapadas")
+        short, long = ft.Text("a"), ft.Text("b")
+        page.add(short, long)
+        updates = UpdateScheduler(page, measure=True)
+
+        short_open, long_open, short_sent = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+        async def short_action():
+            with updates.action("corta") as stats:
+                short_open.set()
+                # La acción larga empieza mientras esta sigue abierta
+                await long_open.wait()
+                short.value = "y"
+                updates.request(short)
+                await asyncio.sleep(0)
+            short_sent.set()
+            return stats
+
+        async def long_action():
+            await short_open.wait()
+            with updates.action("larga") as stats:
+                long_open.set()
+                await short_sent.wait()
+                long.value = "x" * 500
+                updates.request(long)
+                await asyncio.sleep(0)
+            return stats
+
+        return await asyncio.gather(short_action(), long_action())
+
+    short_stats, long_stats = run(main())
+
+    assert long_stats.updates == short_stats.updates == 1
+    assert long_stats.bytes_sent > short_stats.bytes_sent + 400
+
+
+def test_updates_for_removed_controls_are_dropped():
+    async def main():
+        page, connection = create_page("desmontado")
+        text = ft.Text("a")
+        page.add(text)
+        updates = UpdateScheduler(page)
+        text.value = "b"
+        updates.request(text)
+        page.controls.clear()
+        page.update()
+        connection.reset()
+        await asyncio.sleep(0)
+        return connection
+
+    assert run(main()).messages == 0
+
+
+def history_backend(total: int):
+    """Backend que ignora limit/offset y devuelve siempre el historial completo."""
+    now = datetime.now()
+    sessions = [
+        {
+            "id": i, "user_id": "1",
+            "start_time": (now - timedelta(days=i)).isoformat(), "end_time": (now - timedelta(days=i)).isoformat(),
+            "personas_total": 1, "personas_correct": 1, "proceso_total": 0, "proceso_correct": 0,
+            "entorno_total": 0, "entorno_correct": 0,
+        }
+        for i in range(total)
+    ]
+    return lambda request: httpx.Response(200, json=sessions)
+
+
+@pytest.mark.parametrize("total", [20, 21, 45])
+def test_history_scroll_stops_when_the_backend_ignores_pagination(total, monkeypatch, logged_in):
+    monkeypatch.setattr(settings, "SESSION_CACHE_PATH", "")
+    service = logged_in(history_backend(total))
+    view = ProgressView(on_return_home=lambda e: None, api_service=service)
+
+    async def main():
+        view.has_more_sessions = True
+        pages = 0
+        while view.has_more_sessions and pages < 10:
+            await view.load_more_sessions()
+            pages += 1
+        await service.close()
+
+    asyncio.run(main())
+
+    assert not view.has_more_sessions
+    assert sorted(session.id for session in view.sessions) == list(range(total))
+
+
+def test_chat_view_replaces_partial_answer_with_the_error(logged_in):
+    async def broken_stream():
+        yield b'data: {"delta": "Respuesta a medias"}\n\n'
+        raise httpx.ReadError("conexión cortada")
+
+    service = logged_in(lambda request: httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, content=broken_stream()
+    ))
+    chat_service = ChatService(service)
+    view = ChatView(on_return_home=lambda e: None, chat_service=chat_service)
+
+    async def main():
+        page, _ = create_page("chat-error")
+        view.build(page)
+        view.new_message.value = "Hola"
+        await view.handle_send_message(FakeEvent(page))
+        await service.close()
+
+    asyncio.run(main())
+
+    answer = view.messages[-1].text
+    assert answer.startswith("Error")
+    assert "Respuesta a medias" not in answer
+    assert chat_service.message_history == []
+
+
+def test_practice_start_validates_the_session_once_per_ttl(logged_in, question_data):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/auth/me"):
+            return httpx.Response(200, json={"id": "1", "email": "ana@example.com"})
+        return httpx.Response(200, json={"data": [question_data]})
+
+    app = PMPQuizApp(api_service=logged_in(handler))
+    app.prefetcher.depth = 0
+
+    async def main():
+        page, _ = create_page("sesion-valida")
+        app.page = page
+        for _ in range(2):
+            await app.handle_practice(FakeEvent(page), "personas")
+        await app.api_service.close()
+
+    asyncio.run(main())
+
+    assert calls.count("/api/auth/me") == 1
+    assert app.current_question.question_text == question_data["question_text"]
+
+
+def test_practice_with_a_rejected_token_returns_to_login(logged_in, question_data):
+    def handler(request):
+        if request.url.path.endswith("/auth/me"):
+            return httpx.Response(401)
+        return httpx.Response(200, json={"data": [question_data]})
+
+    app = PMPQuizApp(api_service=logged_in(handler))
+    app.api_service.auth.refresh_supported = False
+
+    async def main():
+        page, _ = create_page("sesion-caducada")
+        app.page = page
+        await app.handle_practice(FakeEvent(page), "personas")
+        await app.prefetcher.wait_closed()
+        await app.api_service.close()
+
+    asyncio.run(main())
+
+    assert app.api_service.current_user is None
+    assert app.current_question is None
+    assert app.views.is_built("auth")